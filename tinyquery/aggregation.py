@@ -0,0 +1,200 @@
+"""Hash aggregation of rows into per-group aggregate states.
+
+Rows come in batches, and each batch is folded into a partial state for each
+group with the accumulator protocol of runtime.AggregateFunction. If there are
+more groups than fit in memory, the rows of the groups that don't fit are
+partitioned by a hash of their group key into temporary files, and each
+partition is then aggregated on its own (grace hash aggregation). Every group
+ends up in exactly one partition, so no states ever need to be merged.
+
+Big aggregations can also be split up by a hash of their group keys in the
+same way ahead of time, and each partition aggregated in its own worker
+process.
+"""
+import cPickle
+import heapq
+import itertools
+import tempfile
+
+import parallel
+
+# The number of partitions that rows are split into when there are too many
+# groups to keep in memory.
+NUM_SPILL_PARTITIONS = 16
+# The number of rows that are written to or read from a partition at a time.
+SPILL_CHUNK_SIZE = 1000
+# The number of rows of a partition that are added to the aggregate states at
+# a time when aggregating partitions in parallel.
+PARTITION_BATCH_SIZE = 10000
+
+
+def aggregate_batches(funcs, batches, max_groups=None, partition_salt=0):
+    """Aggregate batches of rows into one result per group.
+
+    Arguments:
+        funcs: A list of AggregateFunction instances that accumulate.
+        batches: An iterable of (rows, keys, arg_values) triples, where rows
+            is a sequence with the number of each row in the original input,
+            in increasing order, keys has the group key of each row, and
+            arg_values has a list of argument values for each function.
+        max_groups: Either None, or the most groups to keep the states of in
+            memory at once.
+        partition_salt: A value to hash along with the group keys, so that
+            partitions of partitions are split differently.
+
+    Returns: A (first_rows, keys, values) triple of lists with an entry for
+        each group, in the order that the groups first appear. first_rows has
+        the number of the group's first row, keys has its key, and values has
+        a list for each function with its final value for each group.
+    """
+    group_indices = {}
+    group_keys = []
+    group_first_rows = []
+    states = [[] for _ in funcs]
+    partitions = None
+
+    for rows, keys, arg_values in batches:
+        # Map each group index to the offsets in this batch of its rows.
+        batch_rows = {}
+        for offset, key in enumerate(keys):
+            group_index = group_indices.get(key)
+            if group_index is None:
+                if len(group_keys) == max_groups:
+                    if partitions is None:
+                        partitions = SpilledPartitions(partition_salt)
+                    partitions.add(key, (rows[offset], key, [
+                        values[offset] for values in arg_values]))
+                    continue
+                group_index = group_indices[key] = len(group_keys)
+                group_keys.append(key)
+                group_first_rows.append(rows[offset])
+                for func, func_states in zip(funcs, states):
+                    func_states.append(func.initial_state())
+            group_rows = batch_rows.get(group_index)
+            if group_rows is None:
+                group_rows = batch_rows[group_index] = []
+            group_rows.append(offset)
+        for func, func_states, values in zip(funcs, states, arg_values):
+            for group_index, group_rows in batch_rows.iteritems():
+                func_states[group_index] = func.update(
+                    func_states[group_index], [values[i] for i in group_rows])
+
+    del group_indices
+    values = [map(func.finalize, func_states)
+              for func, func_states in zip(funcs, states)]
+    del states
+    if partitions is None:
+        return group_first_rows, group_keys, values
+
+    try:
+        results = [(group_first_rows, group_keys, values)] + [
+            aggregate_batches(funcs, partitions.batches(i), max_groups,
+                              partition_salt + 1)
+            for i in xrange(NUM_SPILL_PARTITIONS)]
+    finally:
+        partitions.close()
+    return merge_results(results, len(funcs))
+
+
+def aggregate_partitions(funcs, keys, arg_values, num_processes,
+                         max_groups=None):
+    """Aggregate rows in parallel, split up by a hash of their group keys.
+
+    Each worker process aggregates the groups of one partition, so as with
+    spilled partitions, the states of a group are never split between
+    processes.
+
+    Arguments:
+        funcs: A list of AggregateFunction instances that accumulate.
+        keys: A list with the group key of each row.
+        arg_values: A list with the argument values of each function.
+        num_processes: The number of partitions, and worker processes.
+        max_groups: Either None, or the most groups that each worker should
+            keep the states of in memory at once.
+
+    Returns: A result like that of aggregate_batches.
+    """
+    partitions = [[] for _ in xrange(num_processes)]
+    for row, key in enumerate(keys):
+        partitions[hash(key) % num_processes].append(row)
+    partitions = [rows for rows in partitions if rows]
+
+    def aggregate_partition(index):
+        rows = partitions[index]
+        batches = (
+            (batch_rows, [keys[row] for row in batch_rows],
+             [[values[row] for row in batch_rows] for values in arg_values])
+            for batch_rows in (
+                rows[start:start + PARTITION_BATCH_SIZE]
+                for start in xrange(0, len(rows), PARTITION_BATCH_SIZE)))
+        return aggregate_batches(funcs, batches, max_groups)
+
+    results = parallel.map_in_processes(aggregate_partition, len(partitions),
+                                        num_processes)
+    return merge_results(results, len(funcs))
+
+
+def merge_results(results, num_funcs):
+    """Merge the results for disjoint sets of groups into a single result.
+
+    Arguments:
+        results: A list of results of aggregate_batches.
+        num_funcs: The number of functions that were aggregated.
+    """
+    # The first row of each group is unique, so the merge never compares the
+    # rest of the triples.
+    order = heapq.merge(*[
+        itertools.izip(first_rows, itertools.repeat(result_index),
+                       itertools.count())
+        for result_index, (first_rows, _, _) in enumerate(results)])
+    first_rows = []
+    keys = []
+    values = [[] for _ in xrange(num_funcs)]
+    for first_row, result_index, position in order:
+        _, result_keys, result_values = results[result_index]
+        first_rows.append(first_row)
+        keys.append(result_keys[position])
+        for func_values, result_func_values in zip(values, result_values):
+            func_values.append(result_func_values[position])
+    return first_rows, keys, values
+
+
+class SpilledPartitions(object):
+    """Temporary files holding rows, split up by a hash of their group key."""
+    def __init__(self, salt):
+        self.salt = salt
+        self.files = [tempfile.TemporaryFile()
+                      for _ in xrange(NUM_SPILL_PARTITIONS)]
+        # The rows of each partition that haven't been written yet.
+        self.buffers = [[] for _ in xrange(NUM_SPILL_PARTITIONS)]
+
+    def add(self, key, row):
+        """Add a (row number, key, argument values) triple to a partition."""
+        index = hash((self.salt, key)) % NUM_SPILL_PARTITIONS
+        buf = self.buffers[index]
+        buf.append(row)
+        if len(buf) >= SPILL_CHUNK_SIZE:
+            self.flush(index)
+
+    def flush(self, index):
+        if self.buffers[index]:
+            cPickle.dump(self.buffers[index], self.files[index],
+                         cPickle.HIGHEST_PROTOCOL)
+            self.buffers[index] = []
+
+    def batches(self, index):
+        """Read back the rows of a partition in batches."""
+        self.flush(index)
+        partition_file = self.files[index]
+        partition_file.seek(0)
+        while True:
+            try:
+                chunk = cPickle.load(partition_file)
+            except EOFError:
+                return
+            rows, keys, row_arg_values = zip(*chunk)
+            yield rows, keys, zip(*row_arg_values)
+
+    def close(self):
+        for partition_file in self.files:
+            partition_file.close()
@@ -0,0 +1,68 @@
+import random
+import unittest
+
+import mock
+
+import aggregation
+import runtime
+
+
+class AggregateBatchesTest(unittest.TestCase):
+    def setUp(self):
+        rand = random.Random(0)
+        self.num_rows = 500
+        self.keys = [(rand.randint(0, 60), rand.choice(['x', 'y', None]))
+                     for _ in xrange(self.num_rows)]
+        self.values = [rand.choice([None, 1, 2, 5])
+                       for _ in xrange(self.num_rows)]
+        self.funcs = [runtime.get_func('sum'), runtime.get_func('count')]
+
+    def batches(self, batch_size):
+        for start in xrange(0, self.num_rows, batch_size):
+            end = start + batch_size
+            yield (xrange(start, min(end, self.num_rows)),
+                   self.keys[start:end], [self.values[start:end]] * 2)
+
+    def test_groups_in_first_appearance_order(self):
+        first_rows, keys, values = aggregation.aggregate_batches(
+            self.funcs, self.batches(64))
+        expected_keys = []
+        for key in self.keys:
+            if key not in expected_keys:
+                expected_keys.append(key)
+        self.assertEqual(expected_keys, keys)
+        self.assertEqual([self.keys.index(key) for key in keys], first_rows)
+        rows = [i for i in xrange(self.num_rows) if self.keys[i] == keys[0]]
+        self.assertEqual(
+            sum(self.values[i] for i in rows if self.values[i] is not None),
+            values[0][0])
+        self.assertEqual(
+            sum(1 for i in rows if self.values[i] is not None),
+            values[1][0])
+
+    def test_spilled_groups_match_in_memory_groups(self):
+        expected = aggregation.aggregate_batches(self.funcs, self.batches(64))
+        # Use few partitions so that some partitions have to be split again.
+        with mock.patch.object(aggregation, 'NUM_SPILL_PARTITIONS', 2), \
+                mock.patch.object(aggregation, 'SPILL_CHUNK_SIZE', 7):
+            for max_groups in (1, 10, 100):
+                self.assertEqual(
+                    expected,
+                    aggregation.aggregate_batches(
+                        self.funcs, self.batches(64), max_groups))
+
+    def test_partitions_match_single_aggregation(self):
+        expected = aggregation.aggregate_batches(self.funcs, self.batches(64))
+        with mock.patch.object(aggregation, 'PARTITION_BATCH_SIZE', 16):
+            for max_groups in (None, 5):
+                self.assertEqual(
+                    expected,
+                    aggregation.aggregate_partitions(
+                        self.funcs, self.keys, [self.values] * 2, 3,
+                        max_groups))
+
+    def test_no_functions(self):
+        self.assertEqual(
+            ([0, 1], [(1,), (2,)], []),
+            aggregation.aggregate_batches(
+                [], [(xrange(3), [(1,), (2,), (1,)], [])], max_groups=1))
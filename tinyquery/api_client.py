@@ -7,6 +7,8 @@ This can be used in place of the value returned by apiclient.discovery.build().
 import functools
 import json
 
+import tq_types
+
 
 class TinyQueryApiClient(object):
     def __init__(self, tq_service):
@@ -72,6 +74,11 @@ class TableServiceApiClient(object):
             table_reference = body['tableReference']
             view = self.tq_service.make_view(table_name, body['view']['query'])
             self.tq_service.load_table_or_view(view)
+        elif 'materializedView' in body:
+            view = self.tq_service.make_view(
+                table_name, body['materializedView']['query'],
+                materialized=True)
+            self.tq_service.load_table_or_view(view)
         else:
             #The new table is a regular table.
             raw_schema = body['schema']
@@ -136,9 +143,10 @@ class JobServiceApiClient(object):
             create_disposition = config.get('createDisposition',
                                             'CREATE_IF_NEEDED')
             write_disposition = config.get('writeDisposition', 'WRITE_EMPTY')
+            parameters = parameters_from_config(config)
             return self.tq_service.run_query_job(
                 projectId, query, dest_dataset, dest_table, create_disposition,
-                write_disposition)
+                write_disposition, parameters)
         elif 'copy' in body['configuration']:
             config = body['configuration']['copy']
             src_dataset, src_table = self._get_config_table(
@@ -221,6 +229,60 @@ class TabledataServiceApiClient(object):
             }))
 
 
+# Maps the parameter types used by the API (both the standard SQL names and
+# the legacy SQL ones) to our types.
+API_PARAMETER_TYPES = {
+    'INT64': tq_types.INT,
+    'INTEGER': tq_types.INT,
+    'FLOAT64': tq_types.FLOAT,
+    'FLOAT': tq_types.FLOAT,
+    'BOOL': tq_types.BOOL,
+    'BOOLEAN': tq_types.BOOL,
+    'STRING': tq_types.STRING,
+    'TIMESTAMP': tq_types.TIMESTAMP,
+}
+
+
+def parameters_from_config(config):
+    """Given a query job config, return a dict of parameter name to value.
+
+    Returns None if the config doesn't specify any query parameters.
+    """
+    api_parameters = config.get('queryParameters')
+    if not api_parameters:
+        return None
+    parameters = {}
+    for api_parameter in api_parameters:
+        name = api_parameter.get('name')
+        api_type = api_parameter['parameterType']['type']
+        if name is None:
+            raise FakeHttpError(None, json.dumps({
+                'error': {
+                    'code': 400,
+                    'message': 'Positional query parameters are not '
+                               'supported.'
+                }
+            }))
+        if api_type not in API_PARAMETER_TYPES:
+            raise FakeHttpError(None, json.dumps({
+                'error': {
+                    'code': 400,
+                    'message': 'Unsupported type %s for query parameter '
+                               '%s.' % (api_type, name)
+                }
+            }))
+        value = api_parameter.get('parameterValue', {}).get('value')
+        if value is not None:
+            param_type = API_PARAMETER_TYPES[api_type]
+            if param_type == tq_types.BOOL:
+                # The API sends values as strings, and bool('false') is True.
+                value = str(value).lower() == 'true'
+            else:
+                value = tq_types.CAST_FUNCTION_MAP[param_type](value)
+        parameters[name] = value
+    return parameters
+
+
 def schema_from_table(table):
     """Given a tinyquery.Table, build an API-compatible schema."""
     return {'fields': [
@@ -231,11 +293,25 @@ def schema_from_table(table):
 
 def rows_from_table(table):
     """Given a tinyquery.Table, build an API-compatible rows object."""
-    result_rows = []
-    for i in xrange(table.num_rows):
-        field_values = [{'v': str(col.values[i])}
-                        for col in table.columns.itervalues()]
-        result_rows.append({
+    return list(rows_from_columns(table.num_rows, table.columns.values()))
+
+
+def rows_from_batches(batches):
+    """Generate API-compatible rows from batches of query results.
+
+    This is meant for the batches from TinyQuery.evaluate_query_batches, so
+    that the first rows can be handled while the rest are still being found.
+    """
+    for batch in batches:
+        for row in rows_from_columns(batch.num_rows,
+                                     batch.columns.values()):
+            yield row
+
+
+def rows_from_columns(num_rows, columns):
+    """Generate an API-compatible row for each row of some Columns."""
+    for i in xrange(num_rows):
+        field_values = [{'v': str(col.values[i])} for col in columns]
+        yield {
             'f': field_values
-        })
-    return result_rows
+        }
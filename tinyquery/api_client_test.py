@@ -32,15 +32,16 @@ class ApiClientTest(unittest.TestCase):
                 }
             }).execute()
 
-    def run_query(self, query):
+    def run_query(self, query, query_parameters=None):
+        query_config = {'query': query}
+        if query_parameters is not None:
+            query_config['queryParameters'] = query_parameters
         query_job_info = self.tq_service.jobs().insert(
             projectId='test_project',
             body={
                 'projectId': 'test_project',
                 'configuration': {
-                    'query': {
-                        'query': query
-                    }
+                    'query': query_config
                 }
             }
         ).execute()
@@ -119,6 +120,13 @@ class ApiClientTest(unittest.TestCase):
             {'name': 'foo', 'type': tq_types.INT},
             query_result['schema']['fields'][0])
 
+    def test_rows_from_batches(self):
+        rows = api_client.rows_from_batches(
+            self.tinyquery.evaluate_query_batches(
+                'SELECT 7 AS foo, true AS bar', batch_size=1))
+        self.assertEqual({'f': [{'v': '7'}, {'v': 'True'}]}, next(rows))
+        self.assertEqual([], list(rows))
+
     def test_sync_query(self):
         # As a convenience, BigQuery also makes it possible to run a query
         # synchronously in a single API request.
@@ -245,3 +253,53 @@ class ApiClientTest(unittest.TestCase):
         self.assertEqual('hello', list_response['rows'][0]['f'][1]['v'])
         self.assertEqual('7', list_response['rows'][1]['f'][0]['v'])
         self.assertEqual('goodbye', list_response['rows'][1]['f'][1]['v'])
+
+    def test_query_parameters(self):
+        result = self.run_query(
+            'SELECT @i + 1 AS i, @f AS f, @b AS b, @s AS s, @n IS NULL AS n',
+            [
+                {'name': 'i', 'parameterType': {'type': 'INT64'},
+                 'parameterValue': {'value': '41'}},
+                {'name': 'f', 'parameterType': {'type': 'FLOAT64'},
+                 'parameterValue': {'value': '0.5'}},
+                {'name': 'b', 'parameterType': {'type': 'BOOL'},
+                 'parameterValue': {'value': 'false'}},
+                {'name': 's', 'parameterType': {'type': 'STRING'},
+                 'parameterValue': {'value': 'hello'}},
+                {'name': 'n', 'parameterType': {'type': 'STRING'},
+                 'parameterValue': {}},
+            ])
+        self.assertEqual(
+            ['42', '0.5', 'False', 'hello', 'True'],
+            [field['v'] for field in result['rows'][0]['f']])
+        self.assertEqual(
+            [tq_types.INT, tq_types.FLOAT, tq_types.BOOL, tq_types.STRING,
+             tq_types.BOOL],
+            [field['type'] for field in result['schema']['fields']])
+
+    def test_unsupported_query_parameter(self):
+        with self.assertRaises(api_client.FakeHttpError):
+            self.run_query('SELECT @a', [
+                {'name': 'a',
+                 'parameterType': {'type': 'ARRAY',
+                                   'arrayType': {'type': 'INT64'}},
+                 'parameterValue': {'arrayValues': [{'value': '1'}]}},
+            ])
+
+    def test_create_and_query_materialized_view(self):
+        self.insert_simple_table()
+        self.tq_service.tables().insert(
+            projectId='test_project',
+            datasetId='test_dataset',
+            body={
+                'tableReference': self.table_ref('test_view'),
+                'materializedView': {
+                    'query': 'SELECT COUNT(*) AS num_rows '
+                             'FROM test_dataset.test_table'
+                }
+            }
+        ).execute()
+        self.query_to_table('SELECT 1 AS foo', 'test_dataset', 'test_table')
+        query_result = self.run_query('SELECT num_rows '
+                                      'FROM test_dataset.test_view')
+        self.assertEqual('1', query_result['rows'][0]['f'][0]['v'])
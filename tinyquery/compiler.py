@@ -5,6 +5,7 @@ This step has a number of responsibilities:
 -Resolve all select fields to their aliases and types.
 """
 import collections
+import datetime
 import itertools
 
 import parser
@@ -19,14 +20,55 @@ class CompileError(Exception):
     pass
 
 
-def compile_text(text, tables_by_name):
+def compile_text(text, tables_by_name, parameter_types=None):
     ast = parser.parse_text(text)
-    return Compiler(tables_by_name).compile_select(ast)
+    return Compiler(tables_by_name, parameter_types).compile_select(ast)
+
+
+def type_for_value(value):
+    """Return the tq_types type to use for a literal or parameter value."""
+    if isinstance(value, bool):
+        return tq_types.BOOL
+    elif isinstance(value, (int, long)):
+        return tq_types.INT
+    elif isinstance(value, float):
+        return tq_types.FLOAT
+    elif isinstance(value, basestring):
+        return tq_types.STRING
+    elif isinstance(value, datetime.datetime):
+        return tq_types.TIMESTAMP
+    elif value is None:
+        return tq_types.NONETYPE
+    else:
+        raise NotImplementedError('Unrecognized type: {}'.format(
+            type(value)))
 
 
 class Compiler(object):
-    def __init__(self, tables_by_name):
+    def __init__(self, tables_by_name, parameter_types=None, view_cache=None,
+                 table_versions=None):
+        """Create a compiler.
+
+        Arguments:
+            tables_by_name: A dict mapping table name to Table or View.
+            parameter_types: A dict mapping the name of each query parameter
+                to its type, or None if no parameters are bound.
+            view_cache: A plan_cache.PlanCache to store compiled views in, or
+                None to compile every view reference from scratch.
+            table_versions: A dict mapping table name to its current version,
+                used to check whether cached views are still valid. Required
+                if view_cache is given.
+        """
         self.tables_by_name = tables_by_name
+        self.parameter_types = parameter_types or {}
+        self.view_cache = view_cache
+        self.table_versions = table_versions
+        # The names of all tables and views that the compiled query reads,
+        # including the ones read indirectly through views.
+        self.referenced_tables = set()
+        # The names of the views currently being compiled, outermost first,
+        # so that we can detect views that (indirectly) refer to themselves.
+        self.view_stack = []
 
     def compile_select(self, select):
         assert isinstance(select, tq_ast.Select)
@@ -38,7 +80,7 @@ class Compiler(object):
         aliases = self.get_aliases(select_fields)
         within_clauses = self.get_within_clauses(select_fields)
         group_set = self.compile_groups(select.groups, select_fields, aliases,
-                                        table_ctx)
+                                        table_ctx, select.group_each)
 
         compiled_field_dict, aggregate_context = self.compile_group_fields(
             select_fields, aliases, within_clauses, group_set, table_ctx)
@@ -78,10 +120,37 @@ class Compiler(object):
             implicit_column_context=implicit_column_context)
         having_expr = self.compile_filter_expr(select.having_expr,
                                                result_context)
+        orderings = self.compile_orderings(select.orderings, result_context,
+                                           table_ctx, group_set)
         return typed_ast.Select(select_fields, table_expr, where_expr,
-                                group_set, having_expr, select.orderings,
+                                group_set, having_expr, orderings,
                                 select.limit, result_context)
 
+    def compile_orderings(self, orderings, result_ctx, table_ctx, group_set):
+        """Resolve the columns that the ORDER BY clause refers to.
+
+        A column name refers to the select field with that alias if there is
+        one. Otherwise, if the select doesn't group, it can refer to a column
+        of the table expression, since each result row then comes from a
+        single table row.
+        """
+        if orderings is None:
+            return None
+        result = []
+        for ordering in orderings:
+            name = ordering.column_id.name
+            if (None, name) in result_ctx.columns:
+                column = typed_ast.ColumnRef(
+                    None, name, result_ctx.columns[(None, name)])
+            elif group_set is not None:
+                raise CompileError(
+                    'ORDER BY in a grouped select must refer to a select '
+                    'field: {}'.format(name))
+            else:
+                column = table_ctx.column_ref_for_name(name)
+            result.append(typed_ast.Ordering(column, ordering.is_ascending))
+        return result
+
     def expand_select_fields(self, select_fields, table_expr):
         """Expand any stars into a list of all context columns.
 
@@ -166,8 +235,8 @@ class Compiler(object):
         these columns can be used in outer selects, but at lower precedence
         than normal select fields.
 
-        This may also be used in the future to determine which fields to
-        actually take from the table.
+        The optimizer uses the same column references to determine which
+        fields to actually take from the table.
         """
         column_references = collections.OrderedDict()
         for select_field in select_field_list:
@@ -175,18 +244,21 @@ class Compiler(object):
                 self.find_column_references(select_field.expr))
         return type_context.TypeContext.from_full_columns(column_references)
 
-    def find_column_references(self, expr):
+    @classmethod
+    def find_column_references(cls, expr):
         """Return an OrderedDict of (table, column) -> type."""
         if (isinstance(expr, typed_ast.FunctionCall) or
                 isinstance(expr, typed_ast.AggregateFunctionCall)):
             result = collections.OrderedDict()
             for arg in expr.args:
-                result.update(self.find_column_references(arg))
+                result.update(cls.find_column_references(arg))
             return result
         elif isinstance(expr, typed_ast.ColumnRef):
             return collections.OrderedDict(
                 [((expr.table, expr.column), expr.type)])
-        elif isinstance(expr, typed_ast.Literal):
+        elif isinstance(expr, typed_ast.CommonSubexpression):
+            return cls.find_column_references(expr.expr)
+        elif isinstance(expr, (typed_ast.Literal, typed_ast.Parameter)):
             return collections.OrderedDict()
         else:
             assert False, 'Unexpected type: %s' % type(expr)
@@ -215,6 +287,7 @@ class Compiler(object):
     def compile_table_expr_TableId(self, table_expr):
         import tinyquery  # TODO(colin): fix circular import
         table = self.tables_by_name[table_expr.name]
+        self.referenced_tables.add(table_expr.name)
         if isinstance(table, tinyquery.Table):
             return self.compile_table_ref(table_expr, table)
         elif isinstance(table, tinyquery.View):
@@ -235,23 +308,62 @@ class Compiler(object):
         # TODO(alan): This code allows fields from the view's implicit column
         # context to be selected, which probably isn't allowed in regular
         # BigQuery.
+        alias = table_expr.alias or table_expr.name
+        compiled_view_select = self.compile_view(table_expr.name, view)
+        # We always want to apply either the alias or the full table name to
+        # the returned type context.
+        new_type_context = (
+            compiled_view_select.type_ctx.context_with_full_alias(alias))
+        return compiled_view_select.with_type_ctx(new_type_context)
+
+    def compile_view(self, view_name, view):
+        """Compile the query for a view, without applying any alias.
 
-        # TODO(alan): We should check for cycles when evaluating views.
-        # Otherwise, circular views will cause an infinite loop.
+        Views are often stacked on top of each other, so compiled views are
+        kept in the view cache (if there is one) along with the tables they
+        depend on, and are reused until one of those tables changes.
+        """
+        if view_name in self.view_stack:
+            cycle = self.view_stack[self.view_stack.index(view_name):]
+            raise CompileError('Circular view reference: {}'.format(
+                ' -> '.join(cycle + [view_name])))
+
+        if self.view_cache is not None:
+            cached_view = self.view_cache.get(view_name, self.table_versions)
+            if cached_view is not None:
+                compiled_view_select, dependencies = cached_view
+                self.referenced_tables.update(dependencies)
+                return compiled_view_select
 
         # The view keeps its query as regular text, so we need to lex and parse
         # it, then include it as if it was a subquery. It's almost correct to
         # re-use the subquery compiling code, except that subquery aliases have
         # special semantics that we don't want to use; an alias on a view
         # should count for all returned fields.
-        alias = table_expr.alias or table_expr.name
-        uncompiled_view_ast = parser.parse_text(view.query)
-        compiled_view_select = self.compile_select(uncompiled_view_ast)
-        # We always want to apply either the alias or the full table name to
-        # the returned type context.
-        new_type_context = (
-            compiled_view_select.type_ctx.context_with_full_alias(alias))
-        return compiled_view_select.with_type_ctx(new_type_context)
+        # Query parameters aren't visible inside views, and we track the
+        # tables that this view reads separately so that we know what to
+        # invalidate it on.
+        outer_parameter_types = self.parameter_types
+        outer_referenced_tables = self.referenced_tables
+        self.parameter_types = {}
+        self.referenced_tables = set([view_name])
+        self.view_stack.append(view_name)
+        try:
+            uncompiled_view_ast = parser.parse_text(view.query)
+            compiled_view_select = self.compile_select(uncompiled_view_ast)
+            dependencies = frozenset(self.referenced_tables)
+        finally:
+            self.view_stack.pop()
+            self.parameter_types = outer_parameter_types
+            self.referenced_tables = outer_referenced_tables
+        self.referenced_tables.update(dependencies)
+
+        if (self.view_cache is not None and
+                dependencies <= set(self.table_versions)):
+            self.view_cache.put(
+                view_name, (compiled_view_select, dependencies),
+                {name: self.table_versions[name] for name in dependencies})
+        return compiled_view_select
 
     def compile_table_expr_TableUnion(self, table_expr):
         compiled_tables = [
@@ -278,13 +390,18 @@ class Compiler(object):
         )
         result_type_ctx = type_context.TypeContext.join_contexts(
             type_contexts)
+        # The tables stay in query order here. The evaluator reorders them
+        # when the query runs, since compiled plans are cached and the table
+        # sizes may have changed by then.
         return typed_ast.Join(
             base=compiled_table_exprs[0],
             tables=zip(compiled_table_exprs[1:],
                        (join_part.join_type
                         for join_part in table_expr.join_parts)),
             conditions=result_fields,
-            type_ctx=result_type_ctx)
+            type_ctx=result_type_ctx,
+            merge_joins=[join_part.each
+                         for join_part in table_expr.join_parts])
 
     def compile_joined_table(self, table_expr):
         """Given one side of a JOIN, get its table expression and alias."""
@@ -380,7 +497,8 @@ class Compiler(object):
             select_result = select_result.with_type_ctx(new_type_context)
         return select_result
 
-    def compile_groups(self, groups, select_fields, aliases, table_ctx):
+    def compile_groups(self, groups, select_fields, aliases, table_ctx,
+                       group_each=False):
         """Gets the group set to use for the query.
 
         This involves handling the special cases when no GROUP BY statement
@@ -394,6 +512,7 @@ class Compiler(object):
                 we are compiling.
             aliases: The aliases we will assign to the select fields.
             table_ctx: The TypeContext from the table expression in the SELECT.
+            group_each: Whether the groups were given with GROUP EACH BY.
         """
         if groups is None:
             # Special case: if no GROUP BY was specified, we're an aggregate
@@ -429,7 +548,7 @@ class Compiler(object):
                     # references could potentially be rethought.
                     field_groups.append(
                         table_ctx.column_ref_for_name(group.name))
-            return typed_ast.GroupSet(alias_groups, field_groups)
+            return typed_ast.GroupSet(alias_groups, field_groups, group_each)
 
     def compile_select_field(self, expr, alias, within_clause, type_ctx):
         if within_clause is not None and within_clause != 'RECORD' and (
@@ -461,19 +580,13 @@ class Compiler(object):
         return type_ctx.column_ref_for_name(expr.name)
 
     def compile_Literal(self, expr, type_ctx):
-        if isinstance(expr.value, bool):
-            return typed_ast.Literal(expr.value, tq_types.BOOL)
-        if isinstance(expr.value, int):
-            return typed_ast.Literal(expr.value, tq_types.INT)
-        if isinstance(expr.value, float):
-            return typed_ast.Literal(expr.value, tq_types.FLOAT)
-        elif isinstance(expr.value, basestring):
-            return typed_ast.Literal(expr.value, tq_types.STRING)
-        elif expr.value is None:
-            return typed_ast.Literal(expr.value, tq_types.NONETYPE)
-        else:
-            raise NotImplementedError('Unrecognized type: {}'.format(
-                type(expr.value)))
+        return typed_ast.Literal(expr.value, type_for_value(expr.value))
+
+    def compile_Parameter(self, expr, type_ctx):
+        if expr.name not in self.parameter_types:
+            raise CompileError(
+                'Query parameter @{} is not bound.'.format(expr.name))
+        return typed_ast.Parameter(expr.name, self.parameter_types[expr.name])
 
     # TODO(Samantha): Don't pass the type, just pass the column so that mode is
     # included.
@@ -535,18 +648,17 @@ class Compiler(object):
         return ast_type(func, compiled_args, result_type)
 
     def compile_CaseExpression(self, expr, type_ctx):
-        """Compile a CASE expression by converting to nested IF calls."""
-        def compile_helper(remaining_clauses):
-            if len(remaining_clauses) == 0:
-                return tq_ast.Literal(value=None)
-            clause = remaining_clauses[0]
-            return tq_ast.FunctionCall(
-                name='if',
-                args=[clause.condition,
-                      clause.result_expr,
-                      compile_helper(remaining_clauses[1:])])
-        case_as_nested_if = compile_helper(expr.clauses)
-        return self.compile_FunctionCall(case_as_nested_if, type_ctx)
+        """Compile a CASE expression to a call to the CASE function.
+
+        The function takes the condition and result of each clause in turn,
+        so that each condition and result is only evaluated for the rows
+        that reach it.
+        """
+        args = []
+        for clause in expr.clauses:
+            args.extend([clause.condition, clause.result_expr])
+        return self.compile_FunctionCall(
+            tq_ast.FunctionCall(name='case', args=args), type_ctx)
 
     @classmethod
     def get_aliases(cls, select_field_list):
@@ -605,7 +717,7 @@ class Compiler(object):
                         for arg in expr.args))
         elif isinstance(expr, tq_ast.CaseExpression):
             return False
-        elif isinstance(expr, tq_ast.Literal):
+        elif isinstance(expr, (tq_ast.Literal, tq_ast.Parameter)):
             return False
         elif isinstance(expr, tq_ast.ColumnId):
             return False
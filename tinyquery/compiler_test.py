@@ -154,6 +154,46 @@ class CompilerTest(unittest.TestCase):
                 ))
         )
 
+    def test_compile_parameter(self):
+        self.assertEqual(
+            typed_ast.Select(
+                [typed_ast.SelectField(
+                    typed_ast.ColumnRef('table1', 'value', tq_types.INT),
+                    'value', None)],
+                typed_ast.Table('table1', self.table1_type_ctx),
+                typed_ast.FunctionCall(
+                    runtime.get_binary_op('>'),
+                    [typed_ast.ColumnRef('table1', 'value', tq_types.INT),
+                     typed_ast.Parameter('min_value', tq_types.INT)],
+                    tq_types.BOOL),
+                None,
+                typed_ast.Literal(True, tq_types.BOOL),
+                None,
+                None,
+                self.make_type_context(
+                    [(None, 'value', tq_types.INT)],
+                    self.make_type_context([('table1', 'value', tq_types.INT)])
+                )),
+            compiler.compile_text(
+                'SELECT value FROM table1 WHERE value > @min_value',
+                self.tables_by_name, {'min_value': tq_types.INT}))
+
+    def test_self_referencing_view(self):
+        self.tables_by_name['view1'] = tinyquery.View(
+            'view1', 'SELECT value FROM view2')
+        self.tables_by_name['view2'] = tinyquery.View(
+            'view2', 'SELECT value FROM table1, view1')
+        self.assert_compile_error('SELECT value FROM view1')
+
+    def test_unbound_parameter(self):
+        self.assert_compile_error('SELECT value FROM table1 WHERE value > @x')
+
+    def test_parameter_type_checked(self):
+        self.assertRaises(
+            compiler.CompileError, compiler.compile_text,
+            'SELECT value + @x FROM table1', self.tables_by_name,
+            {'x': tq_types.STRING})
+
     def test_unary_operator(self):
         self.assert_compiled_select(
             'SELECT -5',
@@ -253,18 +293,12 @@ class CompilerTest(unittest.TestCase):
                 select_fields=[
                     typed_ast.SelectField(
                         typed_ast.FunctionCall(
-                            runtime.get_func('if'),
+                            runtime.get_func('case'),
                         [
                             typed_ast.Literal(True, tq_types.BOOL),
                             typed_ast.Literal(1, tq_types.INT),
-                            typed_ast.FunctionCall(
-                                runtime.get_func('if'),
-                                [
-                                    typed_ast.Literal(False, tq_types.BOOL),
-                                    typed_ast.Literal(2, tq_types.INT),
-                                    typed_ast.Literal(None, tq_types.NONETYPE),
-                                ],
-                                tq_types.INT)
+                            typed_ast.Literal(False, tq_types.BOOL),
+                            typed_ast.Literal(2, tq_types.INT),
                         ],
                         tq_types.INT),
                     'f0_', None)
@@ -464,6 +498,23 @@ class CompilerTest(unittest.TestCase):
                     self.make_type_context([]))
             ))
 
+
+    def test_group_each_by(self):
+        select = compiler.compile_text(
+            'SELECT SUM(value) FROM table1 GROUP EACH BY value2',
+            self.tables_by_name)
+        self.assertEqual(
+            typed_ast.GroupSet(
+                alias_groups=set(),
+                field_groups=[
+                    typed_ast.ColumnRef('table1', 'value2', tq_types.INT)],
+                parallel=True),
+            select.group_set)
+        select = compiler.compile_text(
+            'SELECT SUM(value) FROM table1 GROUP BY value2',
+            self.tables_by_name)
+        self.assertFalse(select.group_set.parallel)
+
     def test_order_by_field(self):
         self.assert_compiled_select(
             'SELECT value FROM table1 ORDER BY value2 DESC',
@@ -475,7 +526,9 @@ class CompilerTest(unittest.TestCase):
                 where_expr=typed_ast.Literal(True, tq_types.BOOL),
                 group_set=None,
                 having_expr=typed_ast.Literal(True, tq_types.BOOL),
-                orderings=[tq_ast.Ordering(tq_ast.ColumnId('value2'), False)],
+                orderings=[typed_ast.Ordering(
+                    typed_ast.ColumnRef('table1', 'value2', tq_types.INT),
+                    False)],
                 limit=None,
                 type_ctx=self.make_type_context(
                     [(None, 'value', tq_types.INT)],
@@ -494,8 +547,14 @@ class CompilerTest(unittest.TestCase):
                 where_expr=typed_ast.Literal(True, tq_types.BOOL),
                 group_set=None,
                 having_expr=typed_ast.Literal(True, tq_types.BOOL),
-                orderings=[tq_ast.Ordering(tq_ast.ColumnId('value2'), True),
-                           tq_ast.Ordering(tq_ast.ColumnId('value'), False)],
+                orderings=[
+                    typed_ast.Ordering(
+                        typed_ast.ColumnRef('table1', 'value2', tq_types.INT),
+                        True),
+                    # Select field aliases take precedence over table columns.
+                    typed_ast.Ordering(
+                        typed_ast.ColumnRef(None, 'value', tq_types.INT),
+                        False)],
                 limit=None,
                 type_ctx=self.make_type_context(
                     [(None, 'value', tq_types.INT)],
@@ -503,6 +562,11 @@ class CompilerTest(unittest.TestCase):
                                             ]))
             ))
 
+    def test_order_by_grouped_table_column(self):
+        self.assert_compile_error(
+            'SELECT value, COUNT(*) FROM table1 GROUP BY value '
+            'ORDER BY value2')
+
     def test_select_grouped_and_non_grouped_fields(self):
         self.assert_compiled_select(
             'SELECT value, SUM(value2) FROM table1 GROUP BY value',
@@ -752,7 +816,8 @@ class CompilerTest(unittest.TestCase):
                         ('t1', 'value2', tq_types.INT),
                         ('t2', 'value', tq_types.INT),
                         ('t2', 'value3', tq_types.INT),
-                    ])
+                    ]),
+                    [False]
                 ),
                 typed_ast.Literal(True, tq_types.BOOL),
                 None,
@@ -802,7 +867,8 @@ class CompilerTest(unittest.TestCase):
                         ('t1', 'value2', tq_types.INT),
                         ('t2', 'value', tq_types.INT),
                         ('t2', 'value3', tq_types.INT),
-                    ])
+                    ]),
+                    merge_joins=[False]
                 ),
                 where_expr=typed_ast.Literal(True, tq_types.BOOL),
                 group_set=None,
@@ -859,7 +925,8 @@ class CompilerTest(unittest.TestCase):
                         ('t2', 'value', tq_types.INT),
                         ('t2', 'value3', tq_types.INT),
                         ('t3', 'value', tq_types.INT),
-                    ])
+                    ]),
+                    merge_joins=[False, False]
                 ),
                 where_expr=typed_ast.Literal(True, tq_types.BOOL),
                 group_set=None,
@@ -872,6 +939,21 @@ class CompilerTest(unittest.TestCase):
             )
         )
 
+    def test_joins_compiled_in_query_order(self):
+        # Joins are only reordered when they're evaluated, so cached plans
+        # don't keep an order based on old table sizes.
+        self.table1.num_rows = 100
+        self.table2.num_rows = 10
+        self.table3.num_rows = 1
+        select = compiler.compile_text(
+            'SELECT 0 '
+            'FROM table1 t1 JOIN table2 t2 ON t1.value = t2.value '
+            'JOIN table3 t3 ON t2.value3 = t3.value', self.tables_by_name)
+        join = select.table
+        self.assertEqual(
+            ['table1', 'table2', 'table3'],
+            [join.base.name] + [table.name for table, _ in join.tables])
+
     def test_select_star(self):
         self.assert_compiled_select(
             'SELECT * FROM table1',
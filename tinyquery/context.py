@@ -22,6 +22,9 @@ class Context(object):
         aggregate_context: Either None, indicating that aggregate functions
             aren't allowed, or another Context to use whenever we enter into an
             aggregate function.
+        expression_cache: A dict from the key of a CommonSubexpression to the
+            Column it evaluated to in this context. This isn't part of the
+            context's value, and is cleared whenever the context is modified.
     """
     def __init__(self, num_rows, columns, aggregate_context):
         assert isinstance(columns, collections.OrderedDict)
@@ -34,6 +37,7 @@ class Context(object):
         self.num_rows = num_rows
         self.columns = columns
         self.aggregate_context = aggregate_context
+        self.expression_cache = {}
 
     def column_from_ref(self, column_ref):
         """Given a ColumnRef, return the corresponding column."""
@@ -59,34 +63,161 @@ class Column(collections.namedtuple('Column', ['type', 'mode', 'values'])):
 
     Fields:
         type: A constant from the tq_types module.
-        values: A list of raw values for the column contents.
+        values: A list of raw values for the column contents, a
+            ConstantValues if every row has the same value, or a
+            SelectedValues if the rows were selected by a filter.
     """
 
 
+class ConstantValues(collections.Sequence):
+    """A read-only list of a single value repeated a number of times.
+
+    Literals and other expressions that have the same value in every row
+    evaluate to a column with these values rather than a list, so they take
+    constant space and functions can do their work once rather than once per
+    row. Columns that end up in a query result always have real lists.
+    """
+    def __init__(self, value, length):
+        self.value = value
+        self.length = length
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ConstantValues(
+                self.value, len(xrange(*index.indices(self.length))))
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError('ConstantValues index out of range')
+        return self.value
+
+    def __iter__(self):
+        return itertools.repeat(self.value, self.length)
+
+    def __eq__(self, other):
+        if not isinstance(other, (list, ConstantValues, SelectedValues)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'ConstantValues({!r}, {})'.format(self.value, self.length)
+
+
+class SelectedValues(collections.Sequence):
+    """A read-only view of the values at some indices of another list.
+
+    Filters pick out the rows they keep with a list of row indices (a
+    selection vector) rather than copying every column, and each column is
+    only gathered into a list the first time something reads its values, so
+    columns that are never used after a filter are never copied. Selecting
+    rows from a column that hasn't been gathered yet just composes the
+    selection vectors, so chains of filters and subqueries only copy the
+    values that are actually needed. Like ConstantValues, these never end up
+    in a query result.
+
+    Fields:
+        base: The list of values to select from.
+        indices: A list of the indices in base of the selected values, or
+            None if every value is selected.
+    """
+    def __init__(self, base, indices):
+        self.base = base
+        self.indices = indices
+        self.gathered = None
+
+    def gather(self):
+        """Return the selected values as a list, copying them only once."""
+        if self.gathered is None:
+            if self.indices is None:
+                self.gathered = list(self.base)
+            else:
+                base = self.base
+                self.gathered = [base[i] for i in self.indices]
+        return self.gathered
+
+    def __len__(self):
+        if self.indices is None:
+            return len(self.base)
+        return len(self.indices)
+
+    def __getitem__(self, index):
+        if self.gathered is not None:
+            return self.gathered[index]
+        indices = self.indices
+        if indices is None:
+            if isinstance(index, slice):
+                return SelectedValues(
+                    self.base, range(*index.indices(len(self.base))))
+            return self.base[index]
+        if isinstance(index, slice):
+            return SelectedValues(self.base, indices[index])
+        return self.base[indices[index]]
+
+    def __iter__(self):
+        return iter(self.gather())
+
+    def __eq__(self, other):
+        if not isinstance(other, (list, ConstantValues, SelectedValues)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'SelectedValues({!r}, {!r})'.format(self.base, self.indices)
+
+
+def map_values(func, values):
+    """Apply a function to every value in a list of column values.
+
+    If the values are a ConstantValues, the function is only called once.
+    """
+    if isinstance(values, ConstantValues):
+        if not values:
+            return []
+        return ConstantValues(func(values.value), len(values))
+    return map(func, values)
+
+
 def context_from_table(table, type_context):
     """Given a table and a type context, build a context with those values.
 
-    The order of the columns in the type context must match the order of the
-    columns in the table.
+    The type context is keyed on (table alias, column name), and may only
+    contain some of the columns of the table, in which case the other columns
+    are left out of the context.
     """
-    any_column = table.columns.itervalues().next()
     new_columns = collections.OrderedDict([
-        (column_name, column)
-        for (column_name, column) in zip(type_context.columns.iterkeys(),
-                                         table.columns.itervalues())
+        ((table_name, column_name), table.columns[column_name])
+        for (table_name, column_name) in type_context.columns.iterkeys()
     ])
-    return Context(len(any_column.values), new_columns, None)
+    return Context(table.num_rows, new_columns, None)
 
 
 def context_with_overlayed_type_context(context, type_context):
     """Given a context, use the given type context for all column names."""
-    any_column = context.columns.itervalues().next()
     new_columns = collections.OrderedDict([
         (column_name, column)
         for (column_name, column) in zip(type_context.columns.iterkeys(),
                                          context.columns.itervalues())
     ])
-    return Context(len(any_column.values), new_columns, None)
+    return Context(context.num_rows, new_columns, None)
 
 
 def empty_context_from_type_context(type_context):
@@ -106,6 +237,9 @@ def mask_context(context, mask):
         context: A Context to filter.
         mask: A column of type bool. Each row in this column should be True if
             the row should be kept for the whole context and False otherwise.
+
+    Unless the mask is repeated, the kept rows are selected with select_rows,
+    so no column is copied until it's used.
     """
     assert context.aggregate_context is None, (
         'Cannot mask a context with an aggregate context.')
@@ -180,26 +314,101 @@ def mask_context(context, mask):
                 type=col.type,
                 mode=col.mode,
                 values=new_values)
-    else:
-        orig_column_values = [
-            col.values for col in context.columns.itervalues()]
-        mask_values = mask.values
-        num_rows = len(filter(None, mask.values))
-        new_values = [
-            Column(
-                type=col.type,
-                mode=col.mode,
-                values=list(itertools.compress(values, mask_values)))
-            for col, values in zip(context.columns.itervalues(),
-                                   orig_column_values)]
-        new_columns = collections.OrderedDict([
-            (name, col) for name, col in zip(context.columns.iterkeys(),
-                                             new_values)])
+        return Context(num_rows, new_columns, None)
+    return select_rows(context, masked_rows(context.num_rows, mask))
 
-    return Context(
-        num_rows,
-        new_columns,
-        None)
+
+def masked_rows(num_rows, mask):
+    """Find the rows that a mask that isn't repeated keeps.
+
+    Returns: A list of the indices of the kept rows, or None if every row is
+        kept.
+    """
+    if isinstance(mask.values, ConstantValues):
+        # Filters like the default WHERE true keep every row or none of them,
+        # so there's no need to look at the mask for each row.
+        return None if mask.values.value else []
+    return list(itertools.compress(xrange(num_rows), mask.values))
+
+
+def select_rows(src_context, indices):
+    """Select some of the rows of a context without copying any values.
+
+    Each column of the result is a view of the selected rows that is only
+    gathered into a list when it's used. Columns that are already views of
+    another list select from that list directly, so the selection vectors of
+    a chain of filters are composed rather than each filter copying data.
+
+    Arguments:
+        src_context: A Context to select rows from.
+        indices: A list of the indices of the rows to keep, in the order they
+            should appear in the result, or None to keep every row.
+    """
+    assert src_context.aggregate_context is None
+    num_rows = src_context.num_rows if indices is None else len(indices)
+    # Columns selected by the same earlier filter share its selection vector,
+    # so each selection vector only needs to be composed with the new one
+    # once. Each entry keeps the old vector alive so its id isn't reused.
+    composed_indices = {}
+
+    def select_values(values):
+        if isinstance(values, ConstantValues):
+            return ConstantValues(values.value, num_rows)
+        if isinstance(values, SelectedValues) and values.gathered is None:
+            if indices is None:
+                return values
+            if values.indices is None:
+                return SelectedValues(values.base, indices)
+            entry = composed_indices.get(id(values.indices))
+            if entry is None:
+                old_indices = values.indices
+                entry = (old_indices, [old_indices[i] for i in indices])
+                composed_indices[id(old_indices)] = entry
+            return SelectedValues(values.base, entry[1])
+        if isinstance(values, SelectedValues):
+            values = values.gathered
+        return SelectedValues(values, indices)
+
+    new_columns = collections.OrderedDict(
+        (name, Column(type=col.type, mode=col.mode,
+                      values=select_values(col.values)))
+        for name, col in src_context.columns.iteritems())
+    result = Context(num_rows, new_columns, None)
+    # Select the cached values of common subexpressions along with the
+    # columns, so that expressions that also appear in the WHERE clause
+    # don't need to be computed again for the selected rows.
+    for key, col in src_context.expression_cache.iteritems():
+        if col.mode != tq_modes.REPEATED:
+            result.expression_cache[key] = Column(
+                type=col.type, mode=col.mode,
+                values=select_values(col.values))
+    return result
+
+
+def gathered_context(src_context):
+    """Return a context like the given one where every column is a list.
+
+    This is used on query results, which shouldn't have columns that are
+    views of the data of some other context.
+    """
+    assert src_context.aggregate_context is None
+    columns = collections.OrderedDict(
+        (name, Column(type=col.type, mode=col.mode,
+                      values=col.values.gather()))
+        if isinstance(col.values, SelectedValues) else (name, col)
+        for name, col in src_context.columns.iteritems())
+    return Context(src_context.num_rows, columns, None)
+
+
+def gather_values(values, indices):
+    """Return a list of the values at the given indices of a column."""
+    if isinstance(values, SelectedValues) and values.gathered is None:
+        base = values.base
+        if values.indices is not None:
+            selected = values.indices
+            return [base[selected[i]] for i in indices]
+        values = base
+    return [values[i] for i in indices]
 
 
 def empty_context_from_template(context):
@@ -224,6 +433,7 @@ def append_row_to_context(src_context, index, dest_context):
     The schemas of the two contexts must match.
     """
     dest_context.num_rows += 1
+    dest_context.expression_cache.clear()
     for name, column in dest_context.columns.iteritems():
         column.values.append(src_context.columns[name].values[index])
 
@@ -238,6 +448,7 @@ def append_partial_context_to_context(src_context, dest_context):
     names rather than fully-qualified names.
     """
     dest_context.num_rows += src_context.num_rows
+    dest_context.expression_cache.clear()
     # Ignore fully-qualified names for this operation.
     short_named_src_column_values = {
         col_name: column.values
@@ -258,6 +469,7 @@ def append_context_to_context(src_context, dest_context):
     account.
     """
     dest_context.num_rows += src_context.num_rows
+    dest_context.expression_cache.clear()
     for dest_column_key, dest_column in dest_context.columns.iteritems():
         src_column = src_context.columns.get(dest_column_key)
         if src_column is None:
@@ -266,6 +478,55 @@ def append_context_to_context(src_context, dest_context):
             dest_column.values.extend(src_column.values)
 
 
+def gather_rows(src_context, indices):
+    """Build a new context from the rows with the given indices, in order."""
+    assert src_context.aggregate_context is None
+    columns = collections.OrderedDict(
+        (col_name, Column(type=col.type, mode=col.mode,
+                          values=gather_values(col.values, indices)))
+        for col_name, col in src_context.columns.iteritems())
+    return Context(len(indices), columns, None)
+
+
+def slice_context(src_context, start, end):
+    """Build a context with the rows from start up to (not including) end."""
+    assert src_context.aggregate_context is None
+    if start == 0 and end == src_context.num_rows:
+        return src_context
+    columns = collections.OrderedDict(
+        (col_name, Column(type=col.type, mode=col.mode,
+                          values=col.values[start:end]))
+        for col_name, col in src_context.columns.iteritems())
+    return Context(end - start, columns, None)
+
+
+def join_rows(context1, positions1, context2, positions2):
+    """Build a context with columns from two contexts side by side.
+
+    Arguments:
+        context1: The context for the first columns of the result.
+        positions1: A list with the index in context1 of each result row.
+        context2: The context for the rest of the columns of the result.
+        positions2: A list with the index in context2 of each result row, or
+            None for a row of nulls.
+    """
+    assert context1.aggregate_context is None
+    assert context2.aggregate_context is None
+    columns = gather_rows(context1, positions1).columns
+    has_nulls = None in positions2
+    for col_name, col in context2.columns.iteritems():
+        values = col.values
+        if isinstance(values, SelectedValues):
+            values = values.gather()
+        if has_nulls:
+            gathered = [None if i is None else values[i] for i in positions2]
+        else:
+            gathered = [values[i] for i in positions2]
+        columns[col_name] = Column(type=col.type, mode=col.mode,
+                                   values=gathered)
+    return Context(len(positions1), columns, None)
+
+
 def row_context_from_context(src_context, index):
     """Pull a specific row out of a context as its own context."""
     assert src_context.aggregate_context is None
@@ -277,22 +538,82 @@ def row_context_from_context(src_context, index):
     return Context(1, columns, None)
 
 
-def cross_join_contexts(context1, context2):
+def repeat_values(values, times):
+    """List each value some number of times in a row, like numpy.repeat."""
+    if not isinstance(values, list):
+        values = list(values)
+    result = [None] * (len(values) * times)
+    # Fill in the result with whichever takes fewer slice assignments.
+    if times <= len(values):
+        for offset in xrange(times):
+            result[offset::times] = values
+    else:
+        for i, value in enumerate(values):
+            result[i * times:(i + 1) * times] = [value] * times
+    return result
+
+
+def tile_values(values, times):
+    """List all of the values some number of times over, like numpy.tile."""
+    return list(values) * times
+
+
+def cross_join_contexts(context1, context2, max_rows=None):
+    """Build a context with every pairing of a row of each of two contexts.
+
+    The result has the columns of context1 and then those of context2, and
+    its rows are in context1 order, with the rows paired with each row of
+    context1 in context2 order. Each column is built at once by repeating
+    or tiling the values of the input column.
+
+    Arguments:
+        context1: The context for the first columns of the result.
+        context2: The context for the rest of the columns of the result.
+        max_rows: Either None, or the most rows that the result may have.
+            A ValueError is raised before building a bigger result.
+    """
     assert context1.aggregate_context is None
     assert context2.aggregate_context is None
+    num_rows = context1.num_rows * context2.num_rows
+    if max_rows is not None and num_rows > max_rows:
+        raise ValueError(
+            'Cross join would have {} rows, more than the limit of {}.'.format(
+                num_rows, max_rows))
     result_columns = collections.OrderedDict(
-        [(col_name, Column(type=col.type, mode=col.mode, values=[]))
+        [(col_name, Column(type=col.type, mode=col.mode,
+                           values=repeat_values(col.values,
+                                                context2.num_rows)))
          for col_name, col in context1.columns.iteritems()] +
-        [(col_name, Column(type=col.type, mode=col.mode, values=[]))
+        [(col_name, Column(type=col.type, mode=col.mode,
+                           values=tile_values(col.values, context1.num_rows)))
          for col_name, col in context2.columns.iteritems()])
+    return Context(num_rows, result_columns, None)
+
+
+def cross_join_batches(context1, context2, batch_size):
+    """Generate the rows of cross_join_contexts in batches.
 
-    for index1 in xrange(context1.num_rows):
-        for index2 in xrange(context2.num_rows):
-            for col_name, column in context1.columns.iteritems():
-                result_columns[col_name].values.append(column.values[index1])
-            for col_name, column in context2.columns.iteritems():
-                result_columns[col_name].values.append(column.values[index2])
-    return Context(context1.num_rows * context2.num_rows, result_columns, None)
+    Each batch has at most batch_size rows, and there's always at least one
+    batch, so the result can be streamed without ever building all of it.
+    """
+    num_rows2 = context2.num_rows
+    if context1.num_rows == 0 or num_rows2 == 0:
+        yield cross_join_contexts(context1, context2)
+    elif num_rows2 >= batch_size:
+        for index1 in xrange(context1.num_rows):
+            row_context = slice_context(context1, index1, index1 + 1)
+            for start in xrange(0, num_rows2, batch_size):
+                yield cross_join_contexts(
+                    row_context,
+                    slice_context(context2, start,
+                                  min(start + batch_size, num_rows2)))
+    else:
+        rows_per_batch = batch_size // num_rows2
+        for start in xrange(0, context1.num_rows, rows_per_batch):
+            yield cross_join_contexts(
+                slice_context(context1, start,
+                              min(start + rows_per_batch, context1.num_rows)),
+                context2)
 
 
 def truncate_context(context, limit):
@@ -303,6 +624,10 @@ def truncate_context(context, limit):
     if context.num_rows <= limit:
         return
     context.num_rows = limit
+    context.expression_cache.clear()
 
-    for column in context.columns.itervalues():
-        column.values[limit:] = []
+    # Columns may be views of another context's values, so rather than
+    # truncating the values in place, each column gets a slice of them.
+    for col_name, column in context.columns.items():
+        context.columns[col_name] = Column(
+            type=column.type, mode=column.mode, values=column.values[:limit])
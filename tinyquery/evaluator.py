@@ -1,26 +1,303 @@
 # TODO(colin): fix these lint errors (http://pep8.readthedocs.io/en/release-1.7.x/intro.html#error-codes)
 # pep8-disable:E115,E128
+import bisect
 import collections
+import itertools
+import operator
 
+import aggregation
 import context
+import parallel
+import sorting
 import tq_ast
 import tq_modes
 import typed_ast
 import tq_types
 
 
+# The number of rows at a time that are added to the states of aggregates.
+AGGREGATION_BATCH_SIZE = 10000
+# Rough estimates of the memory used for each group when aggregating, for the
+# group itself and for each key value and aggregate state, used to keep the
+# number of groups in memory within the memory budget.
+AGGREGATION_BYTES_PER_GROUP = 150
+AGGREGATION_BYTES_PER_VALUE = 50
+# Rough estimates of the memory used to sort each row, for each key column and
+# for the row itself, used to keep sorts within the memory budget.
+SORT_BYTES_PER_KEY_VALUE = 40
+SORT_BYTES_PER_ROW = 80
+# The most rows that a cross join may build, so that a query that would pair
+# up two big tables fails quickly rather than running out of memory.
+MAX_CROSS_JOIN_ROWS = 10 ** 8
+# The fewest rows that are worth splitting between worker processes, since
+# forking the workers has a cost of its own.
+PARALLEL_MIN_ROWS = 50000
+
+
+def aggregate_column_key(index):
+    """The key of the column for the result of an aggregate call.
+
+    Column names can't contain '$', so these never clash with real columns.
+    """
+    return None, '$aggregate{}'.format(index)
+
+
+def row_batches(key_values, arg_values, num_rows, first_row=0):
+    """Split rows into batches for aggregation.aggregate_batches.
+
+    Arguments:
+        key_values: A list of the values of each column of the group key.
+        arg_values: A list of the values of each aggregate's argument.
+        num_rows: The number of rows.
+        first_row: The number to give the first row, if these rows come
+            after others in the input.
+    """
+    for start in xrange(0, num_rows, AGGREGATION_BATCH_SIZE):
+        end = min(start + AGGREGATION_BATCH_SIZE, num_rows)
+        if key_values:
+            keys = zip(*[values[start:end] for values in key_values])
+        else:
+            keys = [()] * (end - start)
+        yield (xrange(first_row + start, first_row + end), keys,
+               [values[start:end] for values in arg_values])
+
+
+def replace_aggregate_calls(expr, aggregate_calls):
+    """Replace the aggregate calls in an expression with column references.
+
+    Arguments:
+        expr: The expression to replace aggregate calls in.
+        aggregate_calls: A list that each AggregateFunctionCall is appended
+            to. The call is replaced with a reference to the column with the
+            key aggregate_column_key(i), where i is its index in the list.
+    """
+    if isinstance(expr, typed_ast.AggregateFunctionCall):
+        aggregate_calls.append(expr)
+        table, column = aggregate_column_key(len(aggregate_calls) - 1)
+        return typed_ast.ColumnRef(table, column, expr.type)
+    elif isinstance(expr, typed_ast.FunctionCall):
+        return typed_ast.FunctionCall(
+            expr.func, [replace_aggregate_calls(arg, aggregate_calls)
+                        for arg in expr.args], expr.type)
+    elif isinstance(expr, typed_ast.CommonSubexpression):
+        return typed_ast.CommonSubexpression(
+            expr.key, replace_aggregate_calls(expr.expr, aggregate_calls),
+            expr.type)
+    return expr
+
+
+def match_join_keys(probe_keys, build_keys, keep_unmatched):
+    """Find the pairs of rows with equal keys on the two sides of a join.
+
+    Arguments:
+        probe_keys: A list of the join key of each row on one side.
+        build_keys: A list of the join key of each row on the other side,
+            which we build an index of, so it should be the smaller side.
+        keep_unmatched: Whether probe rows without a matching build row
+            should be in the result, paired with a position of None.
+
+    Returns: A pair of lists with the probe row and build row positions of
+        each result row. The result rows are in probe order, and the matches
+        for each probe row are in build order.
+    """
+    # Map each key to the positions of the build rows with that key.
+    build_positions_by_key = {}
+    for position, build_key in enumerate(build_keys):
+        positions = build_positions_by_key.get(build_key)
+        if positions is None:
+            positions = build_positions_by_key[build_key] = []
+        positions.append(position)
+
+    probe_positions = []
+    build_positions = []
+    for position, probe_key in enumerate(probe_keys):
+        positions = build_positions_by_key.get(probe_key)
+        if positions is not None:
+            probe_positions.extend([position] * len(positions))
+            build_positions.extend(positions)
+        elif keep_unmatched:
+            probe_positions.append(position)
+            build_positions.append(None)
+    return probe_positions, build_positions
+
+
+def is_sorted(keys):
+    """Return whether a list of keys is in ascending order."""
+    return all(itertools.imap(operator.le, keys,
+                              itertools.islice(keys, 1, None)))
+
+
+def has_ascending_order(table_expr):
+    """Return whether a table expression's rows come out in ascending order.
+
+    Only a subquery with an all-ascending ORDER BY does, and only its join
+    keys are worth checking for a merge join without a JOIN EACH hint.
+    """
+    return (isinstance(table_expr, typed_ast.Select) and
+            bool(table_expr.orderings) and
+            all(ordering.is_ascending for ordering in table_expr.orderings))
+
+
+def merge_join_keys(lhs_keys, rhs_keys, keep_unmatched, rhs_order=None):
+    """Generate the pairs of rows with equal keys with a sort-merge join.
+
+    This finds the same pairs as match_join_keys(lhs_keys, rhs_keys, ...),
+    but rather than an index of the rhs, it only needs the rhs rows in key
+    order. The matches for each lhs row are found with a binary search of
+    the sorted rhs that starts where the previous row's matches started if
+    the keys are ascending, so when the lhs is sorted too, the search walks
+    along the rhs like a merge. Each pair is generated as soon as it's found.
+
+    Arguments:
+        lhs_keys: A list of the join key of each lhs row.
+        rhs_keys: A list of the join key of each rhs row.
+        keep_unmatched: Whether lhs rows without a matching rhs row should be
+            paired with a position of None.
+        rhs_order: The rhs row positions in ascending key order, with equal
+            keys in their original order, or None if rhs_keys is sorted.
+
+    Yields: (lhs position, rhs position) pairs, in lhs order, with the
+        matches for each lhs row in rhs order.
+    """
+    if rhs_order is None:
+        sorted_rhs_keys = rhs_keys
+        rhs_order = xrange(len(rhs_keys))
+    else:
+        # This only holds references to the keys, so it's no bigger than
+        # rhs_order, and lets bisect compare keys without calling back into
+        # Python for each one.
+        sorted_rhs_keys = map(rhs_keys.__getitem__, rhs_order)
+    search_start = 0
+    previous_key = None
+    for position, key in enumerate(lhs_keys):
+        if position == 0 or key < previous_key:
+            search_start = 0
+        match_start = bisect.bisect_left(sorted_rhs_keys, key, search_start)
+        match_end = bisect.bisect_right(sorted_rhs_keys, key, match_start)
+        if match_start < match_end:
+            for match_index in xrange(match_start, match_end):
+                yield position, rhs_order[match_index]
+        elif keep_unmatched:
+            yield position, None
+        search_start = match_start
+        previous_key = key
+
+
 class Evaluator(object):
-    def __init__(self, tables_by_name):
+    def __init__(self, tables_by_name, parameters=None, memory_budget=None,
+                 num_processes=None):
+        """Create an evaluator.
+
+        Arguments:
+            tables_by_name: A dict mapping table name to Table or View.
+            parameters: A dict mapping the name of each query parameter to
+                its value, or None if the query doesn't use parameters.
+            memory_budget: Roughly how many bytes the evaluator may use for
+                its working data before spilling to temporary files, or None
+                for no limit.
+            num_processes: How many worker processes to split big steps of a
+                query between, or None to only use several processes for the
+                steps that the query asks to run in parallel (like GROUP EACH
+                BY), with one for each CPU.
+        """
         self.tables_by_name = tables_by_name
+        self.parameters = parameters or {}
+        self.memory_budget = memory_budget
+        self.num_processes = num_processes
 
-    def evaluate_select(self, select_ast):
-        """Given a select statement, return a Context with the results."""
+    def evaluate_select(self, select_ast, lazy=False):
+        """Given a select statement, return a Context with the results.
+
+        Arguments:
+            select_ast: The typed_ast.Select to evaluate.
+            lazy: If True, the columns of the result may be views of the rows
+                that passed the HAVING clause and ORDER BY, rather than
+                lists. This lets a query that selects from a subquery filter
+                the subquery's rows without copying them first.
+        """
         assert isinstance(select_ast, typed_ast.Select)
 
         table_context = self.evaluate_table_expr(select_ast.table)
-        mask_column = self.evaluate_expr(select_ast.where_expr, table_context)
-        select_context = context.mask_context(table_context, mask_column)
+        scan = self.scan_in_processes(select_ast, table_context)
+        if scan is None:
+            mask_column = self.evaluate_expr(select_ast.where_expr,
+                                             table_context)
+            select_context = context.mask_context(table_context, mask_column)
+            result = None
+        else:
+            select_context, result = scan
+        if result is None:
+            result = self.evaluate_select_result(select_ast, select_context)
+        return self.finish_select(select_ast, select_context, result, lazy)
+
+    def scan_in_processes(self, select_ast, table_context):
+        """Filter the rows of a table in worker processes.
+
+        The rows are split into a range for each process, and each worker
+        evaluates the WHERE clause over its range, along with the select
+        fields if the select doesn't group. The workers read the table's
+        columns copy-on-write, so only the kept row numbers and the selected
+        values are sent back, and these are put back together in order.
+
+        Returns:
+            None if the scan should run in this process. Otherwise, a pair of
+            a context with the rows that passed the WHERE clause, as a view
+            of table_context, and the result of the select fields, or None
+            if the select groups.
+        """
+        num_rows = table_context.num_rows
+        num_processes = self.worker_processes(num_rows)
+        if (num_processes == 1 or
+                not isinstance(select_ast.table, typed_ast.Table) or
+                any(column.mode == tq_modes.REPEATED
+                    for column in table_context.columns.itervalues())):
+            return None
+        project = select_ast.group_set is None
+        bounds = [num_rows * i // num_processes
+                  for i in xrange(num_processes + 1)]
 
+        def scan_range(index):
+            start, end = bounds[index], bounds[index + 1]
+            range_context = context.slice_context(table_context, start, end)
+            mask_column = self.evaluate_expr(select_ast.where_expr,
+                                             range_context)
+            rows = context.masked_rows(range_context.num_rows, mask_column)
+            result = None
+            if project:
+                result = self.evaluate_select_fields(
+                    select_ast.select_fields,
+                    context.select_rows(range_context, rows))
+            if rows is None:
+                rows = xrange(start, end)
+            elif start > 0:
+                rows = [start + row for row in rows]
+            return rows, result
+
+        scans = parallel.map_in_processes(scan_range, num_processes,
+                                          num_processes)
+        rows = list(itertools.chain.from_iterable(
+            range_rows for range_rows, _ in scans))
+        if len(rows) == num_rows:
+            rows = None
+        select_context = context.select_rows(table_context, rows)
+        result = None
+        if project:
+            result = context.empty_context_from_template(scans[0][1])
+            for _, range_result in scans:
+                context.append_context_to_context(range_result, result)
+        return select_context, result
+
+    def evaluate_select_result(self, select_ast, select_context):
+        """Evaluate the select fields of a select, grouping if needed.
+
+        Arguments:
+            select_ast: The typed_ast.Select being evaluated.
+            select_context: A context with the rows of the table expression
+                that passed the WHERE clause.
+
+        Returns:
+            A context with a column for each select field.
+        """
         if select_ast.group_set is not None:
             num_scoped_agg = sum(
                 select_field.within_clause is not None
@@ -44,16 +321,32 @@ class Evaluator(object):
         else:
             result = self.evaluate_select_fields(
                 select_ast.select_fields, select_context)
+        return result
 
+    def finish_select(self, select_ast, select_context, result, lazy=False):
+        """Apply the HAVING clause, ORDER BY and LIMIT of a select.
+
+        Arguments:
+            select_ast: The typed_ast.Select being evaluated.
+            select_context: A context with the rows of the table expression
+                that passed the WHERE clause. This is only used to order by
+                columns of the table, which selects that group can't do, so
+                it may be None for those.
+            result: The result of evaluate_select_result.
+            lazy: As in evaluate_select.
+        """
         having_mask = self.evaluate_expr(select_ast.having_expr, result)
         result = context.mask_context(result, having_mask)
 
         if select_ast.orderings is not None:
             result = self.evaluate_orderings(select_context, result,
-                                             select_ast.orderings)
+                                             having_mask, select_ast.orderings,
+                                             select_ast.limit)
 
         if select_ast.limit is not None:
             context.truncate_context(result, select_ast.limit)
+        if not lazy:
+            result = context.gathered_context(result)
         return result
 
     def evaluate_groups(self, select_fields, group_set, select_context):
@@ -70,22 +363,23 @@ class Evaluator(object):
             A context with the results.
         """
         # TODO: Implement GROUP BY for repeated fields.
-        field_groups = group_set.field_groups
         alias_groups = group_set.alias_groups
-        alias_group_list = sorted(alias_groups)
 
-        group_key_select_fields = [
-            f for f in select_fields if f.alias in alias_groups]
         aggregate_select_fields = [
             f for f in select_fields if f.alias not in alias_groups]
+        key_columns = self.group_key_columns(select_fields, group_set,
+                                             select_context)
 
-        alias_group_result_context = self.evaluate_select_fields(
-            group_key_select_fields, select_context)
+        result = self.accumulate_groups(select_fields, group_set,
+                                        select_context, key_columns)
+        if result is not None:
+            return result
 
-        # Dictionary mapping (singleton) group key context to the context of
-        # values for that key.
-        from collections import OrderedDict
-        group_contexts = OrderedDict()
+        # Otherwise, gather the rows of each group into its own context and
+        # evaluate the aggregates over that.
+        # Map each group key, as a tuple of values, to the list of indices of
+        # the rows in the group, in the order that the groups first appear.
+        group_rows = collections.OrderedDict()
 
         # As a special case, we check if we are grouping by nothing (in other
         # words, if the query had an aggregate without any explicit GROUP BY).
@@ -99,164 +393,286 @@ class Evaluator(object):
         # In the long run, it might be cleaner to view TRIVIAL_GROUP_SET as a
         # completely separate case, but this approach should work.
         if group_set == typed_ast.TRIVIAL_GROUP_SET:
-            trivial_ctx = context.Context(1, collections.OrderedDict(), None)
-            group_contexts[trivial_ctx] = (
-                context.empty_context_from_template(select_context))
-
-        # TODO: Seems pretty ugly and wasteful to use a whole context as a
-        # group key.
-        for i in xrange(select_context.num_rows):
-            key = self.get_group_key(
-                field_groups, alias_group_list, select_context,
-                alias_group_result_context, i)
-            if key not in group_contexts:
-                new_group_context = context.empty_context_from_template(
-                    select_context)
-                group_contexts[key] = new_group_context
-            group_context = group_contexts[key]
-            context.append_row_to_context(src_context=select_context, index=i,
-                                          dest_context=group_context)
-
-        result_context = self.empty_context_from_select_fields(select_fields)
-        result_col_names = [field.alias for field in select_fields]
-        for context_key, group_context in group_contexts.iteritems():
-            group_eval_context = context.Context(
-                1, context_key.columns, group_context)
+            group_rows[()] = range(select_context.num_rows)
+        else:
+            if key_columns:
+                keys = zip(*[column.values
+                             for column in key_columns.itervalues()])
+            else:
+                keys = [()] * select_context.num_rows
+            for i, key in enumerate(keys):
+                rows = group_rows.get(key)
+                if rows is None:
+                    rows = group_rows[key] = []
+                rows.append(i)
+
+        result_values = collections.OrderedDict(
+            (select_field.alias, []) for select_field in select_fields)
+        key_aliases = [(i, column_key[1])
+                       for i, column_key in enumerate(key_columns)
+                       if column_key[0] is None and
+                       column_key[1] in alias_groups]
+        for key, rows in group_rows.iteritems():
+            group_context = context.gather_rows(select_context, rows)
+            group_key_context = context.Context(
+                1, collections.OrderedDict(
+                    (column_key, context.Column(
+                        # TODO(Samantha): This shouldn't just be nullable.
+                        type=column.type, mode=tq_modes.NULLABLE,
+                        values=[value]))
+                    for (column_key, column), value in zip(
+                        key_columns.iteritems(), key)),
+                group_context)
             group_aggregate_result_context = self.evaluate_select_fields(
-                aggregate_select_fields, group_eval_context)
-            full_result_row_context = self.merge_contexts_for_select_fields(
-                result_col_names, group_aggregate_result_context, context_key)
-            context.append_row_to_context(full_result_row_context, 0,
-                                          result_context)
-        return result_context
+                aggregate_select_fields, group_key_context)
+            for (_, alias), column in (
+                    group_aggregate_result_context.columns.iteritems()):
+                result_values[alias].append(column.values[0])
+            for i, alias in key_aliases:
+                result_values[alias].append(key[i])
 
-    def evaluate_orderings(self, overall_context, select_context,
-                           ordering_col):
+        return context.Context(
+            len(group_rows),
+            collections.OrderedDict(
+                ((None, select_field.alias),
+                 # TODO(Samantha): This shouldn't just be nullable
+                 context.Column(type=select_field.expr.type,
+                                mode=tq_modes.NULLABLE,
+                                values=result_values[select_field.alias]))
+                for select_field in select_fields),
+            None)
+
+    def group_key_columns(self, select_fields, group_set, select_context):
+        """Evaluate the columns that make up the group key of each row.
+
+        Returns:
+            An OrderedDict of the key columns, keyed the same way as the
+            context that the aggregate select fields are evaluated in, with
+            the field groups first and then the values of the alias groups.
         """
-        Evaluate a context and order it by a list of given columns.
+        group_key_select_fields = [
+            f for f in select_fields if f.alias in group_set.alias_groups]
+        alias_group_result_context = self.evaluate_select_fields(
+            group_key_select_fields, select_context)
+        key_columns = collections.OrderedDict(
+            ((field_group.table, field_group.column),
+             select_context.columns[(field_group.table, field_group.column)])
+            for field_group in group_set.field_groups)
+        key_columns.update(alias_group_result_context.columns)
+        return key_columns
+
+    def accumulate_groups(self, select_fields, group_set, select_context,
+                          key_columns):
+        """Evaluate grouped select fields by adding rows to aggregate states.
+
+        The arguments to every aggregate are evaluated over all of the rows at
+        once, and added to a partial state for each group a batch of rows at
+        a time, so the rows of each group are never copied. The rest of each
+        select field is then evaluated over all of the groups at once. If
+        there are more groups than fit in the memory budget, the rows of some
+        groups are spilled to temporary files and aggregated afterwards.
 
         Arguments:
-            overall_context: A context with the data that the select statement
+            select_fields: A list of SelectField instances to evaluate.
+            group_set: The GroupSet to group by.
+            select_context: A context with the data that the select statement
                 has access to.
-            select_context: A context with the data remaining after earlier
-            evaluations.
-            ordering_col: A list of order-by column objects having two
-                properties: column_id containing the name of the column and
-                is_ascending which is a boolean for the order in which the
-                column has to be arranged (True for ascending and False for
-                descending).
+            key_columns: An OrderedDict of the columns that make up the group
+                key, including the values of the alias groups.
 
         Returns:
-            A context with the results.
+            A context with the results, or None if some aggregate doesn't
+            implement the accumulator protocol.
+        """
+        aggregate_calls = self.accumulated_aggregate_calls(select_fields,
+                                                           group_set)
+        if aggregate_calls is None:
+            return None
+        arg_columns = [self.evaluate_expr(call.args[0], select_context)
+                       for call in aggregate_calls]
+        if any(column.mode == tq_modes.REPEATED for column in arg_columns):
+            return None
+
+        funcs = [call.func for call in aggregate_calls]
+        key_values = [column.values for column in key_columns.itervalues()]
+        arg_values = [column.values for column in arg_columns]
+        max_groups = self.max_aggregate_groups(len(key_values), len(funcs))
+        num_processes = self.worker_processes(select_context.num_rows,
+                                              group_set.parallel)
+        if num_processes > 1 and key_values:
+            # Each process gets its share of the memory budget.
+            if max_groups is not None:
+                max_groups = max(max_groups // num_processes, 1)
+            _, group_keys, group_values = aggregation.aggregate_partitions(
+                funcs, zip(*key_values), arg_values, num_processes,
+                max_groups)
+        else:
+            _, group_keys, group_values = aggregation.aggregate_batches(
+                funcs,
+                row_batches(key_values, arg_values, select_context.num_rows),
+                max_groups)
+        return self.groups_result(select_fields, group_set, key_columns,
+                                  aggregate_calls, group_keys, group_values)
+
+    def accumulated_aggregate_calls(self, select_fields, group_set):
+        """Find the aggregate calls to add rows to states for.
+
+        Returns:
+            A list of the AggregateFunctionCalls in the select fields that
+            aren't group keys, in the order that replace_aggregate_calls
+            finds them, or None if some of them don't implement the
+            accumulator protocol.
+        """
+        aggregate_calls = []
+        for select_field in select_fields:
+            if select_field.alias not in group_set.alias_groups:
+                replace_aggregate_calls(select_field.expr, aggregate_calls)
+        if not all(call.func.accumulates and len(call.args) == 1
+                   for call in aggregate_calls):
+            return None
+        return aggregate_calls
+
+    def worker_processes(self, num_rows, requested=False):
+        """The number of worker processes to split a step of a query between.
+
+        Arguments:
+            num_rows: The number of rows that the step works on.
+            requested: Whether the query asked for the step to run in
+                parallel.
+
+        Returns 1 if the step should run in this process.
         """
-        assert select_context.aggregate_context is None
-        all_values = []
-        sort_by_indexes = collections.OrderedDict()
-
-        for ((_, column_name), column) in overall_context.columns.iteritems():
-            all_values.append(column.values)
-
-        for order_by_column in ordering_col:
-            for count, ((_, column_name), column) in enumerate(
-                    overall_context.columns.iteritems()):
-                if order_by_column.column_id.name == column_name:
-                    sort_by_indexes[count] = order_by_column.is_ascending
-                    break
-        reversed_sort_by_indexes = collections.OrderedDict(
-            reversed(list(sort_by_indexes.items())))
-
-        t_all_values = map(list, zip(*all_values))
-        for index, is_ascending in reversed_sort_by_indexes.iteritems():
-            t_all_values.sort(key=lambda x: (x[index]),
-                              reverse=not is_ascending)
-        ordered_values = map(list, zip(*t_all_values))
-        # If we started evaluating an ordering over 0 rows,
-        # all_values was originally [[], [], [], ...], i.e. the empty list for
-        # each column, but now ordered_values is just the empty list, since
-        # when going to a list of rows, we lost any notion of how many columns
-        # there were.  In that case, we just set back to all_values, since
-        # there isn't any data to order by anyway.
-        # TODO(colin): can we exit early if there's no data to order?
-        if len(t_all_values) == 0:
-            ordered_values = all_values
-
-        for key in select_context.columns:
-            for count, (_, overall_key) in enumerate(overall_context.columns):
-                overall_context_loop_break = False
-                if overall_key == key[1]:
-                    select_context.columns[key] = context.Column(
-                        type=select_context.columns[key].type,
-                        mode=select_context.columns[key].mode,
-                        values=ordered_values[count])
-                    overall_context_loop_break = True
-                if overall_context_loop_break:
-                    break
-
-        return select_context
-
-    def merge_contexts_for_select_fields(self, col_names, context1, context2):
-        """Build a context that combines columns of two contexts.
-
-        The col_names argument is a list of strings that specifies the order of
-        the columns in the result. Note that not every column must be used, and
-        columns in context1 take precedence over context2 (this happens in
-        practice with non-alias groups that are part of the group key).
+        # Workers never start workers of their own.
+        if num_rows < PARALLEL_MIN_ROWS or parallel.is_worker():
+            return 1
+        if self.num_processes is not None:
+            return self.num_processes
+        if requested:
+            return parallel.cpu_count()
+        return 1
+
+    def max_aggregate_groups(self, num_key_columns, num_funcs):
+        """The most groups to keep the aggregate states of in memory.
+
+        Returns None if there's no memory budget.
         """
-        assert context1.num_rows == context2.num_rows
-        assert context1.aggregate_context is None
-        assert context2.aggregate_context is None
-        # Select fields always have the None table.
-        col_keys = [(None, col_name) for col_name in col_names]
-        columns1, columns2 = context1.columns, context2.columns
-        return context.Context(context1.num_rows, collections.OrderedDict(
-            (col_key, columns1.get(col_key) or columns2[col_key])
-            for col_key in col_keys
-        ), None)
-
-    def get_group_key(self, field_groups, alias_groups, select_context,
-                      alias_group_result_context, index):
-        """Computes a singleton context with the values for a group key.
-
-        The evaluation has already been done; this method just selects the
-        values out of the right contexts.
+        if self.memory_budget is None:
+            return None
+        bytes_per_group = (
+            AGGREGATION_BYTES_PER_GROUP + AGGREGATION_BYTES_PER_VALUE *
+            (num_key_columns + num_funcs))
+        return max(self.memory_budget // bytes_per_group, 1)
+
+    def groups_result(self, select_fields, group_set, key_columns,
+                      aggregate_calls, group_keys, group_values):
+        """Build the result of a grouped select from the aggregated groups.
 
         Arguments:
-            field_groups: A list of ColumnRefs for the field groups to use.
-            alias_groups: A list of strings of alias groups to use.
-            select_context: A context with the data for the table expression
-                being selected from.
-            alias_group_result_context: A context with the data for the
-                grouped-by select fields.
-            index: The row index to use from each context.
+            select_fields: A list of SelectField instances to evaluate.
+            group_set: The GroupSet to group by.
+            key_columns: An OrderedDict of the columns that make up the group
+                key. Only their keys and types are used.
+            aggregate_calls: The list from accumulated_aggregate_calls.
+            group_keys: A list with the key of each group.
+            group_values: A list with the value of each aggregate call for
+                each group.
+
+        Returns:
+            A context with the results.
         """
-        result_columns = collections.OrderedDict()
-        for field_group in field_groups:
-            column_key = (field_group.table, field_group.column)
-            source_column = select_context.columns[column_key]
-            result_columns[column_key] = context.Column(
-                # TODO(Samantha): This shouldn't just be nullable.
-                type=source_column.type, mode=tq_modes.NULLABLE,
-                values=[source_column.values[index]])
-        for alias_group in alias_groups:
-            column_key = (None, alias_group)
-            source_column = alias_group_result_context.columns[column_key]
-            result_columns[column_key] = context.Column(
+        # Aggregating with no GROUP BY gives a row even if there are no rows.
+        if not group_keys and group_set == typed_ast.TRIVIAL_GROUP_SET:
+            group_keys = [()]
+            group_values = [[call.func.finalize(call.func.initial_state())]
+                            for call in aggregate_calls]
+
+        num_groups = len(group_keys)
+        groups_columns = collections.OrderedDict(
+            (column_key, context.Column(
                 # TODO(Samantha): This shouldn't just be nullable.
-                type=source_column.type, mode=tq_modes.NULLABLE,
-                values=[source_column.values[index]])
-        return context.Context(1, result_columns, None)
+                type=column.type, mode=tq_modes.NULLABLE,
+                values=[key[i] for key in group_keys]))
+            for i, (column_key, column) in enumerate(key_columns.iteritems()))
+        for i, call in enumerate(aggregate_calls):
+            groups_columns[aggregate_column_key(i)] = context.Column(
+                type=call.type, mode=tq_modes.NULLABLE,
+                values=group_values[i])
+        groups_context = context.Context(num_groups, groups_columns, None)
 
-    def empty_context_from_select_fields(self, select_fields):
-        return context.Context(
-            0,
-            collections.OrderedDict(
-                ((None, select_field.alias),
-                 # TODO(Samantha): This shouldn't just be nullable
-                 context.Column(type=select_field.expr.type,
-                                mode=tq_modes.NULLABLE, values=[]))
-                for select_field in select_fields
-            ),
-            None)
+        result_columns = collections.OrderedDict()
+        # Replace the aggregate calls in the same order as
+        # accumulated_aggregate_calls did, so that they refer to the right
+        # columns.
+        replaced_calls = []
+        aggregate_exprs = dict(
+            (select_field.alias,
+             replace_aggregate_calls(select_field.expr, replaced_calls))
+            for select_field in select_fields
+            if select_field.alias not in group_set.alias_groups)
+        for select_field in select_fields:
+            if select_field.alias in aggregate_exprs:
+                values = self.evaluate_expr(
+                    aggregate_exprs[select_field.alias],
+                    groups_context).values
+            else:
+                values = groups_columns[(None, select_field.alias)].values
+            result_columns[(None, select_field.alias)] = context.Column(
+                # TODO(Samantha): This shouldn't just be nullable
+                type=select_field.expr.type, mode=tq_modes.NULLABLE,
+                values=list(values))
+        return context.Context(num_groups, result_columns, None)
+
+    def evaluate_orderings(self, table_context, result_context,
+                           having_mask, orderings, limit=None):
+        """Order the rows of the result of a select.
+
+        Arguments:
+            table_context: A context with the rows of the table expression
+                that passed the WHERE clause.
+            result_context: A context with the result rows that passed the
+                HAVING clause.
+            having_mask: The column that the HAVING clause evaluated to.
+            orderings: A list of typed_ast.Ordering, most significant first.
+            limit: Either None or the LIMIT of the query. If there is a limit,
+                only the first rows in the order are found, which is much
+                faster than ordering all of the rows.
+
+        If sorting all of the keys at once would go over the memory budget,
+        they are sorted in runs that are spilled to temporary files.
+
+        Returns:
+            A context with the result rows in order. The columns are views of
+            the columns of result_context, so they're only gathered if used.
+        """
+        key_columns = []
+        for ordering in orderings:
+            col_ref = ordering.column
+            key = (col_ref.table, col_ref.column)
+            if key in result_context.columns:
+                values = result_context.columns[key].values
+            else:
+                # The compiler only allows table columns if there's no
+                # grouping, so each table row makes a result row, and we just
+                # need to drop the same rows that HAVING did.
+                key_context = context.Context(
+                    table_context.num_rows,
+                    collections.OrderedDict(
+                        [(key, table_context.column_from_ref(col_ref))]),
+                    None)
+                values = context.mask_context(
+                    key_context, having_mask).columns[key].values
+            key_columns.append((values, ordering.is_ascending))
+        num_rows = result_context.num_rows
+        if self.memory_budget is None:
+            permutation = sorting.sort_permutation(key_columns, num_rows,
+                                                   limit)
+        else:
+            bytes_per_row = (SORT_BYTES_PER_ROW +
+                             SORT_BYTES_PER_KEY_VALUE * len(key_columns))
+            run_size = max(self.memory_budget // bytes_per_row, 1)
+            permutation = sorting.external_sort_permutation(
+                key_columns, num_rows, run_size, limit)
+        return context.select_rows(result_context, permutation)
 
     def evaluate_within(self, select_fields, group_set, ctx,
                         within_clause):
@@ -285,8 +701,13 @@ class Evaluator(object):
                 type=tq_types.INT, mode=tq_modes.NULLABLE, values=row_nums)
             ctx_with_primary_key.columns[(table_name,
                          'row_numbers_column_primary_key')] = row_nums_col
-            group_set.field_groups.append(typed_ast.ColumnRef(
-                table_name, 'row_numbers_column_primary_key', tq_types.INT))
+            # Compiled queries may be cached and evaluated again, so we build
+            # a new group set rather than modifying the one in the AST.
+            alias_groups = set(group_set.alias_groups)
+            field_groups = list(group_set.field_groups) + [
+                typed_ast.ColumnRef(table_name,
+                                    'row_numbers_column_primary_key',
+                                    tq_types.INT)]
             if len(select_fields) > 1:
             # TODO: Implement WITHIN RECORD when one or more of the
             # selected fields (except the one in the WITHIN RECORD
@@ -294,13 +715,14 @@ class Evaluator(object):
                 for select_field in select_fields:
                     if select_field.within_clause is None:
                         if select_field.expr.mode != tq_modes.REPEATED:
-                            group_set.alias_groups.add(select_field.alias)
+                            alias_groups.add(select_field.alias)
                         else:
                             raise NotImplementedError(
                                 'Cannot select fields having mode=REPEATED '
                                 'for queries involving WITHIN RECORD')
+            group_set = typed_ast.GroupSet(alias_groups, field_groups,
+                                           group_set.parallel)
         # TODO: Implement for WITHIN clause
-        typed_ast.TRIVIAL_GROUP_SET = typed_ast.GroupSet(set(), [])
         return self.evaluate_groups(select_fields, group_set,
                                     ctx_with_primary_key)
 
@@ -323,9 +745,13 @@ class Evaluator(object):
         """Given a typed select field, return a resulting column entry."""
         assert isinstance(select_field, typed_ast.SelectField)
         results = self.evaluate_expr(select_field.expr, ctx)
+        values = results.values
+        if isinstance(values, context.ConstantValues):
+            values = list(values)
+        elif isinstance(values, context.SelectedValues):
+            values = values.gather()
         return (None, select_field.alias), context.Column(
-            type=results.type, mode=results.mode,
-            values=results.values)
+            type=results.type, mode=results.mode, values=values)
 
     def evaluate_table_expr(self, table_expr):
         """Given a table expression, return a Context with its values."""
@@ -338,6 +764,52 @@ class Evaluator(object):
                     table_expr.__class__.__name__))
         return method(table_expr)
 
+    def evaluate_table_exprs(self, table_exprs):
+        """Evaluate table expressions that don't depend on each other.
+
+        These are the tables of a union or the inputs of a join. Table
+        expressions that do work of their own, like subqueries, are evaluated
+        concurrently in worker processes if the evaluator is set up to use
+        them and they read enough rows. Plain tables are read in this process,
+        since sending their rows back would cost more than reading them.
+
+        Returns: A list of the Context for each table expression, in order.
+        """
+        concurrent_indices = [
+            i for i, table_expr in enumerate(table_exprs)
+            if not isinstance(table_expr,
+                              (typed_ast.Table, typed_ast.NoTable))]
+        num_processes = self.worker_processes(sum(
+            self.table_expr_rows(table_exprs[i]) for i in concurrent_indices))
+        if len(concurrent_indices) < 2 or num_processes == 1:
+            return map(self.evaluate_table_expr, table_exprs)
+
+        def evaluate_in_worker(index):
+            # Send back lists rather than views of the subquery's rows.
+            return context.gathered_context(self.evaluate_table_expr(
+                table_exprs[concurrent_indices[index]]))
+
+        concurrent_contexts = dict(zip(
+            concurrent_indices,
+            parallel.map_in_processes(evaluate_in_worker,
+                                      len(concurrent_indices), num_processes)))
+        return [concurrent_contexts[i] if i in concurrent_contexts
+                else self.evaluate_table_expr(table_expr)
+                for i, table_expr in enumerate(table_exprs)]
+
+    def table_expr_rows(self, table_expr):
+        """The number of table rows that a table expression reads."""
+        if isinstance(table_expr, typed_ast.Table):
+            return self.tables_by_name[table_expr.name].num_rows
+        elif isinstance(table_expr, typed_ast.TableUnion):
+            return sum(map(self.table_expr_rows, table_expr.tables))
+        elif isinstance(table_expr, typed_ast.Join):
+            return self.table_expr_rows(table_expr.base) + sum(
+                self.table_expr_rows(table) for table, _ in table_expr.tables)
+        elif isinstance(table_expr, typed_ast.Select):
+            return self.table_expr_rows(table_expr.table)
+        return 0
+
     def eval_table_NoTable(self, table_expr):
         # If the user isn't selecting from any tables, just specify that there
         # is one column to return and no table accessible.
@@ -355,65 +827,236 @@ class Evaluator(object):
     def eval_table_TableUnion(self, table_expr):
         result_context = context.empty_context_from_type_context(
             table_expr.type_ctx)
-        for table in table_expr.tables:
-            table_result = self.evaluate_table_expr(table)
+        for table_result in self.evaluate_table_exprs(table_expr.tables):
             context.append_partial_context_to_context(table_result,
                                                       result_context)
         return result_context
 
     def eval_table_Join(self, table_expr):
-        base_context = self.evaluate_table_expr(table_expr.base)
+        table_expr = self.plan_join(table_expr)
         rhs_tables, join_types = zip(*table_expr.tables)
-        other_contexts = map(self.evaluate_table_expr, rhs_tables)
+        input_contexts = self.evaluate_table_exprs(
+            [table_expr.base] + list(rhs_tables))
+        base_context = input_contexts[0]
+        other_contexts = input_contexts[1:]
 
         lhs_context = base_context
+        lhs_ordered = has_ascending_order(table_expr.base)
 
-        for rhs_context, join_type, conditions in zip(other_contexts,
-                                                      join_types,
-                                                      table_expr.conditions):
+        for rhs_table, rhs_context, join_type, conditions, merge_join in zip(
+                rhs_tables, other_contexts, join_types,
+                table_expr.conditions, table_expr.merge_joins):
 
             if join_type is tq_ast.JoinType.CROSS:
-                lhs_context = context.cross_join_contexts(
-                    lhs_context, rhs_context)
+                lhs_context = self.cross_join(lhs_context, rhs_context)
                 continue
 
-            # We reordered the join conditions in the compilation step, so
-            # column1 always refers to the lhs of the current join.
+            # plan_join reordered the join conditions, so column1 always
+            # refers to the lhs of the current join.
             lhs_key_refs = [cond.column1 for cond in conditions]
             rhs_key_refs = [cond.column2 for cond in conditions]
-            rhs_key_contexts = {}
-            for i in xrange(rhs_context.num_rows):
-                rhs_key = self.get_join_key(rhs_context, rhs_key_refs, i)
-                if rhs_key not in rhs_key_contexts:
-                    rhs_key_contexts[rhs_key] = (
-                        context.empty_context_from_template(rhs_context))
-                context.append_row_to_context(
-                    src_context=rhs_context, index=i,
-                    dest_context=rhs_key_contexts[rhs_key])
-
-            result_context = context.cross_join_contexts(
-                context.empty_context_from_template(lhs_context),
-                context.empty_context_from_template(rhs_context))
-
-            for i in xrange(lhs_context.num_rows):
-                lhs_key = self.get_join_key(lhs_context, lhs_key_refs, i)
-                lhs_row_context = context.row_context_from_context(
-                    lhs_context, i)
-                if lhs_key in rhs_key_contexts:
-                    new_rows = context.cross_join_contexts(
-                        lhs_row_context, rhs_key_contexts[lhs_key])
-                    context.append_context_to_context(new_rows, result_context)
-                elif join_type is tq_ast.JoinType.LEFT_OUTER:
-                    # For a left outer join, we still want to in a row with
-                    # nulls on the right.
-                    context.append_context_to_context(lhs_row_context,
-                                                      result_context)
-            lhs_context = result_context
 
-        return lhs_context
+            lhs_keys = self.get_join_keys(lhs_context, lhs_key_refs)
+            rhs_keys = self.get_join_keys(rhs_context, rhs_key_refs)
+            keep_unmatched = join_type is tq_ast.JoinType.LEFT_OUTER
+            if merge_join or (lhs_ordered and
+                               has_ascending_order(rhs_table) and
+                               is_sorted(lhs_keys) and is_sorted(rhs_keys)):
+                # A merge join doesn't need an index of either side, which
+                # matters for big joins, and is fast when the inputs are
+                # already sorted on the join keys. Other inputs aren't
+                # scanned to check, since they're rarely sorted.
+                lhs_positions, rhs_positions = self.merge_join_positions(
+                    lhs_keys, rhs_keys, keep_unmatched, len(conditions))
+            elif (join_type is tq_ast.JoinType.INNER and
+                    lhs_context.num_rows < rhs_context.num_rows):
+                # Index the smaller side. The result rows then come out in
+                # rhs order rather than lhs order, which is fine since joins
+                # don't promise any order.
+                rhs_positions, lhs_positions = match_join_keys(
+                    rhs_keys, lhs_keys, keep_unmatched=False)
+            else:
+                lhs_positions, rhs_positions = match_join_keys(
+                    lhs_keys, rhs_keys, keep_unmatched)
+
+            lhs_context = context.join_rows(
+                lhs_context, lhs_positions, rhs_context, rhs_positions)
+            # The rows of a join result don't come out in any known order.
+            lhs_ordered = False
+
+        return self.join_columns_in_order(table_expr, lhs_context)
+
+    def plan_join(self, join):
+        """Reorder the leading inner joins of a join to keep results small.
+
+        The tables up to the first LEFT OUTER or CROSS join can be joined in
+        any order, as long as each table is joined on a condition with one of
+        the tables before it. We start with the smallest of those tables and
+        repeatedly join the smallest table that has a condition with the
+        tables joined so far. The rest of the joins stay as they are, and the
+        Join keeps its original type context, so the result columns are in
+        the same order either way.
+
+        This happens when the join is evaluated rather than when the query
+        is compiled, since compiled plans are cached and aren't invalidated
+        when rows are added to a table. Which side of each join to build the
+        hash index on is decided after both sides are evaluated, from their
+        actual sizes. A JOIN EACH hint stays with the table it was written
+        for.
+        """
+        inputs = [join.base] + [table for table, _ in join.tables]
+        num_reorderable = 1
+        for _, join_type in join.tables:
+            if join_type is not tq_ast.JoinType.INNER:
+                break
+            num_reorderable += 1
+        # With two tables, the only choice is the build side.
+        if num_reorderable < 3:
+            return join
+
+        input_indices = {}
+        for i, table in enumerate(inputs[:num_reorderable]):
+            for key in table.type_ctx.columns:
+                input_indices[key] = i
+        # A list of (index1, index2, condition) for the conditions between
+        # the reorderable tables.
+        edges = []
+        for conditions in join.conditions[:num_reorderable - 1]:
+            for condition in conditions:
+                edges.append((
+                    input_indices[(condition.column1.table,
+                                   condition.column1.column)],
+                    input_indices[(condition.column2.table,
+                                   condition.column2.column)],
+                    condition))
+
+        num_rows = [self.estimate_num_rows(table)
+                    for table in inputs[:num_reorderable]]
+        order = [min(range(num_reorderable), key=lambda i: num_rows[i])]
+        new_conditions = []
+        while len(order) < num_reorderable:
+            joined = set(order)
+            candidates = set()
+            for index1, index2, _ in edges:
+                if index1 in joined and index2 not in joined:
+                    candidates.add(index2)
+                elif index2 in joined and index1 not in joined:
+                    candidates.add(index1)
+            if not candidates:
+                # The conditions don't connect the tables, so keep the order
+                # from the query.
+                return join
+            next_index = min(candidates, key=lambda i: (num_rows[i], i))
+            conditions = []
+            for index1, index2, condition in edges:
+                if index1 in joined and index2 == next_index:
+                    conditions.append(condition)
+                elif index2 in joined and index1 == next_index:
+                    conditions.append(typed_ast.JoinFields(
+                        condition.column2, condition.column1))
+            order.append(next_index)
+            new_conditions.append(conditions)
+
+        if order == range(num_reorderable):
+            return join
+        input_merge_joins = [False] + list(join.merge_joins)
+        return typed_ast.Join(
+            base=inputs[order[0]],
+            tables=([(inputs[i], tq_ast.JoinType.INNER) for i in order[1:]] +
+                    list(join.tables[num_reorderable - 1:])),
+            conditions=new_conditions + join.conditions[num_reorderable - 1:],
+            type_ctx=join.type_ctx,
+            merge_joins=([input_merge_joins[i] for i in order[1:]] +
+                         list(join.merge_joins[num_reorderable - 1:])))
+
+    def estimate_num_rows(self, table_expr):
+        """Estimate the number of rows in the result of a table expression.
 
-    def get_join_key(self, table_context, key_column_refs, index):
-        """Get the join key for a row in a table that is part of a join.
+        We only know the size of stored tables, so this is an upper bound
+        that doesn't account for filters.
+        """
+        if isinstance(table_expr, typed_ast.Table):
+            return self.tables_by_name[table_expr.name].num_rows
+        elif isinstance(table_expr, typed_ast.Select):
+            if table_expr.group_set == typed_ast.TRIVIAL_GROUP_SET:
+                num_rows = 1
+            else:
+                num_rows = self.estimate_num_rows(table_expr.table)
+            if table_expr.limit is not None:
+                num_rows = min(num_rows, table_expr.limit)
+            return num_rows
+        elif isinstance(table_expr, typed_ast.TableUnion):
+            return sum(self.estimate_num_rows(table)
+                       for table in table_expr.tables)
+        elif isinstance(table_expr, typed_ast.Join):
+            num_rows = self.estimate_num_rows(table_expr.base)
+            for table, join_type in table_expr.tables:
+                table_num_rows = self.estimate_num_rows(table)
+                if join_type is tq_ast.JoinType.CROSS:
+                    num_rows *= table_num_rows
+                else:
+                    num_rows = max(num_rows, table_num_rows)
+            return num_rows
+        # NoTable produces a single row.
+        return 1
+
+    def merge_join_positions(self, lhs_keys, rhs_keys, keep_unmatched,
+                             num_key_columns):
+        """Find the pairs of rows of a join with a sort-merge join.
+
+        If the rhs isn't already sorted on its keys, it's sorted within the
+        memory budget, spilling sorted runs to temporary files if needed.
+        The pairs are collected as merge_join_keys finds them, so no other
+        per-row state is kept.
+
+        Returns: A pair of lists with the lhs row and rhs row positions of
+            each result row, in lhs order, with the matches for each lhs row
+            in rhs order.
+        """
+        rhs_order = None
+        if not is_sorted(rhs_keys):
+            key_columns = [(rhs_keys, True)]
+            if self.memory_budget is None:
+                rhs_order = sorting.sort_permutation(key_columns,
+                                                     len(rhs_keys))
+            else:
+                bytes_per_row = (SORT_BYTES_PER_ROW +
+                                 SORT_BYTES_PER_KEY_VALUE * num_key_columns)
+                rhs_order = sorting.external_sort_permutation(
+                    key_columns, len(rhs_keys),
+                    max(self.memory_budget // bytes_per_row, 1))
+        lhs_positions = []
+        rhs_positions = []
+        add_lhs_position = lhs_positions.append
+        add_rhs_position = rhs_positions.append
+        for lhs_position, rhs_position in merge_join_keys(
+                lhs_keys, rhs_keys, keep_unmatched, rhs_order):
+            add_lhs_position(lhs_position)
+            add_rhs_position(rhs_position)
+        return lhs_positions, rhs_positions
+
+    def cross_join(self, lhs_context, rhs_context):
+        """Pair up every row of two contexts, within MAX_CROSS_JOIN_ROWS."""
+        return context.cross_join_contexts(lhs_context, rhs_context,
+                                           MAX_CROSS_JOIN_ROWS)
+
+    def join_columns_in_order(self, table_expr, join_context):
+        """Put the columns of the result of a join in the expected order.
+
+        plan_join may reorder the tables of a join, so the columns of the
+        joined tables may not be in the order that the query expects.
+        """
+        if list(join_context.columns) == list(table_expr.type_ctx.columns):
+            return join_context
+        return context.Context(
+            join_context.num_rows,
+            collections.OrderedDict(
+                (key, join_context.columns[key])
+                for key in table_expr.type_ctx.columns),
+            None)
+
+    def get_join_keys(self, table_context, key_column_refs):
+        """Get the join key for each row in a table that is part of a join.
 
         Note that, while this code is similar to the code that computes group
         keys, groups are different because they need to be specifically
@@ -425,13 +1068,11 @@ class Evaluator(object):
                 being joined.
             key_column_refs: A list of ColumnRef specifying the columns to use
                 in the key and their order.
-            index: The index of the row to compute the key for.
 
-        Returns: A tuple of values for the key for this row.
+        Returns: A list with a tuple of values for the key for each row.
         """
-        return tuple(
-            table_context.column_from_ref(col_ref).values[index]
-            for col_ref in key_column_refs)
+        return zip(*[table_context.column_from_ref(col_ref).values
+                     for col_ref in key_column_refs])
 
     def eval_table_Select(self, table_expr):
         """Evaluate a select table expression.
@@ -440,7 +1081,7 @@ class Evaluator(object):
         directly-evaluated type context so that we account for any alias that
         might have been assigned.
         """
-        result_context = self.evaluate_select(table_expr)
+        result_context = self.evaluate_select(table_expr, lazy=True)
         return context.context_with_overlayed_type_context(result_context,
                                                            table_expr.type_ctx)
 
@@ -454,10 +1095,32 @@ class Evaluator(object):
         return method(expr, context)
 
     def evaluate_FunctionCall(self, func_call, context):
+        if (func_call.func.is_conditional and
+                context.aggregate_context is None):
+            result = self.evaluate_conditionally(func_call, context)
+            if result is not None:
+                return result
         arg_results = [self.evaluate_expr(arg, context)
                        for arg in func_call.args]
         return func_call.func.evaluate(context.num_rows, *arg_results)
 
+    def evaluate_conditionally(self, func_call, ctx):
+        """Evaluate a call to a function that only needs some arguments.
+
+        Each argument is evaluated over a context with just the rows that
+        the function needs it for, selected from the given context.
+
+        Returns:
+            The result column, or None if some argument is repeated.
+        """
+        def evaluate_arg(index, rows):
+            if len(rows) == ctx.num_rows:
+                return self.evaluate_expr(func_call.args[index], ctx)
+            return self.evaluate_expr(func_call.args[index],
+                                      context.select_rows(ctx, rows))
+        return func_call.func.evaluate_conditionally(
+            ctx.num_rows, [arg.type for arg in func_call.args], evaluate_arg)
+
     def evaluate_AggregateFunctionCall(self, func_call, context):
         # Switch to the aggregate context when evaluating the arguments to the
         # aggregate.
@@ -468,9 +1131,22 @@ class Evaluator(object):
         return func_call.func.evaluate(context.num_rows, *arg_results)
 
     def evaluate_Literal(self, literal, context_object):
-        values = [literal.value for _ in xrange(context_object.num_rows)]
+        values = context.ConstantValues(literal.value, context_object.num_rows)
         return context.Column(type=literal.type, mode=tq_modes.NULLABLE,
                               values=values)
 
+    def evaluate_Parameter(self, parameter, context_object):
+        values = context.ConstantValues(self.parameters[parameter.name],
+                                        context_object.num_rows)
+        return context.Column(type=parameter.type, mode=tq_modes.NULLABLE,
+                              values=values)
+
+    def evaluate_CommonSubexpression(self, expr, ctx):
+        result = ctx.expression_cache.get(expr.key)
+        if result is None:
+            result = self.evaluate_expr(expr.expr, ctx)
+            ctx.expression_cache[expr.key] = result
+        return result
+
     def evaluate_ColumnRef(self, column_ref, ctx):
         return ctx.columns[(column_ref.table, column_ref.column)]
@@ -6,10 +6,17 @@ import datetime
 import mock
 import unittest
 
+import arrow
+
+import aggregation
 import context
+import evaluator
+import parallel
+import runtime
 import tinyquery
 import tq_modes
 import tq_types
+import typed_ast
 
 
 # TODO(Samantha): Not all modes are nullable.
@@ -617,6 +624,129 @@ class EvaluatorTest(unittest.TestCase):
         self.assertEqual([(0, 2), (0, 4), (0, 6), (0, 8), (1, 1)],
                          sorted(result_rows))
 
+    def test_group_order_and_null_keys(self):
+        # Groups come out in the order that they first appear, and NULL is a
+        # group like any other value.
+        self.assert_query_result(
+            'SELECT val1 % 2 AS parity, COUNT(*) AS c, MAX(val2) AS m '
+            'FROM some_nulls_table GROUP BY parity',
+            self.make_context([
+                ('parity', tq_types.INT, [1, None]),
+                ('c', tq_types.INT, [2, 1]),
+                ('m', tq_types.INT, [3, 2]),
+            ]))
+
+    def test_group_in_batches(self):
+        # Groups and aggregate states carry over from one batch of rows to
+        # the next.
+        with mock.patch.object(evaluator, 'AGGREGATION_BATCH_SIZE', 2):
+            self.assert_query_result(
+                'SELECT val1, SUM(val2) AS s, COUNT(*) AS c, '
+                'AVG(val2) + 1 AS a FROM test_table GROUP BY val1',
+                self.make_context([
+                    ('val1', tq_types.INT, [4, 1, 8, 2]),
+                    ('s', tq_types.INT, [8, 3, 4, 6]),
+                    ('c', tq_types.INT, [1, 2, 1, 1]),
+                    ('a', tq_types.FLOAT, [9.0, 2.5, 5.0, 7.0]),
+                ]))
+
+    def test_group_within_memory_budget(self):
+        # The budget only has room for one group at a time, so the rest are
+        # spilled, but they still come out in the order they first appear.
+        self.tq.memory_budget = 1
+        self.assert_query_result(
+            'SELECT val1, SUM(val2) AS s, COUNT(*) AS c FROM test_table '
+            'GROUP BY val1',
+            self.make_context([
+                ('val1', tq_types.INT, [4, 1, 8, 2]),
+                ('s', tq_types.INT, [8, 3, 4, 6]),
+                ('c', tq_types.INT, [1, 2, 1, 1]),
+            ]))
+
+    def test_group_each_by_in_worker_processes(self):
+        expected = self.make_context([
+            ('val1', tq_types.INT, [4, 1, 8, 2]),
+            ('s', tq_types.INT, [8, 3, 4, 6]),
+            ('c', tq_types.INT, [1, 2, 1, 1]),
+        ])
+        with mock.patch.object(evaluator, 'PARALLEL_MIN_ROWS', 0), \
+                mock.patch.object(parallel, 'cpu_count', return_value=2), \
+                mock.patch.object(aggregation, 'aggregate_partitions',
+                                  wraps=aggregation.aggregate_partitions
+                                  ) as aggregate_partitions:
+            self.assert_query_result(
+                'SELECT val1, SUM(val2) AS s, COUNT(*) AS c '
+                'FROM test_table GROUP EACH BY val1',
+                expected)
+            self.assertEqual(1, aggregate_partitions.call_count)
+            # Plain GROUP BY only uses worker processes if the service is
+            # set up to.
+            self.assert_query_result(
+                'SELECT val1, SUM(val2) AS s, COUNT(*) AS c '
+                'FROM test_table GROUP BY val1',
+                expected)
+            self.assertEqual(1, aggregate_partitions.call_count)
+            self.tq.num_processes = 2
+            self.assert_query_result(
+                'SELECT val1, SUM(val2) AS s, COUNT(*) AS c '
+                'FROM test_table GROUP BY val1',
+                expected)
+            self.assertEqual(2, aggregate_partitions.call_count)
+
+    def test_scan_in_worker_processes(self):
+        queries = [
+            'SELECT val1 * 2 AS d, val2 FROM test_table WHERE val2 % 2 = 0',
+            'SELECT val1, val2 FROM test_table',
+            'SELECT val1 FROM test_table WHERE val1 > 100',
+            'SELECT val1 FROM test_table WHERE val2 > 1 ORDER BY val2 DESC',
+            'SELECT val1, COUNT(*) AS c FROM test_table WHERE val2 != 4 '
+            'GROUP BY val1',
+        ]
+        expected = [self.tq.evaluate_query(query) for query in queries]
+        self.tq.num_processes = 3
+        with mock.patch.object(evaluator, 'PARALLEL_MIN_ROWS', 0), \
+                mock.patch.object(parallel, 'map_in_processes',
+                                  wraps=parallel.map_in_processes
+                                  ) as map_in_processes:
+            for query, expected_result in zip(queries, expected):
+                self.assertEqual(expected_result,
+                                 self.tq.evaluate_query(query))
+        # Every query scans in worker processes, and the GROUP BY also
+        # aggregates in them.
+        self.assertEqual(len(queries) + 1, map_in_processes.call_count)
+
+    def test_subqueries_in_worker_processes(self):
+        queries = [
+            'SELECT val1 FROM (SELECT val1 FROM test_table WHERE val2 > 2), '
+            '(SELECT val1 + 10 AS val1 FROM test_table), test_table',
+            'SELECT t1.val1, t2.c FROM '
+            '(SELECT val1 FROM test_table WHERE val1 > 1) t1 JOIN '
+            '(SELECT val1, COUNT(*) AS c FROM test_table GROUP BY val1) t2 '
+            'ON t1.val1 = t2.val1',
+        ]
+        expected = [self.tq.evaluate_query(query) for query in queries]
+        self.tq.num_processes = 2
+        with mock.patch.object(evaluator, 'PARALLEL_MIN_ROWS', 0), \
+                mock.patch.object(parallel, 'map_in_processes',
+                                  wraps=parallel.map_in_processes
+                                  ) as map_in_processes:
+            for query, expected_result in zip(queries, expected):
+                self.assertEqual(expected_result,
+                                 self.tq.evaluate_query(query))
+        # Each query evaluates its two subqueries together, and the scans
+        # and grouping in them run in the same workers.
+        self.assertEqual(len(queries), map_in_processes.call_count)
+
+    def test_group_with_non_accumulating_aggregate(self):
+        self.assert_query_result(
+            'SELECT val1, COUNT(*) AS c, NTH(1, QUANTILES(val2, 2)) AS q '
+            'FROM test_table GROUP BY val1',
+            self.make_context([
+                ('val1', tq_types.INT, [4, 1, 8, 2]),
+                ('c', tq_types.INT, [1, 2, 1, 1]),
+                ('q', tq_types.INT, [8, 1, 4, 6]),
+            ]))
+
     def test_order_by_field(self):
         self.assert_query_result(
             'SELECT val1, val2 FROM test_table ORDER BY val1 DESC, val2',
@@ -652,6 +782,70 @@ class EvaluatorTest(unittest.TestCase):
             ])
         )
 
+    def test_order_by_with_limit(self):
+        self.assert_query_result(
+            'SELECT val1, val2 FROM test_table ORDER BY val1 DESC, val2 '
+            'LIMIT 3',
+            self.make_context([
+                ('val1', tq_types.INT, [8, 4, 2]),
+                ('val2', tq_types.INT, [4, 8, 6]),
+            ])
+        )
+        self.assert_query_result(
+            'SELECT val2 FROM test_table ORDER BY val1, val2 DESC LIMIT 2',
+            self.make_context([
+                ('val2', tq_types.INT, [2, 1]),
+            ])
+        )
+
+    def test_order_by_alias(self):
+        self.assert_query_result(
+            'SELECT val1, val1 - val2 AS diff FROM test_table '
+            'ORDER BY diff DESC',
+            self.make_context([
+                ('val1', tq_types.INT, [8, 1, 1, 4, 2]),
+                ('diff', tq_types.INT, [4, 0, -1, -4, -4]),
+            ]))
+
+    def test_order_by_aggregate(self):
+        self.assert_query_result(
+            'SELECT val1, SUM(val2) AS total FROM test_table GROUP BY val1 '
+            'HAVING total > 3 ORDER BY total, val1 DESC',
+            self.make_context([
+                ('val1', tq_types.INT, [8, 2, 4]),
+                ('total', tq_types.INT, [4, 6, 8]),
+            ]))
+
+    def test_order_by_table_column_with_having(self):
+        self.assert_query_result(
+            'SELECT val2 FROM test_table HAVING val2 > 1 ORDER BY val1 DESC',
+            self.make_context([
+                ('val2', tq_types.INT, [4, 8, 6, 2]),
+            ]))
+
+    def test_order_nulls(self):
+        self.assert_query_result(
+            'SELECT foo FROM null_table ORDER BY foo',
+            self.make_context([
+                ('foo', tq_types.INT, [None, None, 1, 5]),
+            ]))
+        self.assert_query_result(
+            'SELECT foo FROM null_table ORDER BY foo DESC',
+            self.make_context([
+                ('foo', tq_types.INT, [5, 1, None, None]),
+            ]))
+
+    def test_order_by_within_memory_budget(self):
+        # The budget is small enough that every row is its own sorted run.
+        self.tq.memory_budget = 1
+        self.assert_query_result(
+            'SELECT val1, val2 FROM test_table ORDER BY val1 DESC, val2',
+            self.make_context([
+                ('val1', tq_types.INT, [8, 4, 2, 1, 1]),
+                ('val2', tq_types.INT, [4, 8, 6, 1, 2]),
+            ])
+        )
+
     def test_order_no_rows(self):
         self.assert_query_result(
             'SELECT str FROM string_table WHERE str CONTAINS "bye" '
@@ -774,6 +968,37 @@ class EvaluatorTest(unittest.TestCase):
             ])
         )
 
+    def test_cross_join_order(self):
+        # Rows come out in lhs order, paired with each rhs row in rhs order,
+        # whichever side is bigger.
+        self.assert_query_result(
+            'SELECT t1.val3, t2.str FROM test_table_2 t1 '
+            'CROSS JOIN string_table t2',
+            self.make_context([
+                ('t1.val3', tq_types.INT, [3, 3, 8, 8]),
+                ('t2.str', tq_types.STRING,
+                 ['hello', 'world', 'hello', 'world']),
+            ]))
+        self.assert_query_result(
+            'SELECT t1.val3, t2.val1 FROM test_table_2 t1 '
+            'CROSS JOIN test_table t2 WHERE t2.val2 < 5',
+            self.make_context([
+                ('t1.val3', tq_types.INT, [3, 3, 3, 8, 8, 8]),
+                ('t2.val1', tq_types.INT, [1, 8, 1, 1, 8, 1]),
+            ]))
+
+    def test_cross_join_row_limit(self):
+        with mock.patch.object(evaluator, 'MAX_CROSS_JOIN_ROWS', 9):
+            with self.assertRaises(ValueError):
+                self.tq.evaluate_query(
+                    'SELECT t1.val1 FROM test_table t1 '
+                    'CROSS JOIN test_table_2 t2')
+            self.assertEqual(
+                4,
+                self.tq.evaluate_query(
+                    'SELECT t2.val3 FROM string_table t1 '
+                    'CROSS JOIN test_table_2 t2').num_rows)
+
     def test_multiple_way_join(self):
         result = self.tq.evaluate_query(
             'SELECT t1.val1, t3.bar, t2.val2'
@@ -791,6 +1016,150 @@ class EvaluatorTest(unittest.TestCase):
             ],
             sorted(result_rows))
 
+    def test_multiple_condition_left_outer_join_order(self):
+        # Rows come out in lhs order, with the matching rhs rows for each lhs
+        # row in rhs order.
+        self.assert_query_result(
+            'SELECT t1.val1, t1.val2, t3.foo, t3.bar FROM test_table t1 '
+            'LEFT JOIN (SELECT foo, bar, foo + bar AS total '
+            '           FROM test_table_3) t3 '
+            'ON t1.val1 = t3.foo AND t1.val2 = t3.total',
+            self.make_context([
+                ('t1.val1', tq_types.INT, [4, 1, 8, 1, 2]),
+                ('t1.val2', tq_types.INT, [8, 2, 4, 1, 6]),
+                ('t3.foo', tq_types.INT, [None, 1, None, None, None]),
+                ('t3.bar', tq_types.INT, [None, 1, None, None, None]),
+            ]))
+
+    def plan_join(self, query):
+        join = self.tq.compile_query(query).table
+        return evaluator.Evaluator(self.tq.tables_by_name).plan_join(join)
+
+    def test_inner_joins_reordered_by_size(self):
+        self.tq.tables_by_name['test_table'].num_rows = 100
+        self.tq.tables_by_name['test_table_3'].num_rows = 10
+        join = self.plan_join(
+            'SELECT 0 FROM test_table t1 '
+            'JOIN test_table_3 t3 ON t1.val1 = t3.foo '
+            'JOIN test_table_2 t2 ON t3.bar = t2.val3')
+        # The smallest table comes first, then the smallest table that it
+        # joins with, and so on.
+        self.assertEqual(
+            ['test_table_2', 'test_table_3', 'test_table'],
+            [join.base.name] + [table.name for table, _ in join.tables])
+        self.assertEqual(
+            [[typed_ast.JoinFields(
+                typed_ast.ColumnRef('t2', 'val3', tq_types.INT),
+                typed_ast.ColumnRef('t3', 'bar', tq_types.INT))],
+             [typed_ast.JoinFields(
+                 typed_ast.ColumnRef('t3', 'foo', tq_types.INT),
+                 typed_ast.ColumnRef('t1', 'val1', tq_types.INT))]],
+            join.conditions)
+        # The result columns are still in query order (with the unused
+        # columns pruned).
+        self.assertEqual(
+            [('t1', 'val1'), ('t3', 'foo'), ('t3', 'bar'), ('t2', 'val3')],
+            list(join.type_ctx.columns))
+
+    def test_left_join_not_reordered(self):
+        self.tq.tables_by_name['test_table'].num_rows = 100
+        join = self.plan_join(
+            'SELECT 0 FROM test_table t1 '
+            'JOIN test_table_3 t3 ON t1.val1 = t3.foo '
+            'LEFT JOIN test_table_2 t2 ON t3.bar = t2.val3 '
+            'JOIN test_table t4 ON t2.val2 = t4.val2')
+        self.assertEqual(
+            ['t1', 't3', 't2', 't4'],
+            [join.base.type_ctx.columns.keys()[0][0]] +
+            [table.type_ctx.columns.keys()[0][0]
+             for table, _ in join.tables])
+
+    def test_reordered_join_keeps_column_order(self):
+        # test_table_2 is the smallest table, so it gets joined first.
+        self.assert_query_result(
+            'SELECT * FROM test_table t1 '
+            'JOIN test_table_3 t3 ON t1.val1 = t3.foo '
+            'JOIN test_table_2 t2 ON t3.bar = t2.val3',
+            self.make_context([
+                ('t1.val1', tq_types.INT, [4]),
+                ('t1.val2', tq_types.INT, [8]),
+                ('t3.foo', tq_types.INT, [4]),
+                ('t3.bar', tq_types.INT, [3]),
+                ('t2.val3', tq_types.INT, [3]),
+                ('t2.val2', tq_types.INT, [2]),
+            ]))
+
+    def test_merge_join(self):
+        result = self.tq.evaluate_query(
+            'SELECT t1.val1, t1.val2, t3.bar FROM test_table t1 '
+            'LEFT JOIN EACH test_table_3 t3 ON t1.val1 = t3.foo')
+        self.assertEqual(
+            [(4, 8, 3), (1, 2, 2), (1, 2, 1), (8, 4, None), (1, 1, 2),
+             (1, 1, 1), (2, 6, 7)],
+            zip(result.columns[(None, 't1.val1')].values,
+                result.columns[(None, 't1.val2')].values,
+                result.columns[(None, 't3.bar')].values))
+
+    def test_merge_join_within_memory_budget(self):
+        # The sort of the rhs is spilled to runs of one row.
+        query = ('SELECT t1.val1, t1.val2, t3.bar FROM test_table t1 '
+                 'LEFT JOIN EACH test_table_3 t3 ON t1.val1 = t3.foo')
+        expected = self.tq.evaluate_query(query)
+        self.tq.memory_budget = 1
+        self.assertEqual(expected, self.tq.evaluate_query(query))
+
+    def test_merge_join_matches_hash_join(self):
+        lhs_keys = [(2, 'a'), (None, 'b'), (1, 'a'), (2, 'a'), (3, 'c'),
+                    (1, 'b'), (None, 'b')]
+        rhs_keys = [(1, 'a'), (2, 'a'), (None, 'b'), (1, 'a'), (4, 'c'),
+                    (2, 'a'), (1, 'b')]
+        select_evaluator = evaluator.Evaluator(self.tq.tables_by_name)
+        for keep_unmatched in (False, True):
+            self.assertEqual(
+                evaluator.match_join_keys(lhs_keys, rhs_keys, keep_unmatched),
+                select_evaluator.merge_join_positions(
+                    lhs_keys, rhs_keys, keep_unmatched, 2))
+        self.assertEqual(
+            ([], []),
+            select_evaluator.merge_join_positions([], rhs_keys, True, 2))
+        self.assertEqual(
+            ([0, 1], [None, None]),
+            select_evaluator.merge_join_positions([(1,), (2,)], [], True, 1))
+
+    def test_sorted_subqueries_merge_joined(self):
+        query = ('SELECT t1.val1, t3.bar '
+                 'FROM (SELECT val1 FROM test_table ORDER BY val1) t1 '
+                 'JOIN (SELECT foo, bar FROM test_table_3 ORDER BY foo) t3 '
+                 'ON t1.val1 = t3.foo')
+        with mock.patch.object(
+                evaluator.Evaluator, 'merge_join_positions',
+                autospec=True,
+                side_effect=evaluator.Evaluator.merge_join_positions
+        ) as merge_join_positions:
+            result = self.tq.evaluate_query(query)
+        self.assertEqual(1, merge_join_positions.call_count)
+        self.assertEqual(
+            [(1, 2), (1, 1), (1, 2), (1, 1), (2, 7), (4, 3)],
+            zip(result.columns[(None, 't1.val1')].values,
+                result.columns[(None, 't3.bar')].values))
+
+    def test_unsorted_inputs_hash_joined_without_checking_order(self):
+        with mock.patch.object(evaluator, 'is_sorted') as is_sorted, \
+                mock.patch.object(evaluator.Evaluator,
+                                  'merge_join_positions') as merge_join:
+            self.tq.evaluate_query(
+                'SELECT t1.val1, t3.bar FROM test_table t1 '
+                'JOIN test_table_3 t3 ON t1.val1 = t3.foo')
+        self.assertFalse(is_sorted.called)
+        self.assertFalse(merge_join.called)
+
+    def test_merge_join_keys_are_generated(self):
+        pairs = evaluator.merge_join_keys(
+            [(3,), (1,), (2,), (3,)], [(2,), (3,), (3,)], keep_unmatched=True)
+        self.assertEqual((0, 1), next(pairs))
+        self.assertEqual([(0, 2), (1, None), (2, 0), (3, 1), (3, 2)],
+                         list(pairs))
+
     def test_repeated_select_from_join(self):
         expected_column = self.tq.tables_by_name['repeated_table'].columns['i']
         self.assert_query_result(
@@ -880,6 +1249,85 @@ class EvaluatorTest(unittest.TestCase):
             ])
         )
 
+    def test_parameters(self):
+        result = self.tq.evaluate_query(
+            'SELECT val1, @label AS label FROM test_table '
+            'WHERE val1 > @min_val1 AND val1 IN (@a, @b)',
+            {'label': 'x', 'min_val1': 2, 'a': 4, 'b': 8})
+        self.assertEqual(
+            self.make_context([
+                ('val1', tq_types.INT, [4, 8]),
+                ('label', tq_types.STRING, ['x', 'x']),
+            ]),
+            result)
+
+    def test_literal_columns_are_lists_in_results(self):
+        result = self.tq.evaluate_query('SELECT 1 AS one FROM test_table')
+        self.assertEqual([1, 1, 1, 1, 1],
+                         result.columns[(None, 'one')].values)
+        self.assertIsInstance(result.columns[(None, 'one')].values, list)
+
+    def test_constant_string_timestamp_converted_once(self):
+        with mock.patch('arrow.get', wraps=arrow.get) as arrow_get:
+            self.assert_query_result(
+                'SELECT val1 FROM some_nulls_table '
+                'WHERE val3 > "2000-01-01 00:00:00"',
+                self.make_context([('val1', tq_types.INT, [1])]))
+        self.assertEqual(1, arrow_get.call_count)
+
+    def test_scalar_function_of_constants(self):
+        result = runtime.get_func('abs').evaluate(
+            3, context.Column(type=tq_types.INT, mode=tq_modes.NULLABLE,
+                              values=context.ConstantValues(-2, 3)))
+        self.assertIsInstance(result.values, context.ConstantValues)
+        self.assertEqual([2, 2, 2], result.values)
+
+    def test_constant_filter(self):
+        for keep, expected_values in [(True, [4, 1, 8, 1, 2]), (False, [])]:
+            result = self.tq.evaluate_query(
+                'SELECT val1 FROM test_table WHERE @keep', {'keep': keep})
+            self.assertEqual(
+                self.make_context([('val1', tq_types.INT, expected_values)]),
+                result)
+
+    def test_filter_selects_rows_without_copying(self):
+        table_context = context.context_from_table(
+            self.tq.tables_by_name['test_table'],
+            self.tq.compile_query('SELECT val1, val2 FROM test_table').table
+            .type_ctx)
+        mask = context.Column(type=tq_types.BOOL, mode=tq_modes.NULLABLE,
+                              values=[True, False, True, True, False])
+        result = context.mask_context(table_context, mask)
+        val1 = result.columns[('test_table', 'val1')].values
+        self.assertIsInstance(val1, context.SelectedValues)
+        self.assertEqual([0, 2, 3], val1.indices)
+        self.assertIsNone(val1.gathered)
+
+        mask = context.Column(type=tq_types.BOOL, mode=tq_modes.NULLABLE,
+                              values=[False, True, True])
+        result = context.mask_context(result, mask)
+        val1 = result.columns[('test_table', 'val1')].values
+        val2 = result.columns[('test_table', 'val2')].values
+        # The second filter selects from the table's values directly, and
+        # both columns share the composed selection vector.
+        self.assertIs(self.tq.tables_by_name['test_table'].columns[
+            'val1'].values, val1.base)
+        self.assertEqual([2, 3], val1.indices)
+        self.assertIs(val1.indices, val2.indices)
+        self.assertEqual([8, 1], val1)
+        self.assertEqual([4, 1], val2)
+
+    def test_filtered_subquery_results_are_lists(self):
+        result = self.tq.evaluate_query(
+            'SELECT val1 FROM ('
+            '    SELECT val1, val2 FROM test_table WHERE val1 > 1'
+            '    ORDER BY val2 DESC LIMIT 3) '
+            'WHERE val2 < 8')
+        self.assertEqual(
+            self.make_context([('val1', tq_types.INT, [2, 8])]),
+            result)
+        self.assertIsInstance(result.columns[(None, 'val1')].values, list)
+
     def test_literals_when_no_rows_present(self):
         """Check we handle providing a literal when there are no rows.
 
@@ -900,6 +1348,54 @@ class EvaluatorTest(unittest.TestCase):
                 ('f0_', tq_types.STRING, ['a', 'b', 'a', 'b', 'a'])
             ]))
 
+    def test_if_only_evaluates_branches_for_their_rows(self):
+        # Dividing by val1 - 1 fails for the rows where val1 is 1.
+        self.assert_query_result(
+            'SELECT IF(val1 = 1, 0, 10 / (val1 - 1)) FROM test_table',
+            self.make_context([
+                ('f0_', tq_types.INT, [3, 0, 1, 0, 10])
+            ]))
+        self.assert_query_result(
+            'SELECT CASE WHEN val1 > 5 THEN 1 WHEN val1 = 1 THEN NULL '
+            '            ELSE 10 / (val1 - 1) END '
+            'FROM test_table',
+            self.make_context([
+                ('f0_', tq_types.INT, [3, None, 1, None, 10])
+            ]))
+
+    def test_unreachable_case_branch_not_evaluated(self):
+        with mock.patch.object(runtime.RegexpMatchFunction, '_evaluate',
+                               autospec=True) as regexp_match:
+            self.assert_query_result(
+                'SELECT CASE WHEN val1 > 5 THEN "big" '
+                '            WHEN val1 > 100 AND '
+                '                 REGEXP_MATCH(STRING(val2), "1") THEN "huge" '
+                '            ELSE "small" END AS size '
+                'FROM test_table',
+                self.make_context([
+                    ('size', tq_types.STRING,
+                     ['small', 'small', 'big', 'small', 'small'])
+                ]))
+        self.assertFalse(regexp_match.called)
+
+    def test_boolean_operators_short_circuit(self):
+        self.assert_query_result(
+            'SELECT val1 FROM test_table '
+            'WHERE val1 != 1 AND 10 / (val1 - 1) > 2',
+            self.make_context([('val1', tq_types.INT, [4, 2])]))
+        self.assert_query_result(
+            'SELECT val1 = 1 OR 10 / (val1 - 1) > 2 AS b FROM test_table',
+            self.make_context([
+                ('b', tq_types.BOOL, [True, True, False, True, True])]))
+
+    def test_boolean_operators_with_null(self):
+        # FALSE AND NULL is FALSE and TRUE OR NULL is TRUE, like in bigquery.
+        self.assert_query_result(
+            'SELECT val1 > 1 AND val3 > 0 AS a, val1 > 1 OR val3 > 0 AS o '
+            'FROM some_nulls_table',
+            self.make_context([('a', tq_types.BOOL, [False, False, None]),
+                               ('o', tq_types.BOOL, [True, None, True])]))
+
     def test_join_subquery(self):
         self.assert_query_result(
             'SELECT t2.val '
@@ -1,4 +1,5 @@
 """The lexer turns a query string into a stream of tokens."""
+import threading
 
 from ply import lex
 
@@ -62,7 +63,8 @@ tokens = [
     'INTEGER',
     'FLOAT',
     'ID',
-    'STRING'
+    'STRING',
+    'PARAMETER'
 ] + reserved_words.values()
 
 
@@ -126,6 +128,14 @@ def t_ID(t):
     return t
 
 
+def t_PARAMETER(t):
+    r"""@[a-zA-Z_][a-zA-Z_0-9]*"""
+    # Named query parameters, like @min_value. The value of the token is the
+    # parameter name without the @.
+    t.value = t.value[1:]
+    return t
+
+
 def t_brackets_id(t):
     r"""\[[a-zA-Z_0-9\.]*\]"""
     # Tokens can be surrounded with square brackets, in which case they're
@@ -153,7 +163,7 @@ def lex_text(text):
     lexer.input(text)
     result = []
     while True:
-        token = lex.token()
+        token = lexer.token()
         if token:
             result.append(token)
         else:
@@ -161,5 +171,27 @@ def lex_text(text):
     return result
 
 
+# Building a lexer reflects over this module and compiles the master regex,
+# which is far more expensive than lexing a typical query, so we only do it
+# once per process and hand out clones of the result.
+_lexer_template = None
+_lexer_template_lock = threading.Lock()
+
+
+def get_lexer_template():
+    """Return the process-wide lexer that all other lexers are cloned from.
+
+    The template itself should never be used for lexing, since lexer objects
+    keep their position in the input as mutable state.
+    """
+    global _lexer_template
+    if _lexer_template is None:
+        with _lexer_template_lock:
+            if _lexer_template is None:
+                _lexer_template = lex.lex()
+    return _lexer_template
+
+
 def get_lexer():
-    return lex.lex()
+    """Return a new lexer that is safe to use independently of any other."""
+    return get_lexer_template().clone()
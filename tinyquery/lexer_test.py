@@ -68,6 +68,10 @@ def string(s):
     return 'STRING', s
 
 
+def param(name):
+    return 'PARAMETER', name
+
+
 class LexerTest(unittest.TestCase):
     def assert_tokens(self, text, expected_tokens):
         tokens = lexer.lex_text(text)
@@ -220,6 +224,13 @@ class LexerTest(unittest.TestCase):
             'SELECT 1 IN (1, 2)',
             [select, int_(1), in_tok, lparen, int_(1), comma, int_(2), rparen])
 
+    def test_parameters(self):
+        self.assert_tokens(
+            'SELECT foo FROM table WHERE foo > @min_foo AND bar IN (@Bar_2)',
+            [select, ident('foo'), from_tok, ident('table'), where,
+             ident('foo'), greater_than, param('min_foo'), ('AND', 'and'),
+             ident('bar'), in_tok, lparen, param('Bar_2'), rparen])
+
     def test_comment(self):
         self.assert_tokens(
             """
@@ -308,3 +319,14 @@ class LexerTest(unittest.TestCase):
              when, ident('x'), equals, int_(2), then, int_(4), else_, int_(9),
              end]
         )
+
+    def test_lexers_are_independent(self):
+        lexer1 = lexer.get_lexer()
+        lexer2 = lexer.get_lexer()
+        self.assertIsNot(lexer1, lexer2)
+        lexer1.input('SELECT 1')
+        lexer2.input('SELECT foo')
+        self.assertEqual('SELECT', lexer1.token().type)
+        self.assertEqual('SELECT', lexer2.token().type)
+        self.assertEqual(1, lexer1.token().value)
+        self.assertEqual('foo', lexer2.token().value)
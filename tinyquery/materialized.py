@@ -0,0 +1,181 @@
+"""Incremental maintenance of materialized views.
+
+A materialized view stores the result of its query as a regular table. When
+rows are appended to the table that the view reads from, some queries can
+bring the stored result up to date by only looking at the new rows:
+- Queries that just filter and project rows produce new result rows for the
+  new input rows, and leave the existing result rows alone.
+- Queries that group by select fields (or not at all) and whose aggregates
+  are all SUM, COUNT, MIN, MAX or AVG can keep a small partial state per group
+  and fold the new rows into it.
+Anything else has to be recomputed from scratch whenever its input changes.
+"""
+import collections
+
+import context
+import runtime
+import tq_modes
+import tq_types
+import typed_ast
+
+
+def make_refresher(select_ast, tables_by_name):
+    """Return a refresher that can update the result of a query in place.
+
+    Arguments:
+        select_ast: The compiled typed_ast.Select for the view.
+        tables_by_name: A dict mapping table name to Table.
+
+    Returns: A FilterRefresher or AggregateRefresher, or None if the query
+        can't be refreshed incrementally.
+    """
+    if not isinstance(select_ast.table, typed_ast.Table):
+        return None
+    if select_ast.orderings is not None or select_ast.limit is not None:
+        return None
+    if any(field.within_clause is not None
+           for field in select_ast.select_fields):
+        return None
+    # The evaluator's handling of repeated fields is subtle, so we leave
+    # those queries to it.
+    table = tables_by_name[select_ast.table.name]
+    if any(column.mode == tq_modes.REPEATED
+           for column in table.columns.itervalues()):
+        return None
+
+    if select_ast.group_set is None:
+        return FilterRefresher(select_ast)
+
+    group_set = select_ast.group_set
+    if group_set.field_groups:
+        # Rows are grouped by values that aren't in the result, so we have no
+        # way to tell which result row a new input row belongs to.
+        return None
+    if select_ast.having_expr != typed_ast.Literal(True, tq_types.BOOL):
+        return None
+    for field in select_ast.select_fields:
+        if field.alias in group_set.alias_groups:
+            continue
+        if not (isinstance(field.expr, typed_ast.AggregateFunctionCall) and
+                len(field.expr.args) == 1 and
+                isinstance(field.expr.func, _INCREMENTAL_FUNCTIONS)):
+            return None
+    return AggregateRefresher(select_ast)
+
+
+class FilterRefresher(object):
+    """Refreshes a query that filters and projects a single table.
+
+    Each input row contributes at most one result row, independently of the
+    other input rows, so evaluating the query on just the new rows gives the
+    result rows to append.
+    """
+    # Whether add_rows returns just the new result rows (rather than the
+    # whole result).
+    appends_rows = True
+
+    def __init__(self, select_ast):
+        self.select_ast = select_ast
+
+    def recompute(self, select_evaluator):
+        """Evaluate the query over all rows and return the result Context."""
+        return select_evaluator.evaluate_select(self.select_ast)
+
+    def add_rows(self, select_evaluator):
+        """Return a Context with the result rows to append for new rows.
+
+        The evaluator's table for the view's input should only contain the
+        newly-added rows.
+        """
+        return select_evaluator.evaluate_select(self.select_ast)
+
+
+# Aggregates whose partial state has a fixed size, so the refresher's memory
+# use only depends on the number of groups.
+_INCREMENTAL_FUNCTIONS = (runtime.SumFunction, runtime.CountFunction,
+                          runtime.MinMaxFunction, runtime.AvgFunction)
+
+
+class AggregateRefresher(object):
+    """Refreshes a query that aggregates a single table.
+
+    The refresher keeps the partial state of every aggregate for every group,
+    in the order that the groups first appeared, which is the same order that
+    the evaluator outputs groups in.
+    """
+    appends_rows = False
+
+    def __init__(self, select_ast):
+        self.select_ast = select_ast
+        alias_groups = select_ast.group_set.alias_groups
+        self.group_fields = [field for field in select_ast.select_fields
+                             if field.alias in alias_groups]
+        self.aggregate_fields = [field for field in select_ast.select_fields
+                                 if field.alias not in alias_groups]
+        self.funcs = [field.expr.func for field in self.aggregate_fields]
+        # Maps a tuple of group key values to a list of partial states, one
+        # for each aggregate field.
+        self.group_states = collections.OrderedDict()
+
+    def recompute(self, select_evaluator):
+        """Evaluate the query over all rows and return the result Context."""
+        self.group_states = collections.OrderedDict()
+        if self.select_ast.group_set == typed_ast.TRIVIAL_GROUP_SET:
+            # Aggregating without a GROUP BY always produces exactly one row,
+            # even if there are no input rows.
+            self.group_states[()] = [func.initial_state()
+                                     for func in self.funcs]
+        return self.add_rows(select_evaluator)
+
+    def add_rows(self, select_evaluator):
+        """Fold new rows into the group states and return the new result.
+
+        The evaluator's table for the view's input should only contain the
+        newly-added rows. Unlike FilterRefresher.add_rows, the returned
+        Context has all of the result rows, since existing ones may change.
+        """
+        table_context = select_evaluator.evaluate_table_expr(
+            self.select_ast.table)
+        mask_column = select_evaluator.evaluate_expr(
+            self.select_ast.where_expr, table_context)
+        rows_context = context.mask_context(table_context, mask_column)
+
+        key_columns = [
+            select_evaluator.evaluate_expr(field.expr, rows_context).values
+            for field in self.group_fields]
+        arg_columns = [
+            select_evaluator.evaluate_expr(field.expr.args[0],
+                                           rows_context).values
+            for field in self.aggregate_fields]
+        if key_columns:
+            keys = zip(*key_columns)
+        else:
+            keys = [()] * rows_context.num_rows
+
+        funcs = self.funcs
+        for row_index, key in enumerate(keys):
+            states = self.group_states.get(key)
+            if states is None:
+                states = [func.initial_state() for func in funcs]
+                self.group_states[key] = states
+            for i, func in enumerate(funcs):
+                states[i] = func.add(states[i], arg_columns[i][row_index])
+        return self.result_context()
+
+    def result_context(self):
+        """Build a Context with one row per group from the group states."""
+        values_by_alias = {}
+        for i, field in enumerate(self.group_fields):
+            values_by_alias[field.alias] = [
+                key[i] for key in self.group_states.iterkeys()]
+        for i, (field, func) in enumerate(zip(self.aggregate_fields,
+                                              self.funcs)):
+            values_by_alias[field.alias] = [
+                func.finalize(states[i])
+                for states in self.group_states.itervalues()]
+        columns = collections.OrderedDict(
+            ((None, field.alias),
+             context.Column(type=field.expr.type, mode=tq_modes.NULLABLE,
+                            values=values_by_alias[field.alias]))
+            for field in self.select_ast.select_fields)
+        return context.Context(len(self.group_states), columns, None)
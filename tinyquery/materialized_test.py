@@ -0,0 +1,162 @@
+import collections
+import unittest
+
+import mock
+
+import context
+import materialized
+import tinyquery
+import tq_modes
+import tq_types
+
+
+class MaterializedViewTest(unittest.TestCase):
+    def setUp(self):
+        self.tq = tinyquery.TinyQuery()
+        self.tq.load_table_or_view(self.make_table(
+            'test_table', ['a', 'b', 'a', None], [1, 2, None, 4]))
+
+    @staticmethod
+    def make_table(name, strs, ints):
+        return tinyquery.Table(name, len(strs), collections.OrderedDict([
+            ('s', context.Column(type=tq_types.STRING,
+                                 mode=tq_modes.NULLABLE, values=strs)),
+            ('i', context.Column(type=tq_types.INT,
+                                 mode=tq_modes.NULLABLE, values=ints)),
+        ]))
+
+    def make_materialized_view(self, query):
+        view = self.tq.make_view('test_view', query, materialized=True)
+        self.tq.load_table_or_view(view)
+        return view
+
+    def append_rows(self, strs, ints):
+        self.tq.append_to_table(
+            self.make_table('new_rows', strs, ints),
+            self.tq.tables_by_name['test_table'])
+
+    def assert_view_matches_query(self, view):
+        expected = self.tq.table_from_context(
+            'test_view', self.tq.evaluate_query(view.query))
+        self.assertEqual(expected.num_rows, view.num_rows)
+        self.assertEqual(expected.columns, view.columns)
+
+    def assert_refreshed_incrementally(self, query, refresher_class):
+        view = self.make_materialized_view(query)
+        self.assertIsInstance(view.refresher, refresher_class)
+        self.assert_view_matches_query(view)
+        with mock.patch.object(view.refresher, 'recompute') as recompute:
+            self.append_rows(['c', 'a', None], [5, None, 7])
+            self.append_rows([], [])
+            self.append_rows(['b'], [8])
+        self.assertFalse(recompute.called)
+        self.assert_view_matches_query(view)
+
+    def test_filter(self):
+        self.assert_refreshed_incrementally(
+            'SELECT s, i * 2 AS double_i FROM test_table WHERE i > 1',
+            materialized.FilterRefresher)
+
+    def test_aggregate_with_group_by(self):
+        self.assert_refreshed_incrementally(
+            'SELECT s, SUM(i) AS sum_i, COUNT(*) AS c, COUNT(i) AS count_i, '
+            'MIN(i) AS min_i, MAX(i) AS max_i, AVG(i) AS avg_i '
+            'FROM test_table WHERE i IS NULL OR i != 2 GROUP BY s',
+            materialized.AggregateRefresher)
+
+    def test_aggregate_without_group_by(self):
+        self.assert_refreshed_incrementally(
+            'SELECT SUM(i) AS sum_i, COUNT(s) AS count_s, AVG(i) AS avg_i '
+            'FROM test_table',
+            materialized.AggregateRefresher)
+
+    def test_aggregate_of_empty_table(self):
+        self.tq.load_table_or_view(self.make_table('test_table', [], []))
+        view = self.make_materialized_view(
+            'SELECT COUNT(*) AS c, SUM(i) AS sum_i FROM test_table')
+        self.assertEqual([0], view.columns['c'].values)
+        self.append_rows(['a'], [3])
+        self.assertEqual([1], view.columns['c'].values)
+        self.assertEqual([3], view.columns['sum_i'].values)
+
+    def test_full_recompute(self):
+        view = self.make_materialized_view(
+            'SELECT s, i FROM test_table ORDER BY i DESC')
+        self.assertIsNone(view.refresher)
+        self.append_rows(['c'], [100])
+        self.assert_view_matches_query(view)
+
+    def test_non_decomposable_aggregate(self):
+        view = self.make_materialized_view(
+            'SELECT s, COUNT(DISTINCT i) AS c FROM test_table GROUP BY s')
+        self.assertIsNone(view.refresher)
+        self.append_rows(['a'], [4])
+        self.assert_view_matches_query(view)
+
+    def test_write_truncate(self):
+        view = self.make_materialized_view(
+            'SELECT COUNT(*) AS c FROM test_table')
+        self.tq.copy_table(self.make_table('new_rows', ['x'], [1]),
+                           'test_table', 'CREATE_IF_NEEDED', 'WRITE_TRUNCATE')
+        self.assertEqual([1], view.columns['c'].values)
+
+    def test_replaced_table(self):
+        view = self.make_materialized_view(
+            'SELECT i FROM test_table WHERE i > 1')
+        self.tq.load_table_or_view(
+            self.make_table('test_table', ['x', 'y'], [5, 0]))
+        self.assertEqual([5], view.columns['i'].values)
+
+    def test_nested_views(self):
+        self.tq.load_table_or_view(self.tq.make_view(
+            'filtered', 'SELECT s, i FROM test_table WHERE i > 1',
+            materialized=True))
+        self.tq.load_table_or_view(self.tq.make_view(
+            'plain', 'SELECT s, i FROM filtered'))
+        top_view = self.tq.make_view(
+            'counts', 'SELECT s, COUNT(*) AS c FROM plain GROUP BY s',
+            materialized=True)
+        self.tq.load_table_or_view(top_view)
+        self.assertIsNotNone(
+            self.tq.tables_by_name['filtered'].refresher)
+        # The top view reads through a regular view, so it gets recomputed.
+        self.assertIsNone(top_view.refresher)
+        self.append_rows(['b', 'c'], [3, 0])
+        self.assertEqual(['b', None], top_view.columns['s'].values)
+        self.assertEqual([2, 1], top_view.columns['c'].values)
+
+    def test_query_materialized_view(self):
+        self.make_materialized_view(
+            'SELECT s, SUM(i) AS sum_i FROM test_table GROUP BY s')
+        self.append_rows(['a'], [10])
+        result = self.tq.evaluate_query(
+            'SELECT sum_i FROM test_view WHERE s = "a"')
+        self.assertEqual([11], result.columns[(None, 'sum_i')].values)
+
+    def test_delete_table_read_by_view(self):
+        self.tq.load_table_or_view(self.make_table('ds.other', ['a'], [1]))
+        self.tq.load_table_or_view(self.tq.make_view(
+            'ds.joined', 'SELECT t.i FROM test_table t '
+            'JOIN ds.other o ON t.i = o.i', materialized=True))
+        view = self.make_materialized_view('SELECT i FROM test_table')
+        self.tq.delete_table('ds', 'other')
+        self.assertNotIn('ds.joined', self.tq.tables_by_name)
+        self.append_rows(['c'], [5])
+        self.assertEqual([1, 2, None, 4, 5], view.columns['i'].values)
+
+    def test_failed_refresh_doesnt_skip_other_views(self):
+        self.tq.load_table_or_view(self.tq.make_view(
+            'failing', 'SELECT i FROM test_table', materialized=True))
+        view = self.make_materialized_view('SELECT i FROM test_table')
+        original_refresh = self.tq.refresh_materialized_view
+
+        def refresh(refreshed_view, *args):
+            if refreshed_view.name == 'failing':
+                raise ValueError('Bad view')
+            original_refresh(refreshed_view, *args)
+
+        with mock.patch.object(self.tq, 'refresh_materialized_view',
+                               side_effect=refresh):
+            with self.assertRaises(ValueError):
+                self.append_rows(['c'], [5])
+        self.assertEqual([1, 2, None, 4, 5], view.columns['i'].values)
@@ -0,0 +1,539 @@
+"""The optimizer rewrites a compiled query into one that is cheaper to run.
+
+Each pass takes a typed_ast.Select and returns an equivalent one. Compiled
+ASTs may be cached and shared between queries (for example, the compiled query
+for a view), so passes never modify the AST they are given.
+"""
+import collections
+
+import compiler
+import context
+import runtime
+import tq_ast
+import tq_modes
+import tq_types
+import type_context
+import typed_ast
+
+
+def optimize(select_ast, tables_by_name):
+    """Run all optimization passes over a compiled query.
+
+    Arguments:
+        select_ast: The compiled typed_ast.Select to optimize.
+        tables_by_name: A dict mapping table name to Table, for the tables
+            that the query reads from.
+    """
+    select_ast = fold_constants(select_ast)
+    select_ast = push_down_predicates(select_ast, tables_by_name)
+    select_ast = prune_columns(select_ast)
+    return share_common_subexpressions(select_ast)
+
+
+def fold_constants(select_ast):
+    """Replace calls to deterministic functions of literals with their value.
+
+    Otherwise, an expression like TIMESTAMP('2016-01-01') is computed again
+    for every row of every table that it is used with. Query parameters
+    aren't folded, since the compiled query is reused with other values.
+    """
+    return typed_ast.Select(
+        [typed_ast.SelectField(fold_expr(field.expr), field.alias,
+                               field.within_clause)
+         for field in select_ast.select_fields],
+        map_subqueries(select_ast.table, fold_constants),
+        fold_expr(select_ast.where_expr), select_ast.group_set,
+        fold_expr(select_ast.having_expr), select_ast.orderings,
+        select_ast.limit, select_ast.type_ctx)
+
+
+def fold_expr(expr):
+    """Return an expression with all constant function calls folded."""
+    if isinstance(expr, typed_ast.AggregateFunctionCall):
+        return typed_ast.AggregateFunctionCall(
+            expr.func, [fold_expr(arg) for arg in expr.args], expr.type)
+    if not isinstance(expr, typed_ast.FunctionCall):
+        return expr
+    args = [fold_expr(arg) for arg in expr.args]
+    if (args and expr.func.is_deterministic and
+            all(isinstance(arg, typed_ast.Literal) for arg in args)):
+        try:
+            result = expr.func.evaluate(1, *[
+                context.Column(type=arg.type, mode=tq_modes.NULLABLE,
+                               values=[arg.value])
+                for arg in args])
+        except Exception:
+            # Leave errors like division by zero to be raised (or not, if
+            # there aren't any rows) when the query is run.
+            pass
+        else:
+            # Use the type of the evaluated column rather than the compiled
+            # type, since for a few functions they differ, and the evaluator
+            # goes by the former.
+            if result.mode != tq_modes.REPEATED:
+                return typed_ast.Literal(result.values[0], result.type)
+    return typed_ast.FunctionCall(expr.func, args, expr.type)
+
+
+def share_common_subexpressions(select_ast):
+    """Arrange for repeated expressions within a select to be computed once.
+
+    Generated queries often use the same expression in several places, like
+    a JSON_EXTRACT in both the select fields and the WHERE clause. This pass
+    wraps each deterministic function call that occurs more than once in the
+    select fields, WHERE clause and HAVING clause of a select in a
+    CommonSubexpression, which the evaluator caches per context. Cached
+    columns are filtered along with the context by the WHERE clause, so the
+    select fields and GROUP BY aliases reuse the values computed for the
+    filter.
+    """
+    exprs = ([field.expr for field in select_ast.select_fields] +
+             [select_ast.where_expr, select_ast.having_expr])
+    counts = collections.Counter()
+    for expr in exprs:
+        count_subexpressions(expr, counts)
+    common_keys = set(key for key, count in counts.iteritems() if count > 1)
+    if common_keys:
+        exprs = [share_subexpressions(expr, common_keys) for expr in exprs]
+    select_fields = [
+        typed_ast.SelectField(expr, field.alias, field.within_clause)
+        for expr, field in zip(exprs, select_ast.select_fields)]
+    return typed_ast.Select(
+        select_fields,
+        map_subqueries(select_ast.table, share_common_subexpressions),
+        exprs[-2], select_ast.group_set, exprs[-1], select_ast.orderings,
+        select_ast.limit, select_ast.type_ctx)
+
+
+def expression_key(expr):
+    """Return a hashable value that is equal for equal expressions.
+
+    Runtime functions are shared instances, so they compare by identity.
+    """
+    if isinstance(expr, (typed_ast.FunctionCall,
+                         typed_ast.AggregateFunctionCall)):
+        return (expr.__class__.__name__, expr.func,
+                tuple(expression_key(arg) for arg in expr.args), expr.type)
+    elif isinstance(expr, typed_ast.ColumnRef):
+        return ('ColumnRef', expr.table, expr.column)
+    elif isinstance(expr, typed_ast.Literal):
+        return ('Literal', expr.value, expr.type)
+    elif isinstance(expr, typed_ast.Parameter):
+        return ('Parameter', expr.name)
+    elif isinstance(expr, typed_ast.CommonSubexpression):
+        return expr.key
+    else:
+        assert False, 'Unexpected type: %s' % type(expr)
+
+
+def count_subexpressions(expr, counts):
+    """Count the deterministic function calls within an expression.
+
+    Arguments:
+        expr: The expression to look through.
+        counts: A Counter from expression key to number of occurrences,
+            which is updated in place.
+    """
+    if not isinstance(expr, (typed_ast.FunctionCall,
+                             typed_ast.AggregateFunctionCall)):
+        return
+    for arg in expr.args:
+        count_subexpressions(arg, counts)
+    if is_deterministic(expr):
+        counts[expression_key(expr)] += 1
+
+
+def share_subexpressions(expr, common_keys):
+    """Wrap the function calls in an expression with one of the given keys."""
+    if not isinstance(expr, (typed_ast.FunctionCall,
+                             typed_ast.AggregateFunctionCall)):
+        return expr
+    key = expression_key(expr)
+    args = [share_subexpressions(arg, common_keys) for arg in expr.args]
+    expr = expr.__class__(expr.func, args, expr.type)
+    if key in common_keys:
+        expr = typed_ast.CommonSubexpression(key, expr, expr.type)
+    return expr
+
+
+def map_subqueries(table_expr, func):
+    """Apply a function to the selects that make up a table expression.
+
+    This includes subqueries within unions and joins, but not the subqueries
+    of those subqueries, which func can handle itself.
+    """
+    if isinstance(table_expr, typed_ast.Select):
+        return func(table_expr)
+    elif isinstance(table_expr, typed_ast.TableUnion):
+        return typed_ast.TableUnion(
+            [map_subqueries(table, func) for table in table_expr.tables],
+            table_expr.type_ctx)
+    elif isinstance(table_expr, typed_ast.Join):
+        return typed_ast.Join(
+            map_subqueries(table_expr.base, func),
+            [(map_subqueries(table, func), join_type)
+             for table, join_type in table_expr.tables],
+            table_expr.conditions, table_expr.type_ctx,
+            table_expr.merge_joins)
+    return table_expr
+
+
+def push_down_predicates(select_ast, tables_by_name):
+    """Move filters as close as possible to the tables they filter.
+
+    A WHERE clause is normally applied once its whole table expression has
+    been evaluated, so a join or a subquery produces every row before most of
+    them are thrown away. This pass splits each WHERE clause into the
+    expressions that are ANDed together and moves each one that only looks at
+    a single input:
+    - into the input of a join that it references, unless that input is the
+      right side of a LEFT OUTER JOIN (filtering it would turn matched rows
+      into rows padded with nulls rather than removing them),
+    - into every branch of a union that has all of the columns it references,
+    - into the WHERE clause of a subquery or view that doesn't aggregate or
+      have a LIMIT, by replacing references to the subquery's fields with the
+      expressions that compute them.
+    Inputs that aren't a subquery get a new subquery that just filters them.
+    Filtering on repeated fields also changes the values within each row, so
+    we leave selects over tables with repeated fields alone.
+    """
+    return PredicatePusher(tables_by_name).push_select(select_ast)
+
+
+def prune_columns(select_ast):
+    """Drop all columns that the query doesn't need to compute its result.
+
+    Tables often have many more columns than any one query uses, and every
+    column that makes it into a table expression gets copied by filtering,
+    joining and grouping. This pass works out which columns each table
+    expression actually needs to provide, starting from the outermost select
+    fields, and narrows the type context of every table, subquery, union and
+    join to just those columns. The evaluator only reads the columns in the
+    type context, so the other columns are never touched.
+    """
+    return ColumnPruner().prune_select(select_ast, None)
+
+
+def column_keys(exprs):
+    """Return the set of (table, column) pairs referenced by expressions."""
+    result = set()
+    for expr in exprs:
+        result.update(compiler.Compiler.find_column_references(expr))
+    return result
+
+
+def restrict_type_ctx(type_ctx, required):
+    """Return a type context with only the given columns, keeping order."""
+    if required is None:
+        return type_ctx
+    return type_context.TypeContext.from_full_columns(
+        collections.OrderedDict(
+            (key, col_type) for key, col_type in type_ctx.columns.iteritems()
+            if key in required),
+        type_ctx.implicit_column_context, type_ctx.aggregate_context)
+
+
+_AND = runtime.get_binary_op('and')
+
+
+def split_conjuncts(expr):
+    """Return the list of expressions that are ANDed together in expr."""
+    if isinstance(expr, typed_ast.FunctionCall) and expr.func is _AND:
+        return split_conjuncts(expr.args[0]) + split_conjuncts(expr.args[1])
+    if expr == typed_ast.Literal(True, tq_types.BOOL):
+        return []
+    return [expr]
+
+
+def join_conjuncts(exprs):
+    """Return a single filter expression that ANDs the given expressions."""
+    if not exprs:
+        return typed_ast.Literal(True, tq_types.BOOL)
+    result = exprs[0]
+    for expr in exprs[1:]:
+        result = typed_ast.FunctionCall(_AND, [result, expr], tq_types.BOOL)
+    return result
+
+
+def is_deterministic(expr):
+    """Whether evaluating expr twice on the same rows gives the same values."""
+    if isinstance(expr, (typed_ast.FunctionCall,
+                         typed_ast.AggregateFunctionCall)):
+        return (expr.func.is_deterministic and
+                all(is_deterministic(arg) for arg in expr.args))
+    return True
+
+
+def substitute_columns(expr, replacements):
+    """Replace column references in an expression.
+
+    Arguments:
+        expr: A typed_ast expression.
+        replacements: A dict mapping a (table, column) pair to the expression
+            to use in place of references to that column.
+    """
+    if isinstance(expr, typed_ast.ColumnRef):
+        return replacements[(expr.table, expr.column)]
+    elif isinstance(expr, typed_ast.FunctionCall):
+        return typed_ast.FunctionCall(
+            expr.func, [substitute_columns(arg, replacements)
+                        for arg in expr.args], expr.type)
+    elif isinstance(expr, typed_ast.AggregateFunctionCall):
+        return typed_ast.AggregateFunctionCall(
+            expr.func, [substitute_columns(arg, replacements)
+                        for arg in expr.args], expr.type)
+    return expr
+
+
+def filter_select(table_expr, where_expr):
+    """Return a Select that filters a table expression, keeping its columns.
+
+    The select fields have made-up aliases, but evaluating a subquery renames
+    its columns to match its type context, which is that of the table
+    expression.
+    """
+    select_fields = [
+        typed_ast.SelectField(
+            typed_ast.ColumnRef(table, column, col_type),
+            'f{}_'.format(i), None)
+        for i, ((table, column), col_type) in enumerate(
+            table_expr.type_ctx.columns.iteritems())]
+    return typed_ast.Select(select_fields, table_expr, where_expr, None,
+                            typed_ast.Literal(True, tq_types.BOOL), None, None,
+                            table_expr.type_ctx)
+
+
+class PredicatePusher(object):
+    """Implementation of the push_down_predicates pass."""
+    def __init__(self, tables_by_name):
+        self.tables_by_name = tables_by_name
+
+    def push_select(self, select):
+        table = select.table
+        remaining = []
+        conjuncts = split_conjuncts(select.where_expr)
+        if conjuncts and not self.has_repeated_columns(table):
+            for conjunct in conjuncts:
+                filtered_table = self.push_filter(table, conjunct)
+                if filtered_table is None:
+                    remaining.append(conjunct)
+                else:
+                    table = filtered_table
+        else:
+            remaining = conjuncts
+        if len(remaining) == len(conjuncts):
+            where_expr = select.where_expr
+        else:
+            where_expr = join_conjuncts(remaining)
+        return typed_ast.Select(select.select_fields,
+                                map_subqueries(table, self.push_select),
+                                where_expr,
+                                select.group_set, select.having_expr,
+                                select.orderings, select.limit,
+                                select.type_ctx)
+
+    def has_repeated_columns(self, table_expr):
+        if isinstance(table_expr, typed_ast.Table):
+            table = self.tables_by_name[table_expr.name]
+            return any(table.columns[column].mode == tq_modes.REPEATED
+                       for _, column in table_expr.type_ctx.columns)
+        elif isinstance(table_expr, typed_ast.Select):
+            return self.has_repeated_columns(table_expr.table)
+        elif isinstance(table_expr, typed_ast.TableUnion):
+            return any(self.has_repeated_columns(table)
+                       for table in table_expr.tables)
+        elif isinstance(table_expr, typed_ast.Join):
+            return any(self.has_repeated_columns(table) for table in
+                       [table_expr.base] +
+                       [table for table, _ in table_expr.tables])
+        return False
+
+    def push_filter(self, table_expr, where_expr):
+        """Apply a filter within a table expression.
+
+        Returns: An equivalent of the table expression filtered by where_expr,
+            or None if the filter can't be moved into it.
+        """
+        method = getattr(self, 'push_filter_' + table_expr.__class__.__name__,
+                         None)
+        if method is None:
+            return None
+        return method(table_expr, where_expr)
+
+    def filter_table_expr(self, table_expr, where_expr):
+        """Like push_filter, but wrap the table expression if necessary."""
+        result = self.push_filter(table_expr, where_expr)
+        if result is None:
+            result = filter_select(table_expr, where_expr)
+        return result
+
+    def push_filter_Select(self, table_expr, where_expr):
+        if (table_expr.group_set is not None or
+                table_expr.limit is not None or
+                any(field.within_clause is not None
+                    for field in table_expr.select_fields)):
+            return None
+        replacements = {
+            key: field.expr for key, field in zip(
+                table_expr.type_ctx.columns, table_expr.select_fields)}
+        column_refs = column_keys([where_expr])
+        if not all(key in replacements and
+                   is_deterministic(replacements[key])
+                   for key in column_refs):
+            return None
+        inner_where_expr = join_conjuncts(
+            split_conjuncts(table_expr.where_expr) +
+            [substitute_columns(where_expr, replacements)])
+        return typed_ast.Select(
+            table_expr.select_fields, table_expr.table, inner_where_expr,
+            table_expr.group_set, table_expr.having_expr,
+            table_expr.orderings, table_expr.limit, table_expr.type_ctx)
+
+    def push_filter_TableUnion(self, table_expr, where_expr):
+        # Union branches are matched up by column name alone, and branches
+        # without a column fill it in with nulls.
+        column_names = set(column for _, column in column_keys([where_expr]))
+        tables = []
+        for table in table_expr.tables:
+            keys_by_name = collections.defaultdict(list)
+            for key, col_type in table.type_ctx.columns.iteritems():
+                keys_by_name[key[1]].append((key, col_type))
+            replacements = {}
+            for name in column_names:
+                if len(keys_by_name[name]) != 1:
+                    return None
+                [((table_name, column), col_type)] = keys_by_name[name]
+                replacements[(None, name)] = typed_ast.ColumnRef(
+                    table_name, column, col_type)
+            tables.append(self.filter_table_expr(
+                table, substitute_columns(where_expr, replacements)))
+        return typed_ast.TableUnion(tables, table_expr.type_ctx)
+
+    def push_filter_Join(self, table_expr, where_expr):
+        column_refs = column_keys([where_expr])
+        inputs = ([(table_expr.base, None)] + list(table_expr.tables))
+        matching = [i for i, (table, _) in enumerate(inputs)
+                    if column_refs <= set(table.type_ctx.columns)]
+        if len(matching) != 1:
+            return None
+        [index] = matching
+        table, join_type = inputs[index]
+        if join_type is tq_ast.JoinType.LEFT_OUTER:
+            return None
+        inputs[index] = (self.filter_table_expr(table, where_expr), join_type)
+        return typed_ast.Join(inputs[0][0], inputs[1:],
+                              table_expr.conditions, table_expr.type_ctx,
+                              table_expr.merge_joins)
+
+
+class ColumnPruner(object):
+    """Implementation of the prune_columns pass.
+
+    Each method takes a set of the keys from the type context of the AST node
+    for the columns that the caller needs, or None if it needs all of them.
+    """
+    def prune_select(self, select, required):
+        select_fields = select.select_fields
+        type_ctx = select.type_ctx
+        has_within_clause = any(field.within_clause is not None
+                                for field in select_fields)
+        # Scoped aggregation groups by every other select field, so we can
+        # only drop select fields when there isn't any.
+        if required is not None and not has_within_clause:
+            alias_groups = (select.group_set.alias_groups
+                            if select.group_set is not None else set())
+            having_aliases = set(
+                column for _, column in column_keys([select.having_expr]))
+            ordering_keys = set(
+                (ordering.column.table, ordering.column.column)
+                for ordering in select.orderings or [])
+            kept = [
+                (field, key)
+                for field, key in zip(select_fields,
+                                      type_ctx.columns.iterkeys())
+                if key in required or field.alias in alias_groups or
+                field.alias in having_aliases or key in ordering_keys]
+            select_fields = [field for field, _ in kept]
+            type_ctx = restrict_type_ctx(type_ctx, set(key for _, key in kept))
+
+        table_required = column_keys(
+            [field.expr for field in select_fields] + [select.where_expr])
+        if select.group_set is not None:
+            table_required.update(
+                (ref.table, ref.column)
+                for ref in select.group_set.field_groups)
+        # ORDER BY can also refer to table columns that aren't selected.
+        table_required.update(
+            (ordering.column.table, ordering.column.column)
+            for ordering in select.orderings or []
+            if (ordering.column.table, ordering.column.column)
+            not in select.type_ctx.columns)
+        table = self.prune_table_expr(select.table, table_required)
+        return typed_ast.Select(select_fields, table, select.where_expr,
+                                select.group_set, select.having_expr,
+                                select.orderings, select.limit, type_ctx)
+
+    def prune_table_expr(self, table_expr, required):
+        try:
+            method = getattr(self, 'prune_table_expr_' +
+                             table_expr.__class__.__name__)
+        except AttributeError:
+            raise NotImplementedError('Missing handler for type {}'.format(
+                table_expr.__class__.__name__))
+        return method(table_expr, required)
+
+    def prune_table_expr_NoTable(self, table_expr, required):
+        return table_expr
+
+    def prune_table_expr_Table(self, table_expr, required):
+        return table_expr.with_type_ctx(
+            restrict_type_ctx(table_expr.type_ctx, required))
+
+    def prune_table_expr_Select(self, table_expr, required):
+        return self.prune_select(table_expr, required)
+
+    def prune_table_expr_TableUnion(self, table_expr, required):
+        # Union branches are matched up by column name alone.
+        tables = []
+        for table in table_expr.tables:
+            if required is None:
+                table_required = None
+            else:
+                required_names = set(column for _, column in required)
+                table_required = set(
+                    key for key in table.type_ctx.columns
+                    if key[1] in required_names)
+            tables.append(self.prune_table_expr(table, table_required))
+        return typed_ast.TableUnion(
+            tables, restrict_type_ctx(table_expr.type_ctx, required))
+
+    def prune_table_expr_Join(self, table_expr, required):
+        if required is not None:
+            required = set(required)
+            for conditions in table_expr.conditions:
+                for condition in conditions:
+                    # Cross joins have a None condition.
+                    if condition is not None:
+                        required.add((condition.column1.table,
+                                      condition.column1.column))
+                        required.add((condition.column2.table,
+                                      condition.column2.column))
+
+        def prune_join_input(table):
+            if required is None:
+                return self.prune_table_expr(table, None)
+            return self.prune_table_expr(
+                table, set(key for key in table.type_ctx.columns
+                           if key in required))
+
+        base = prune_join_input(table_expr.base)
+        tables = [(prune_join_input(table), join_type)
+                  for table, join_type in table_expr.tables]
+        # The join may have been reordered, so take the column order from its
+        # own type context rather than from the inputs.
+        kept_columns = set(base.type_ctx.columns)
+        for table, _ in tables:
+            kept_columns.update(table.type_ctx.columns)
+        type_ctx = restrict_type_ctx(table_expr.type_ctx, kept_columns)
+        return typed_ast.Join(base, tables, table_expr.conditions, type_ctx,
+                              table_expr.merge_joins)
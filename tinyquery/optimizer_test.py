@@ -0,0 +1,364 @@
+import collections
+import unittest
+
+import mock
+
+import compiler
+import context
+import evaluator
+import optimizer
+import runtime
+import tinyquery
+import tq_modes
+import tq_types
+import typed_ast
+
+
+class ColumnPruningTest(unittest.TestCase):
+    def setUp(self):
+        self.tq = tinyquery.TinyQuery()
+        self.tq.load_table_or_view(self.make_table(
+            'table1', ['a', 'b', 'c', 'd'],
+            [[1, 2, 3], [4, 5, 6], [7, 8, 9], [1, 1, 2]]))
+        self.tq.load_table_or_view(self.make_table(
+            'table2', ['a', 'e', 'f'],
+            [[1, 2, 3], [10, 20, 30], [100, 200, 300]]))
+        self.tq.load_table_or_view(
+            self.tq.make_view('view1', 'SELECT a, b + c AS bc, d FROM table1'))
+
+    @staticmethod
+    def make_table(name, column_names, column_values):
+        return tinyquery.Table(
+            name, len(column_values[0]), collections.OrderedDict(
+                (column_name, context.Column(type=tq_types.INT,
+                                             mode=tq_modes.NULLABLE,
+                                             values=values))
+                for column_name, values in zip(column_names, column_values)))
+
+    def find_table_columns(self, table_expr):
+        """Return a dict from table name to the list of columns it reads."""
+        if isinstance(table_expr, typed_ast.Table):
+            return {table_expr.name: [
+                column for _, column in table_expr.type_ctx.columns]}
+        elif isinstance(table_expr, typed_ast.Select):
+            return self.find_table_columns(table_expr.table)
+        elif isinstance(table_expr, typed_ast.TableUnion):
+            children = table_expr.tables
+        elif isinstance(table_expr, typed_ast.Join):
+            children = [table_expr.base] + [
+                table for table, _ in table_expr.tables]
+        else:
+            children = []
+        result = {}
+        for child in children:
+            result.update(self.find_table_columns(child))
+        return result
+
+    def assert_pruned(self, query, expected_table_columns):
+        select_ast = compiler.compile_text(query, self.tq.tables_by_name)
+        pruned_ast = optimizer.prune_columns(select_ast)
+        self.assertEqual(expected_table_columns,
+                         self.find_table_columns(pruned_ast))
+        # Pruning should never change the result.
+        select_evaluator = evaluator.Evaluator(self.tq.tables_by_name)
+        self.assertEqual(select_evaluator.evaluate_select(select_ast),
+                         select_evaluator.evaluate_select(pruned_ast))
+
+    def test_select(self):
+        self.assert_pruned('SELECT a FROM table1 WHERE c > 7',
+                           {'table1': ['a', 'c']})
+
+    def test_group_by(self):
+        self.assert_pruned('SELECT SUM(b) AS s FROM table1 GROUP BY d',
+                           {'table1': ['b', 'd']})
+
+    def test_count_star(self):
+        self.assert_pruned('SELECT COUNT(*) FROM table1', {'table1': []})
+
+    def test_subquery(self):
+        self.assert_pruned(
+            'SELECT x FROM (SELECT a + 1 AS x, b AS y, c AS z FROM table1) '
+            'WHERE x > 1',
+            {'table1': ['a']})
+
+    def test_subquery_group_field_kept(self):
+        self.assert_pruned(
+            'SELECT s FROM (SELECT d, SUM(a) AS s FROM table1 GROUP BY d)',
+            {'table1': ['a', 'd']})
+
+    def test_subquery_having_field_kept(self):
+        self.assert_pruned(
+            'SELECT s FROM (SELECT SUM(a) AS s, MAX(b) AS m FROM table1 '
+            'HAVING m > 4)',
+            {'table1': ['a', 'b']})
+
+    def test_view(self):
+        self.assert_pruned('SELECT bc FROM view1', {'table1': ['b', 'c']})
+
+    def test_union(self):
+        self.assert_pruned('SELECT a FROM table1, table2 WHERE a > 1',
+                           {'table1': ['a'], 'table2': ['a']})
+
+    def test_join(self):
+        self.assert_pruned(
+            'SELECT t1.b, t2.e FROM table1 t1 JOIN table2 t2 ON t1.a = t2.a',
+            {'table1': ['a', 'b'], 'table2': ['a', 'e']})
+
+    def test_order_by(self):
+        self.assert_pruned(
+            'SELECT a FROM table1 ORDER BY b DESC',
+            {'table1': ['a', 'b']})
+        # Select fields used by ORDER BY are kept even if nothing reads them.
+        self.assert_pruned(
+            'SELECT a FROM (SELECT a, c + 1 AS x FROM table1 ORDER BY x)',
+            {'table1': ['a', 'c']})
+
+    def test_pruned_through_tinyquery(self):
+        result = self.tq.evaluate_query(
+            'SELECT bc FROM view1 WHERE d = 1')
+        self.assertEqual([11, 13], result.columns[(None, 'bc')].values)
+
+
+class PredicatePushdownTest(unittest.TestCase):
+    def setUp(self):
+        self.tq = tinyquery.TinyQuery()
+        self.tq.load_table_or_view(ColumnPruningTest.make_table(
+            'table1', ['a', 'b', 'c', 'd'],
+            [[1, 2, 3], [4, 5, 6], [7, 8, 9], [1, 1, 2]]))
+        self.tq.load_table_or_view(ColumnPruningTest.make_table(
+            'table2', ['a', 'e', 'f'],
+            [[1, 2, 3], [10, 20, 30], [100, 200, 300]]))
+        self.tq.load_table_or_view(
+            self.tq.make_view('view1', 'SELECT a, b + c AS bc, d FROM table1'))
+        self.tq.load_table_or_view(tinyquery.Table(
+            'repeated_table', 2, collections.OrderedDict([
+                ('r', context.Column(type=tq_types.INT,
+                                     mode=tq_modes.REPEATED,
+                                     values=[[1, 2], [3]]))])))
+
+    def push_down(self, query):
+        """Return the optimized query, after checking its result."""
+        select_ast = compiler.compile_text(query, self.tq.tables_by_name)
+        pushed_ast = optimizer.push_down_predicates(select_ast,
+                                                    self.tq.tables_by_name)
+        select_evaluator = evaluator.Evaluator(self.tq.tables_by_name)
+        self.assertEqual(select_evaluator.evaluate_select(select_ast),
+                         select_evaluator.evaluate_select(pushed_ast))
+        return pushed_ast
+
+    def assert_num_filters(self, num_filters, select_ast):
+        self.assertEqual(
+            num_filters, len(optimizer.split_conjuncts(select_ast.where_expr)))
+
+    def test_join(self):
+        select_ast = self.push_down(
+            'SELECT t1.b, t2.e FROM table1 t1 JOIN table2 t2 ON t1.a = t2.a '
+            'WHERE t1.b > 1 AND t2.e < 30 AND t1.c > t2.e')
+        # Only the filter that looks at both tables has to stay on the join.
+        self.assert_num_filters(1, select_ast)
+        join = select_ast.table
+        self.assertIsInstance(join.base, typed_ast.Select)
+        self.assert_num_filters(1, join.base)
+        self.assertEqual(join.base.type_ctx, join.base.table.type_ctx)
+        self.assertIsInstance(join.tables[0][0], typed_ast.Select)
+        self.assert_num_filters(1, join.tables[0][0])
+
+    def test_left_outer_join(self):
+        select_ast = self.push_down(
+            'SELECT t1.b, t2.e FROM table1 t1 LEFT OUTER JOIN table2 t2 '
+            'ON t1.a = t2.a WHERE t1.b > 1 AND t2.e IS NULL')
+        self.assert_num_filters(1, select_ast)
+        join = select_ast.table
+        self.assertIsInstance(join.base, typed_ast.Select)
+        self.assertIsInstance(join.tables[0][0], typed_ast.Table)
+
+    def test_union(self):
+        select_ast = self.push_down(
+            'SELECT a FROM table1, table2 WHERE a > 1')
+        self.assert_num_filters(0, select_ast)
+        for table in select_ast.table.tables:
+            self.assert_num_filters(1, table)
+
+    def test_union_missing_column(self):
+        select_ast = self.push_down(
+            'SELECT a FROM table1, table2 WHERE b > 1')
+        self.assert_num_filters(1, select_ast)
+        for table in select_ast.table.tables:
+            self.assertIsInstance(table, typed_ast.Table)
+
+    def test_view(self):
+        select_ast = self.push_down(
+            'SELECT bc FROM view1 WHERE d = 1 AND bc > 10')
+        self.assert_num_filters(0, select_ast)
+        self.assert_num_filters(2, select_ast.table)
+
+    def test_into_subquery_of_join(self):
+        select_ast = self.push_down(
+            'SELECT t1.x, t2.e FROM (SELECT a, b * 2 AS x FROM table1) t1 '
+            'JOIN table2 t2 ON t1.a = t2.a WHERE t1.x > 4')
+        self.assert_num_filters(0, select_ast)
+        # The filter goes straight into the subquery rather than wrapping it.
+        self.assert_num_filters(1, select_ast.table.base)
+        self.assertIsInstance(select_ast.table.base.table, typed_ast.Table)
+
+    def test_not_pushed_into_aggregate(self):
+        select_ast = self.push_down(
+            'SELECT s FROM (SELECT d, SUM(a) AS s FROM table1 GROUP BY d) '
+            'WHERE d = 1')
+        self.assert_num_filters(1, select_ast)
+        self.assert_num_filters(0, select_ast.table)
+
+    def test_not_pushed_past_limit(self):
+        select_ast = self.push_down(
+            'SELECT a FROM (SELECT a FROM table1 LIMIT 2) WHERE a > 1')
+        self.assert_num_filters(1, select_ast)
+        self.assert_num_filters(0, select_ast.table)
+
+    def test_not_pushed_into_nondeterministic_field(self):
+        select_ast = optimizer.push_down_predicates(
+            compiler.compile_text(
+                'SELECT x FROM (SELECT RAND() AS x, a FROM table1) '
+                'WHERE x < 0.5 AND a > 1',
+                self.tq.tables_by_name),
+            self.tq.tables_by_name)
+        self.assert_num_filters(1, select_ast)
+        self.assert_num_filters(1, select_ast.table)
+
+    def test_repeated_columns_not_pushed(self):
+        select_ast = self.push_down(
+            'SELECT r FROM (SELECT r FROM repeated_table) WHERE r > 1')
+        self.assert_num_filters(1, select_ast)
+        self.assert_num_filters(0, select_ast.table)
+
+    def test_pushed_through_tinyquery(self):
+        result = self.tq.evaluate_query(
+            'SELECT t1.b, t2.e FROM table1 t1 JOIN table2 t2 ON t1.a = t2.a '
+            'WHERE t1.d = 1 AND t2.f > 100')
+        self.assertEqual([5], result.columns[(None, 't1.b')].values)
+        self.assertEqual([20], result.columns[(None, 't2.e')].values)
+
+
+class ConstantFoldingTest(unittest.TestCase):
+    def setUp(self):
+        self.tq = tinyquery.TinyQuery()
+        self.tq.load_table_or_view(ColumnPruningTest.make_table(
+            'table1', ['a', 'b'], [[1, 2, 3], [4, 5, 6]]))
+
+    def fold(self, query):
+        return optimizer.fold_constants(
+            compiler.compile_text(query, self.tq.tables_by_name))
+
+    def test_fold_arithmetic(self):
+        select_ast = self.fold('SELECT a + (1 + 2 * 3) AS x FROM table1')
+        self.assertEqual(typed_ast.Literal(7, tq_types.INT),
+                         select_ast.select_fields[0].expr.args[1])
+
+    def test_fold_timestamp(self):
+        select_ast = self.fold(
+            'SELECT a FROM table1 '
+            'WHERE TIMESTAMP("2016-01-01") < TIMESTAMP("2017-01-01")')
+        self.assertEqual(typed_ast.Literal(True, tq_types.BOOL),
+                         select_ast.where_expr)
+
+    def test_fold_in_subquery_and_aggregate(self):
+        select_ast = self.fold(
+            'SELECT x FROM (SELECT SUM(a * (2 + 2)) AS x FROM table1)')
+        aggregate = select_ast.table.select_fields[0].expr
+        self.assertEqual(typed_ast.Literal(4, tq_types.INT),
+                         aggregate.args[0].args[1])
+
+    def test_nondeterministic_not_folded(self):
+        select_ast = self.fold('SELECT RAND() + 1, NOW() + 1 FROM table1')
+        for field in select_ast.select_fields:
+            self.assertIsInstance(field.expr, typed_ast.FunctionCall)
+            self.assertIsInstance(field.expr.args[0], typed_ast.FunctionCall)
+
+    def test_parameters_not_folded(self):
+        select_ast = optimizer.fold_constants(compiler.compile_text(
+            'SELECT @x + 1 FROM table1', self.tq.tables_by_name,
+            {'x': tq_types.INT}))
+        self.assertIsInstance(select_ast.select_fields[0].expr,
+                              typed_ast.FunctionCall)
+
+    def test_error_left_to_evaluation(self):
+        select_ast = self.fold('SELECT 1 / 0 FROM table1 WHERE a > 10')
+        self.assertIsInstance(select_ast.select_fields[0].expr,
+                              typed_ast.FunctionCall)
+        result = self.tq.evaluate_query(
+            'SELECT 1 / 0 AS x FROM table1 WHERE a > 10')
+        self.assertEqual([], result.columns[(None, 'x')].values)
+
+
+class CommonSubexpressionTest(unittest.TestCase):
+    def setUp(self):
+        self.tq = tinyquery.TinyQuery()
+        self.tq.load_table_or_view(tinyquery.Table(
+            'events', 4, collections.OrderedDict([
+                ('payload', context.Column(
+                    type=tq_types.STRING, mode=tq_modes.NULLABLE, values=[
+                        '{"user": {"id": "a"}}', '{"user": {"id": "b"}}',
+                        '{"user": {"id": "a"}}', '{"user": {}}'])),
+                ('n', context.Column(
+                    type=tq_types.INT, mode=tq_modes.NULLABLE,
+                    values=[1, 2, 3, 4]))])))
+
+    def find_common_subexpressions(self, expr):
+        if isinstance(expr, typed_ast.CommonSubexpression):
+            return [expr] + self.find_common_subexpressions(expr.expr)
+        elif isinstance(expr, (typed_ast.FunctionCall,
+                               typed_ast.AggregateFunctionCall)):
+            return sum((self.find_common_subexpressions(arg)
+                        for arg in expr.args), [])
+        return []
+
+    def share(self, query):
+        select_ast = compiler.compile_text(query, self.tq.tables_by_name)
+        shared_ast = optimizer.share_common_subexpressions(select_ast)
+        select_evaluator = evaluator.Evaluator(self.tq.tables_by_name)
+        self.assertEqual(select_evaluator.evaluate_select(select_ast),
+                         select_evaluator.evaluate_select(shared_ast))
+        return shared_ast
+
+    def test_shared_across_clauses(self):
+        json_func = runtime.get_func('json_extract_scalar')
+        query = ('SELECT JSON_EXTRACT_SCALAR(payload, "$.user.id") AS user, '
+                 'COUNT(*) AS c FROM events '
+                 'WHERE JSON_EXTRACT_SCALAR(payload, "$.user.id") IS NOT NULL '
+                 'GROUP BY user')
+        select_ast = self.share(query)
+        self.assertEqual(
+            1, len(self.find_common_subexpressions(
+                select_ast.select_fields[0].expr)))
+        self.assertEqual(
+            1, len(self.find_common_subexpressions(select_ast.where_expr)))
+        with mock.patch.object(json_func, '_evaluate',
+                               wraps=json_func._evaluate) as json_evaluate:
+            result = self.tq.evaluate_query(query)
+        self.assertEqual(1, json_evaluate.call_count)
+        self.assertEqual(['a', 'b'], result.columns[(None, 'user')].values)
+        self.assertEqual([2, 1], result.columns[(None, 'c')].values)
+
+    def test_nested_and_aggregate_arguments(self):
+        select_ast = self.share(
+            'SELECT SUM(n * 2 + 1) AS s, MAX(n * 2 + 1) AS m, '
+            'MIN(n * 2) AS i FROM events')
+        keys = [[expr.key for expr in
+                 self.find_common_subexpressions(field.expr)]
+                for field in select_ast.select_fields]
+        self.assertEqual(2, len(keys[0]))
+        self.assertEqual(keys[0], keys[1])
+        self.assertEqual(keys[0][1:], keys[2])
+
+    def test_unique_expressions_not_shared(self):
+        select_ast = self.share('SELECT n + 1, n + 2 FROM events')
+        for field in select_ast.select_fields:
+            self.assertEqual([], self.find_common_subexpressions(field.expr))
+
+    def test_nondeterministic_not_shared(self):
+        select_ast = optimizer.share_common_subexpressions(
+            compiler.compile_text(
+                'SELECT RAND() AS x, RAND() AS y, NOW() + n AS z, '
+                'NOW() + n AS w FROM events',
+                self.tq.tables_by_name))
+        for field in select_ast.select_fields:
+            self.assertEqual([], self.find_common_subexpressions(field.expr))
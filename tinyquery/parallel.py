@@ -0,0 +1,80 @@
+"""Running parts of a query in worker processes.
+
+Evaluating a query is CPU-bound Python code, so threads can't run it in
+parallel. Instead, the work is split into tasks that are run in a pool of
+forked worker processes. The workers are forked after the task function is
+chosen, so they inherit it, along with the columns and other data that it
+refers to, copy-on-write, and only the index of each task and its result
+are pickled.
+"""
+import multiprocessing
+import os
+import random
+import threading
+
+# The function that the workers of the current pool run, set before the pool
+# is forked.
+_task = None
+# Only one pool can be forked at a time, since they share _task.
+_pool_lock = threading.Lock()
+# Whether this process is a worker, in which case tasks run in this process
+# rather than in a pool of its own.
+_in_worker = False
+
+
+def cpu_count():
+    """The number of CPUs, or 1 if it can't be found."""
+    try:
+        return multiprocessing.cpu_count()
+    except NotImplementedError:
+        return 1
+
+
+def is_worker():
+    """Whether this process is a worker of a pool."""
+    return _in_worker
+
+
+def map_in_processes(func, num_tasks, num_processes):
+    """Run tasks in a pool of worker processes.
+
+    If there's only one task or process, or the processes can't be forked,
+    the tasks are run in this process instead.
+
+    Arguments:
+        func: A function that takes the index of a task and returns its
+            result, which must be picklable. It doesn't need to be picklable
+            itself, so it can be a closure.
+        num_tasks: The number of tasks to run.
+        num_processes: The most worker processes to run the tasks in.
+
+    Returns: A list with the result of each task, in order.
+    """
+    num_processes = min(num_processes, num_tasks)
+    if num_processes <= 1 or is_worker() or not hasattr(os, 'fork'):
+        return map(func, xrange(num_tasks))
+
+    global _task
+    with _pool_lock:
+        _task = func
+        try:
+            pool = multiprocessing.Pool(num_processes, _start_worker)
+            try:
+                return pool.map(_run_task, xrange(num_tasks), chunksize=1)
+            finally:
+                pool.terminate()
+                pool.join()
+        finally:
+            _task = None
+
+
+def _start_worker():
+    global _in_worker
+    _in_worker = True
+    # Otherwise every worker would inherit the same random state, and RAND()
+    # would give the same numbers in each of them.
+    random.seed()
+
+
+def _run_task(index):
+    return _task(index)
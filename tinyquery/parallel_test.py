@@ -0,0 +1,35 @@
+import os
+import unittest
+
+import parallel
+
+
+class MapInProcessesTest(unittest.TestCase):
+    def test_results_in_order(self):
+        values = range(100)
+        self.assertEqual(
+            [value * 2 for value in values],
+            parallel.map_in_processes(lambda i: values[i] * 2, 100, 3))
+
+    def test_tasks_run_in_workers(self):
+        pids = parallel.map_in_processes(lambda i: os.getpid(), 4, 2)
+        self.assertNotIn(os.getpid(), pids)
+
+    def test_single_process_runs_here(self):
+        self.assertEqual(
+            [os.getpid()] * 3,
+            parallel.map_in_processes(lambda i: os.getpid(), 3, 1))
+
+    def test_workers_dont_fork_again(self):
+        def task(i):
+            return parallel.map_in_processes(lambda j: os.getpid(), 2, 2)
+        for pids in parallel.map_in_processes(task, 2, 2):
+            self.assertEqual(1, len(set(pids)))
+
+    def test_errors_are_raised(self):
+        def task(i):
+            if i == 1:
+                raise ValueError('Bad task')
+            return i
+        with self.assertRaises(ValueError):
+            parallel.map_in_processes(task, 3, 2)
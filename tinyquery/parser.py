@@ -1,5 +1,7 @@
 """The parser turns a stream of tokens into an AST."""
+import copy
 import os
+import threading
 
 from ply import yacc
 
@@ -27,7 +29,9 @@ def p_select(p):
     if len(p) == 4:
         p[0] = tq_ast.Select(p[2], None, None, None, None, None, p[3], None)
     elif len(p) == 10:
-        p[0] = tq_ast.Select(p[2], p[4], p[5], p[6], p[7], p[8], p[9], None)
+        groups, group_each = p[6]
+        p[0] = tq_ast.Select(p[2], p[4], p[5], groups, p[7], p[8], p[9], None,
+                             group_each)
     else:
         assert False, 'Unexpected number of captured tokens.'
 
@@ -57,10 +61,11 @@ def p_optional_group_by(p):
                          | GROUP BY column_id_list
                          | GROUP EACH BY column_id_list
     """
+    # Gives a pair of the groups and whether they were given with EACH.
     if len(p) == 1:
-        p[0] = None
+        p[0] = (None, False)
     else:
-        p[0] = p[len(p) - 1]
+        p[0] = (p[len(p) - 1], len(p) == 5)
 
 
 def p_optional_order_by(p):
@@ -144,27 +149,29 @@ def p_non_cross_join(p):
                       | JOIN
                       | JOIN EACH
     """
+    is_each = p[len(p) - 1].upper() == 'EACH'
     if p[1].upper() == 'LEFT':
-        p[0] = tq_ast.JoinType.LEFT_OUTER
+        p[0] = (tq_ast.JoinType.LEFT_OUTER, is_each)
     else:
-        p[0] = tq_ast.JoinType.INNER
+        p[0] = (tq_ast.JoinType.INNER, is_each)
 
 
 def p_cross_join(p):
     """cross_join : CROSS JOIN
                   | CROSS JOIN EACH
     """
-    p[0] = tq_ast.JoinType.CROSS
+    p[0] = (tq_ast.JoinType.CROSS, len(p) == 4)
 
 
 def p_partial_join(p):
     """partial_join : non_cross_join aliased_table_expr ON expression
                     | cross_join aliased_table_expr
     """
-    if p[1] is tq_ast.JoinType.CROSS:
-        p[0] = tq_ast.PartialJoin(p[2], p[1], None)
+    join_type, is_each = p[1]
+    if join_type is tq_ast.JoinType.CROSS:
+        p[0] = tq_ast.PartialJoin(p[2], join_type, None, is_each)
     else:
-        p[0] = tq_ast.PartialJoin(p[2], p[1], p[4])
+        p[0] = tq_ast.PartialJoin(p[2], join_type, p[4], is_each)
 
 
 def p_join_tail(p):
@@ -214,7 +221,7 @@ def p_aliased_table_expr(p):
             p[0] = tq_ast.Select(p[1].select_fields, p[1].table_expr,
                                  p[1].where_expr, p[1].groups,
                                  p[1].having_expr, p[1].orderings, p[1].limit,
-                                 p[len(p) - 1])
+                                 p[len(p) - 1], p[1].group_each)
         else:
             assert False, 'Unexpected table_expr type: %s' % type(p[1])
 
@@ -420,6 +427,11 @@ def p_null_literal(p):
     p[0] = tq_ast.Literal(None)
 
 
+def p_parameter(p):
+    """constant : PARAMETER"""
+    p[0] = tq_ast.Parameter(p[1])
+
+
 def p_expr_column_id(p):
     """expression : column_id"""
     p[0] = p[1]
@@ -477,13 +489,56 @@ def p_error(p):
     raise SyntaxError('Unexpected token: %s' % p)
 
 
+class ParserEngine(object):
+    """Owns the lexer and LALR tables and hands out per-thread instances.
+
+    Building the parser with yacc.yacc() validates the whole grammar and loads
+    (or, if they are out of date, regenerates) the LALR tables, and building a
+    lexer reflects over the lexer module and compiles its master regex. Both
+    are much more expensive than parsing a typical query, so the engine does
+    that work once and afterwards only hands out copies. The copies share the
+    read-only tables, but each thread gets its own lexer and parser object,
+    since PLY keeps the parse stacks and input position on those objects.
+    """
+    def __init__(self):
+        self._build_lock = threading.Lock()
+        self._parser_template = None
+        self._thread_local = threading.local()
+
+    def _get_parser_template(self):
+        if self._parser_template is None:
+            with self._build_lock:
+                if self._parser_template is None:
+                    self._parser_template = self._build_parser()
+        return self._parser_template
+
+    @staticmethod
+    def _build_parser():
+        # If you're making changes to the parser, you need to run the the code
+        # with SHOULD_REBUILD_PARSER=1 in order to update it.
+        should_rebuild_parser = int(os.getenv('SHOULD_REBUILD_PARSER', '0'))
+        if should_rebuild_parser:
+            return yacc.yacc()
+        else:
+            import parsetab
+            return yacc.yacc(debug=0, write_tables=0, tabmodule=parsetab)
+
+    def get_parser_and_lexer(self):
+        """Return the (parser, lexer) pair owned by the current thread."""
+        instances = getattr(self._thread_local, 'instances', None)
+        if instances is None:
+            instances = (copy.copy(self._get_parser_template()),
+                         lexer.get_lexer())
+            self._thread_local.instances = instances
+        return instances
+
+    def parse(self, text):
+        parser, thread_lexer = self.get_parser_and_lexer()
+        return parser.parse(text, lexer=thread_lexer)
+
+
+_engine = ParserEngine()
+
+
 def parse_text(text):
-    # If you're making changes to the parser, you need to run the the code with
-    # SHOULD_REBUILD_PARSER=1 in order to update it.
-    should_rebuild_parser = int(os.getenv('SHOULD_REBUILD_PARSER', '0'))
-    if should_rebuild_parser:
-        parser = yacc.yacc()
-    else:
-        import parsetab
-        parser = yacc.yacc(debug=0, write_tables=0, tabmodule=parsetab)
-    return parser.parse(text, lexer=lexer.get_lexer())
+    return _engine.parse(text)
@@ -1,3 +1,4 @@
+import threading
 import unittest
 
 import tq_ast
@@ -438,6 +439,7 @@ class ParserTest(unittest.TestCase):
                                 tq_ast.ColumnId('t1.id'),
                                 tq_ast.ColumnId('t2.id')
                             ),
+                            True,
                         ),
                     ]
                 ),
@@ -498,6 +500,7 @@ class ParserTest(unittest.TestCase):
                                 tq_ast.ColumnId('t1.id'),
                                 tq_ast.ColumnId('t2.id')
                             ),
+                            True,
                         ),
                         tq_ast.PartialJoin(
                             tq_ast.TableId('table3', 't3'),
@@ -566,7 +569,8 @@ class ParserTest(unittest.TestCase):
                 None,
                 None,
                 None,
-                None))
+                None,
+                True))
 
     def test_join_each(self):
         self.assert_parsed_select(
@@ -584,6 +588,7 @@ class ParserTest(unittest.TestCase):
                                 tq_ast.ColumnId('t1.foo'),
                                 tq_ast.ColumnId('t2.bar')
                             ),
+                            True,
                         ),
                     ]
                 ),
@@ -623,6 +628,25 @@ class ParserTest(unittest.TestCase):
                 None)
         )
 
+    def test_parameters(self):
+        self.assert_parsed_select(
+            'SELECT @foo IN (@bar, 2)',
+            tq_ast.Select([
+                tq_ast.SelectField(
+                    tq_ast.FunctionCall('in', [
+                        tq_ast.Parameter('foo'),
+                        tq_ast.Parameter('bar'),
+                        tq_ast.Literal(2)]),
+                    None, None)],
+                None,
+                None,
+                None,
+                None,
+                None,
+                None,
+                None)
+        )
+
     def test_count_star(self):
         self.assert_parsed_select(
             'SELECT COUNT(*), COUNT(((*))) FROM table',
@@ -853,3 +877,41 @@ class ParserTest(unittest.TestCase):
         self.assertRaises(
             SyntaxError, parser.parse_text,
             'SELECT CASE WHEN x = 4 THEN 16 ELSE 16 WHEN x = 5 THEN 25 END')
+
+    def test_engine_reuses_instances_within_a_thread(self):
+        engine = parser.ParserEngine()
+        self.assertIs(engine.get_parser_and_lexer(),
+                      engine.get_parser_and_lexer())
+
+    def test_engine_uses_separate_instances_per_thread(self):
+        engine = parser.ParserEngine()
+        main_parser, main_lexer = engine.get_parser_and_lexer()
+        results = []
+
+        def run():
+            results.append(engine.get_parser_and_lexer())
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+
+        other_parser, other_lexer = results[0]
+        self.assertIsNot(main_parser, other_parser)
+        self.assertIsNot(main_lexer, other_lexer)
+        # The expensive tables should be shared rather than rebuilt.
+        self.assertIs(main_parser.action, other_parser.action)
+
+    def test_parse_from_multiple_threads(self):
+        expected = [parser.parse_text('SELECT %s FROM t%s' % (i, i))
+                    for i in xrange(8)]
+        results = [None] * len(expected)
+
+        def run(i):
+            for _ in xrange(20):
+                results[i] = parser.parse_text('SELECT %s FROM t%s' % (i, i))
+        threads = [threading.Thread(target=run, args=(i,))
+                   for i in xrange(len(expected))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(expected, results)
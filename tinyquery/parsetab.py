@@ -1,139 +1,141 @@
 
 # parsetab.py
 # This file is automatically generated. Do not edit.
-_tabversion = '3.2'
+# pylint: disable=W,C,R
+_tabversion = '3.10'
 
 _lr_method = 'LALR'
 
-_lr_signature = '\xbem\xcbp\xf0\xfa\xee-H2k\xac%t\x18\xdf'
+_lr_signature = 'leftANDORleftEQUALSNOT_EQUALGREATER_THANLESS_THANGREATER_THAN_OR_EQUALLESS_THAN_OR_EQUALISleftPLUSMINUSleftSTARDIVIDED_BYMODCONTAINSINAND AS ASC BY CASE COMMA CONTAINS COUNT CROSS DESC DISTINCT DIVIDED_BY DOT EACH ELSE END EQUALS FALSE FLOAT FROM GREATER_THAN GREATER_THAN_OR_EQUAL GROUP HAVING ID IN INTEGER IS JOIN LEFT LESS_THAN LESS_THAN_OR_EQUAL LIMIT LPAREN MINUS MOD NOT NOT_EQUAL NULL ON OR ORDER OUTER PARAMETER PLUS RECORD RPAREN SELECT STAR STRING THEN TRUE WHEN WHERE WITHINselect : SELECT select_field_list optional_limit\n              | SELECT select_field_list FROM full_table_expr optional_where                     optional_group_by optional_having optional_order_by                     optional_limit\n    optional_where :\n                      | WHERE expression\n    optional_having :\n                       | HAVING expression\n    optional_group_by :\n                         | GROUP BY column_id_list\n                         | GROUP EACH BY column_id_list\n    optional_order_by :\n                         | ORDER BY order_by_listorder_by_list : strict_order_by_list\n                     | strict_order_by_list COMMAstrict_order_by_list : ordering\n                            | strict_order_by_list COMMA orderingordering : column_id\n                | column_id ASCordering : column_id DESCcolumn_id_list : strict_column_id_list\n                      | strict_column_id_list COMMAstrict_column_id_list : column_id\n                             | strict_column_id_list COMMA column_id\n    optional_limit :\n                      | LIMIT INTEGER\n    full_table_expr : aliased_table_expr_listnon_cross_join : LEFT OUTER JOIN\n                      | LEFT OUTER JOIN EACH\n                      | LEFT JOIN\n                      | LEFT JOIN EACH\n                      | JOIN\n                      | JOIN EACH\n    cross_join : CROSS JOIN\n                  | CROSS JOIN EACH\n    partial_join : non_cross_join aliased_table_expr ON expression\n                    | cross_join aliased_table_expr\n    join_tail : partial_join join_tail\n                 | partial_join\n    full_table_expr : aliased_table_expr join_tailaliased_table_expr_list : strict_aliased_table_expr_list\n                               | strict_aliased_table_expr_list COMMAstrict_aliased_table_expr_list : aliased_table_expr\n                                      | strict_aliased_table_expr_list COMMA                                             aliased_table_expr\n    aliased_table_expr : table_expr\n                          | table_expr ID\n                          | table_expr AS IDtable_expr : id_component_listtable_expr : selecttable_expr : LPAREN table_expr RPARENselect_field_list : strict_select_field_list\n                         | strict_select_field_list COMMAstrict_select_field_list : select_field\n                                | strict_select_field_list COMMA select_field\n    select_field : expression\n                    | expression ID\n                    | expression AS ID\n                    | expression WITHIN RECORD AS ID\n                    | expression WITHIN expression AS ID\n    select_field : STARexpression : LPAREN expression RPARENexpression : expression IS NULLexpression : expression IS NOT NULLexpression : MINUS expression\n                  | NOT expression\n    expression : expression PLUS expression\n                  | expression MINUS expression\n                  | expression STAR expression\n                  | expression DIVIDED_BY expression\n                  | expression MOD expression\n                  | expression EQUALS expression\n                  | expression NOT_EQUAL expression\n                  | expression GREATER_THAN expression\n                  | expression LESS_THAN expression\n                  | expression GREATER_THAN_OR_EQUAL expression\n                  | expression LESS_THAN_OR_EQUAL expression\n                  | expression AND expression\n                  | expression OR expression\n                  | expression CONTAINS expression\n    expression : ID LPAREN arg_list RPAREN\n                  | LEFT LPAREN arg_list RPAREN\n    expression : COUNT LPAREN arg_list RPARENexpression : COUNT LPAREN DISTINCT arg_list RPARENexpression : COUNT LPAREN parenthesized_star RPARENparenthesized_star : STAR\n                          | LPAREN parenthesized_star RPARENarg_list :\n                | expression\n                | arg_list COMMA expressionexpression : expression IN LPAREN constant_list RPARENconstant_list : strict_constant_list\n                     | strict_constant_list COMMAstrict_constant_list : constant\n                            | strict_constant_list COMMA constantexpression : constantconstant : INTEGERconstant : FLOATconstant : STRINGconstant : TRUEconstant : FALSEconstant : NULLconstant : PARAMETERexpression : column_idcolumn_id : id_component_list\n                 | id_component_list DOT STARid_component_list : ID\n                         | id_component_list DOT IDcase_clause_else : ELSE expressioncase_clause_when : WHEN expression THEN expressioncase_body : case_clause_when\n                 | case_body case_clause_else\n                 | case_clause_when case_bodyexpression : CASE case_body END'
     
-_lr_action_items = {'THEN':([3,5,6,7,8,10,13,17,18,19,25,36,57,58,59,60,80,84,85,88,89,90,91,92,94,95,98,99,100,101,102,103,106,108,125,126,129,134,152,],[-95,-101,-93,-99,-97,-96,-100,-98,-103,-94,-62,-63,-102,-104,104,-110,-59,-66,-74,-72,-65,-70,-67,-64,-60,-69,-71,-75,-73,-77,-76,-68,-82,-80,-78,-79,-61,-81,-88,]),'CONTAINS':([3,5,6,7,8,10,13,17,18,19,23,25,33,36,57,58,59,60,69,80,84,85,87,88,89,90,91,92,94,95,98,99,100,101,102,103,105,106,108,125,126,129,133,134,135,139,152,165,170,],[-95,-101,-93,-99,-97,-96,-100,-98,-103,-94,54,54,54,54,-102,-104,54,-110,54,-59,-66,54,54,54,54,54,-67,54,-60,54,54,54,54,-77,54,-68,54,-82,-80,-78,-79,-61,54,-81,54,54,-88,54,54,]),'GROUP':([3,4,5,6,7,8,10,12,13,15,17,18,19,20,23,25,31,35,36,51,57,58,60,70,71,72,73,75,76,77,78,79,80,82,84,85,88,89,90,91,92,94,95,96,98,99,100,101,102,103,106,108,112,115,118,123,124,125,126,129,134,137,139,140,141,145,148,149,150,151,152,154,163,165,166,167,168,170,172,174,175,176,177,178,179,180,181,182,183,184,],[-95,-58,-101,-93,-99,-97,-96,-51,-100,-23,-98,-103,-94,-49,-53,-62,-1,-50,-63,-54,-102,-104,-110,-47,-46,-25,-3,-103,-41,-43,-39,-24,-59,-52,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,-80,138,-37,-38,-44,-40,-78,-79,-61,-81,-5,-4,-48,-36,-35,-45,-42,-56,-57,-88,-10,-23,-6,-21,-19,-8,-34,-2,-20,-9,-11,-12,-14,-16,-22,-13,-17,-18,-15,]),'LESS_THAN_OR_EQUAL':([3,5,6,7,8,10,13,17,18,19,23,25,33,36,57,58,59,60,69,80,84,85,87,88,89,90,91,92,94,95,98,99,100,101,102,103,105,106,108,125,126,129,133,134,135,139,152,165,170,],[-95,-101,-93,-99,-97,-96,-100,-98,-103,-94,39,-62,39,39,-102,-104,39,-110,39,-59,-66,-74,39,-72,-65,-70,-67,-64,-60,-69,-71,39,-73,-77,39,-68,39,-82,-80,-78,-79,-61,39,-81,39,39,-88,39,39,]),'WITHIN':([3,5,6,7,8,10,13,17,18,19,23,25,36,57,58,60,80,84,85,88,89,90,91,92,94,95,98,99,100,101,102,103,106,108,125,126,129,134,152,],[-95,-101,-93,-99,-97,-96,-100,-98,-103,-94,40,-62,-63,-102,-104,-110,-59,-66,-74,-72,-65,-70,-67,-64,-60,-69,-71,-75,-73,-77,-76,-68,-82,-80,-78,-79,-61,-81,-88,]),'CROSS':([3,4,5,6,7,8,10,12,13,15,17,18,19,20,23,25,31,35,36,51,57,58,60,70,71,72,73,75,76,77,78,79,80,82,84,85,88,89,90,91,92,94,95,96,98,99,100,101,102,103,106,108,112,115,118,123,124,125,126,129,134,137,139,140,141,145,148,149,150,151,152,154,163,165,166,167,168,170,172,174,175,176,177,178,179,180,181,182,183,184,],[-95,-58,-101,-93,-99,-97,-96,-51,-100,-23,-98,-103,-94,-49,-53,-62,-1,-50,-63,-54,-102,-104,-110,-47,-46,-25,-3,-103,117,-43,-39,-24,-59,-52,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,-80,-7,117,-38,-44,-40,-78,-79,-61,-81,-5,-4,-48,-36,-35,-45,-42,-56,-57,-88,-10,-23,-6,-21,-19,-8,-34,-2,-20,-9,-11,-12,-14,-16,-22,-13,-17,-18,-15,]),'LIMIT':([3,4,5,6,7,8,10,12,13,15,17,18,19,20,23,25,31,35,36,51,57,58,60,70,71,72,73,75,76,77,78,79,80,82,84,85,88,89,90,91,92,94,95,96,98,99,100,101,102,103,106,108,112,115,118,123,124,125,126,129,134,137,139,140,141,145,148,149,150,151,152,154,163,165,166,167,168,170,172,174,175,176,177,178,179,180,181,182,183,184,],[-95,-58,-101,-93,-99,-97,-96,-51,-100,32,-98,-103,-94,-49,-53,-62,-1,-50,-63,-54,-102,-104,-110,-47,-46,-25,-3,-103,-41,-43,-39,-24,-59,-52,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,-80,-7,-37,-38,-44,-40,-78,-79,-61,-81,-5,-4,-48,-36,-35,-45,-42,-56,-57,-88,-10,32,-6,-21,-19,-8,-34,-2,-20,-9,-11,-12,-14,-16,-22,-13,-17,-18,-15,]),'STAR':([2,3,5,6,7,8,10,13,17,18,19,23,24,25,29,33,35,36,57,58,59,60,68,69,80,84,85,87,88,89,90,91,92,94,95,98,99,100,101,102,103,105,106,108,125,126,129,133,134,135,139,152,165,170,],[4,-95,-101,-93,-99,-97,-96,-100,-98,-103,-94,38,57,38,64,38,4,38,-102,-104,38,-110,64,38,-59,-66,38,38,38,38,38,-67,38,-60,38,38,38,38,-77,38,-68,38,-82,-80,-78,-79,-61,38,-81,38,38,-88,38,38,]),'LESS_THAN':([3,5,6,7,8,10,13,17,18,19,23,25,33,36,57,58,59,60,69,80,84,85,87,88,89,90,91,92,94,95,98,99,100,101,102,103,105,106,108,125,126,129,133,134,135,139,152,165,170,],[-95,-101,-93,-99,-97,-96,-100,-98,-103,-94,41,-62,41,41,-102,-104,41,-110,41,-59,-66,-74,41,-72,-65,-70,-67,-64,-60,-69,-71,41,-73,-77,41,-68,41,-82,-80,-78,-79,-61,41,-81,41,41,-88,41,41,]),'NULL':([2,9,16,21,26,29,34,35,37,38,39,40,41,42,43,44,45,46,47,50,52,53,54,55,56,62,66,68,93,97,104,109,113,153,155,159,],[7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,94,7,7,7,7,7,7,7,7,7,7,129,7,7,7,7,7,7,7,]),'TRUE':([2,9,16,21,26,29,34,35,37,38,39,40,41,42,43,44,45,47,50,52,53,54,55,56,62,66,68,97,104,109,113,153,155,159,],[8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,]),'MINUS':([2,3,5,6,7,8,9,10,13,16,17,18,19,21,23,25,26,29,33,34,35,36,37,38,39,40,41,42,43,44,45,47,50,52,53,54,55,56,57,58,59,60,62,66,68,69,80,84,85,87,88,89,90,91,92,94,95,98,99,100,101,102,103,104,105,106,108,109,113,125,126,129,133,134,135,139,152,155,159,165,170,],[9,-95,-101,-93,-99,-97,9,-96,-100,9,-98,-103,-94,9,42,-62,9,9,42,9,9,42,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,-102,-104,42,-110,9,9,9,42,-59,-66,42,42,42,-65,42,-67,-64,-60,42,42,42,42,-77,42,-68,9,42,-82,-80,9,9,-78,-79,-61,42,-81,42,42,-88,9,9,42,42,]),'SELECT':([0,30,74,116,119,120,124,142,143,146,158,160,161,171,],[2,2,2,-30,2,2,2,-31,-32,-28,-33,-29,-26,-27,]),'CASE':([2,9,16,21,26,29,34,35,37,38,39,40,41,42,43,44,45,47,50,52,53,54,55,56,62,66,68,104,109,113,155,159,],[11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,]),'NOT_EQUAL':([3,5,6,7,8,10,13,17,18,19,23,25,33,36,57,58,59,60,69,80,84,85,87,88,89,90,91,92,94,95,98,99,100,101,102,103,105,106,108,125,126,129,133,134,135,139,152,165,170,],[-95,-101,-93,-99,-97,-96,-100,-98,-103,-94,43,-62,43,43,-102,-104,43,-110,43,-59,-66,-74,43,-72,-65,-70,-67,-64,-60,-69,-71,43,-73,-77,43,-68,43,-82,-80,-78,-79,-61,43,-81,43,43,-88,43,43,]),'RPAREN':([3,4,5,6,7,8,10,12,13,15,17,18,19,20,23,25,29,31,33,34,35,36,37,51,57,58,60,64,65,66,67,69,70,71,72,73,75,76,77,78,79,80,81,82,83,84,85,88,89,90,91,92,94,95,96,98,99,100,101,102,103,106,107,108,110,112,114,115,118,123,124,125,126,129,130,131,132,134,135,136,137,139,140,141,145,148,149,150,151,152,153,154,162,163,165,166,167,168,170,172,174,175,176,177,178,179,180,181,182,183,184,],[-95,-58,-101,-93,-99,-97,-96,-51,-100,-23,-98,-103,-94,-49,-53,-62,-85,-1,80,-85,-50,-63,-85,-54,-102,-104,-110,-83,106,-85,108,-86,-47,-46,-25,-3,-103,-41,-43,-39,-24,-59,125,-52,126,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,134,-80,136,-7,140,-37,-38,-44,-40,-78,-79,-61,152,-89,-91,-81,-87,-84,-5,-4,-48,-36,-35,-45,-42,-56,-57,-88,-90,-10,-92,-23,-6,-21,-19,-8,-34,-2,-20,-9,-11,-12,-14,-16,-22,-13,-17,-18,-15,]),'DISTINCT':([29,],[66,]),'WHEN':([3,5,6,7,8,10,11,13,17,18,19,25,28,36,57,58,60,80,84,85,88,89,90,91,92,94,95,98,99,100,101,102,103,106,108,125,126,129,133,134,152,],[-95,-101,-93,-99,-97,-96,26,-100,-98,-103,-94,-62,26,-63,-102,-104,-110,-59,-66,-74,-72,-65,-70,-67,-64,-60,-69,-71,-75,-73,-77,-76,-68,-82,-80,-78,-79,-61,-106,-81,-88,]),'DIVIDED_BY':([3,5,6,7,8,10,13,17,18,19,23,25,33,36,57,58,59,60,69,80,84,85,87,88,89,90,91,92,94,95,98,99,100,101,102,103,105,106,108,125,126,129,133,134,135,139,152,165,170,],[-95,-101,-93,-99,-97,-96,-100,-98,-103,-94,44,44,44,44,-102,-104,44,-110,44,-59,-66,44,44,44,44,44,-67,44,-60,44,44,44,44,-77,44,-68,44,-82,-80,-78,-79,-61,44,-81,44,44,-88,44,44,]),'ORDER':([3,4,5,6,7,8,10,12,13,15,17,18,19,20,23,25,31,35,36,51,57,58,60,70,71,72,73,75,76,77,78,79,80,82,84,85,88,89,90,91,92,94,95,96,98,99,100,101,102,103,106,108,112,115,118,123,124,125,126,129,134,137,139,140,141,145,148,149,150,151,152,154,163,165,166,167,168,170,172,174,175,176,177,178,179,180,181,182,183,184,],[-95,-58,-101,-93,-99,-97,-96,-51,-100,-23,-98,-103,-94,-49,-53,-62,-1,-50,-63,-54,-102,-104,-110,-47,-46,-25,-3,-103,-41,-43,-39,-24,-59,-52,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,-80,-7,-37,-38,-44,-40,-78,-79,-61,-81,-5,-4,-48,-36,-35,-45,-42,-56,-57,-88,164,-23,-6,-21,-19,-8,-34,-2,-20,-9,-11,-12,-14,-16,-22,-13,-17,-18,-15,]),'ASC':([5,57,58,75,179,],[-101,-102,-104,-103,182,]),'RECORD':([40,],[86,]),'PLUS':([3,5,6,7,8,10,13,17,18,19,23,25,33,36,57,58,59,60,69,80,84,85,87,88,89,90,91,92,94,95,98,99,100,101,102,103,105,106,108,125,126,129,133,134,135,139,152,165,170,],[-95,-101,-93,-99,-97,-96,-100,-98,-103,-94,45,-62,45,45,-102,-104,45,-110,45,-59,-66,45,45,45,-65,45,-67,-64,-60,45,45,45,45,-77,45,-68,45,-82,-80,-78,-79,-61,45,-81,45,45,-88,45,45,]),'DOT':([5,18,58,71,75,],[24,-103,-104,111,-103,]),'FROM':([3,4,5,6,7,8,10,12,13,15,17,18,19,20,23,25,35,36,51,57,58,60,80,82,84,85,88,89,90,91,92,94,95,96,98,99,100,101,102,103,106,108,125,126,129,134,150,151,152,],[-95,-58,-101,-93,-99,-97,-96,-51,-100,30,-98,-103,-94,-49,-53,-62,-50,-63,-54,-102,-104,-110,-59,-52,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,-80,-78,-79,-61,-81,-56,-57,-88,]),'INTEGER':([2,9,16,21,26,29,32,34,35,37,38,39,40,41,42,43,44,45,47,50,52,53,54,55,56,62,66,68,97,104,109,113,153,155,159,],[19,19,19,19,19,19,79,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,]),'BY':([138,157,164,],[156,169,173,]),'LEFT':([2,3,4,5,6,7,8,9,10,12,13,15,16,17,18,19,20,21,23,25,26,29,31,34,35,36,37,38,39,40,41,42,43,44,45,47,50,51,52,53,54,55,56,57,58,60,62,66,68,70,71,72,73,75,76,77,78,79,80,82,84,85,88,89,90,91,92,94,95,96,98,99,100,101,102,103,104,106,108,109,112,113,115,118,123,124,125,126,129,134,137,139,140,141,145,148,149,150,151,152,154,155,159,163,165,166,167,168,170,172,174,175,176,177,178,179,180,181,182,183,184,],[22,-95,-58,-101,-93,-99,-97,22,-96,-51,-100,-23,22,-98,-103,-94,-49,22,-53,-62,22,22,-1,22,22,-63,22,22,22,22,22,22,22,22,22,22,22,-54,22,22,22,22,22,-102,-104,-110,22,22,22,-47,-46,-25,-3,-103,121,-43,-39,-24,-59,-52,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,22,-82,-80,22,-7,22,121,-38,-44,-40,-78,-79,-61,-81,-5,-4,-48,-36,-35,-45,-42,-56,-57,-88,-10,22,22,-23,-6,-21,-19,-8,-34,-2,-20,-9,-11,-12,-14,-16,-22,-13,-17,-18,-15,]),'COUNT':([2,9,16,21,26,29,34,35,37,38,39,40,41,42,43,44,45,47,50,52,53,54,55,56,62,66,68,104,109,113,155,159,],[14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,]),'END':([3,5,6,7,8,10,13,17,18,19,25,27,28,36,57,58,60,61,63,80,84,85,88,89,90,91,92,94,95,98,99,100,101,102,103,105,106,108,125,126,129,133,134,152,],[-95,-101,-93,-99,-97,-96,-100,-98,-103,-94,-62,60,-107,-63,-102,-104,-110,-108,-109,-59,-66,-74,-72,-65,-70,-67,-64,-60,-69,-71,-75,-73,-77,-76,-68,-105,-82,-80,-78,-79,-61,-106,-81,-88,]),'STRING':([2,9,16,21,26,29,34,35,37,38,39,40,41,42,43,44,45,47,50,52,53,54,55,56,62,66,68,97,104,109,113,153,155,159,],[10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,]),'IS':([3,5,6,7,8,10,13,17,18,19,23,25,33,36,57,58,59,60,69,80,84,85,87,88,89,90,91,92,94,95,98,99,100,101,102,103,105,106,108,125,126,129,133,134,135,139,152,165,170,],[-95,-101,-93,-99,-97,-96,-100,-98,-103,-94,46,-62,46,46,-102,-104,46,-110,46,-59,-66,-74,46,-72,-65,-70,-67,-64,-60,-69,-71,46,-73,-77,46,-68,46,-82,-80,-78,-79,-61,46,-81,46,46,-88,46,46,]),'EQUALS':([3,5,6,7,8,10,13,17,18,19,23,25,33,36,57,58,59,60,69,80,84,85,87,88,89,90,91,92,94,95,98,99,100,101,102,103,105,106,108,125,126,129,133,134,135,139,152,165,170,],[-95,-101,-93,-99,-97,-96,-100,-98,-103,-94,47,-62,47,47,-102,-104,47,-110,47,-59,-66,-74,47,-72,-65,-70,-67,-64,-60,-69,-71,47,-73,-77,47,-68,47,-82,-80,-78,-79,-61,47,-81,47,47,-88,47,47,]),'ELSE':([3,5,6,7,8,10,13,17,18,19,25,27,28,36,57,58,60,61,63,80,84,85,88,89,90,91,92,94,95,98,99,100,101,102,103,105,106,108,125,126,129,133,134,152,],[-95,-101,-93,-99,-97,-96,-100,-98,-103,-94,-62,62,-107,-63,-102,-104,-110,-108,62,-59,-66,-74,-72,-65,-70,-67,-64,-60,-69,-71,-75,-73,-77,-76,-68,-105,-82,-80,-78,-79,-61,-106,-81,-88,]),'COMMA':([3,4,5,6,7,8,10,12,13,15,17,18,19,20,23,25,29,31,34,35,36,37,51,57,58,60,66,67,69,70,71,72,73,75,76,77,78,79,80,81,82,83,84,85,88,89,90,91,92,94,95,96,98,99,100,101,102,103,106,107,108,112,115,118,123,124,125,126,129,131,132,134,135,137,139,140,141,145,148,149,150,151,152,154,162,163,165,166,167,168,170,172,174,175,176,177,178,179,180,181,182,183,184,],[-95,-58,-101,-93,-99,-97,-96,-51,-100,-23,-98,-103,-94,35,-53,-62,-85,-1,-85,-50,-63,-85,-54,-102,-104,-110,-85,109,-86,-47,-46,-25,-3,-103,-41,-43,124,-24,-59,109,-52,109,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,109,-80,-7,-37,-38,-44,-40,-78,-79,-61,153,-91,-81,-87,-5,-4,-48,-36,-35,-45,-42,-56,-57,-88,-10,-92,-23,-6,-21,174,-8,-34,-2,-20,-9,-11,181,-14,-16,-22,-13,-17,-18,-15,]),'AS':([3,4,5,6,7,8,10,12,13,15,17,18,19,20,23,25,31,35,36,51,57,58,60,70,71,72,73,75,76,77,78,79,80,82,84,85,86,87,88,89,90,91,92,94,95,96,98,99,100,101,102,103,106,108,112,115,118,123,124,125,126,129,134,137,139,140,141,145,148,149,150,151,152,154,163,165,166,167,168,170,172,174,175,176,177,178,179,180,181,182,183,184,],[-95,-58,-101,-93,-99,-97,-96,-51,-100,-23,-98,-103,-94,-49,48,-62,-1,-50,-63,-54,-102,-104,-110,-47,-46,-25,-3,-103,-41,122,-39,-24,-59,-52,-66,-74,127,128,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,-80,-7,-37,-38,-44,-40,-78,-79,-61,-81,-5,-4,-48,-36,-35,-45,-42,-56,-57,-88,-10,-23,-6,-21,-19,-8,-34,-2,-20,-9,-11,-12,-14,-16,-22,-13,-17,-18,-15,]),'LPAREN':([2,9,14,16,18,21,22,26,29,30,34,35,37,38,39,40,41,42,43,44,45,47,49,50,52,53,54,55,56,62,66,68,74,104,109,113,116,119,120,124,142,143,146,155,158,159,160,161,171,],[16,16,29,16,34,16,37,16,68,74,16,16,16,16,16,16,16,16,16,16,16,16,97,16,16,16,16,16,16,16,16,68,74,16,16,16,-30,74,74,74,-31,-32,-28,16,-33,16,-29,-26,-27,]),'IN':([3,5,6,7,8,10,13,17,18,19,23,25,33,36,57,58,59,60,69,80,84,85,87,88,89,90,91,92,94,95,98,99,100,101,102,103,105,106,108,125,126,129,133,134,135,139,152,165,170,],[-95,-101,-93,-99,-97,-96,-100,-98,-103,-94,49,49,49,49,-102,-104,49,-110,49,-59,-66,49,49,49,49,49,-67,49,-60,49,49,49,49,-77,49,-68,49,-82,-80,-78,-79,-61,49,-81,49,49,-88,49,49,]),'GREATER_THAN':([3,5,6,7,8,10,13,17,18,19,23,25,33,36,57,58,59,60,69,80,84,85,87,88,89,90,91,92,94,95,98,99,100,101,102,103,105,106,108,125,126,129,133,134,135,139,152,165,170,],[-95,-101,-93,-99,-97,-96,-100,-98,-103,-94,50,-62,50,50,-102,-104,50,-110,50,-59,-66,-74,50,-72,-65,-70,-67,-64,-60,-69,-71,50,-73,-77,50,-68,50,-82,-80,-78,-79,-61,50,-81,50,50,-88,50,50,]),'JOIN':([3,4,5,6,7,8,10,12,13,15,17,18,19,20,23,25,31,35,36,51,57,58,60,70,71,72,73,75,76,77,78,79,80,82,84,85,88,89,90,91,92,94,95,96,98,99,100,101,102,103,106,108,112,115,117,118,121,123,124,125,126,129,134,137,139,140,141,145,147,148,149,150,151,152,154,163,165,166,167,168,170,172,174,175,176,177,178,179,180,181,182,183,184,],[-95,-58,-101,-93,-99,-97,-96,-51,-100,-23,-98,-103,-94,-49,-53,-62,-1,-50,-63,-54,-102,-104,-110,-47,-46,-25,-3,-103,116,-43,-39,-24,-59,-52,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,-80,-7,116,143,-38,146,-44,-40,-78,-79,-61,-81,-5,-4,-48,-36,-35,161,-45,-42,-56,-57,-88,-10,-23,-6,-21,-19,-8,-34,-2,-20,-9,-11,-12,-14,-16,-22,-13,-17,-18,-15,]),'WHERE':([3,4,5,6,7,8,10,12,13,15,17,18,19,20,23,25,31,35,36,51,57,58,60,70,71,72,73,75,76,77,78,79,80,82,84,85,88,89,90,91,92,94,95,96,98,99,100,101,102,103,106,108,112,115,118,123,124,125,126,129,134,137,139,140,141,145,148,149,150,151,152,154,163,165,166,167,168,170,172,174,175,176,177,178,179,180,181,182,183,184,],[-95,-58,-101,-93,-99,-97,-96,-51,-100,-23,-98,-103,-94,-49,-53,-62,-1,-50,-63,-54,-102,-104,-110,-47,-46,-25,113,-103,-41,-43,-39,-24,-59,-52,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,-80,-7,-37,-38,-44,-40,-78,-79,-61,-81,-5,-4,-48,-36,-35,-45,-42,-56,-57,-88,-10,-23,-6,-21,-19,-8,-34,-2,-20,-9,-11,-12,-14,-16,-22,-13,-17,-18,-15,]),'ID':([2,3,4,5,6,7,8,9,10,12,13,15,16,17,18,19,20,21,23,24,25,26,29,30,31,34,35,36,37,38,39,40,41,42,43,44,45,47,48,50,51,52,53,54,55,56,57,58,60,62,66,68,70,71,72,73,74,75,76,77,78,79,80,82,84,85,88,89,90,91,92,94,95,96,98,99,100,101,102,103,104,106,108,109,111,112,113,115,116,118,119,120,122,123,124,125,126,127,128,129,134,137,139,140,141,142,143,145,146,148,149,150,151,152,154,155,156,158,159,160,161,163,165,166,167,168,169,170,171,172,173,174,175,176,177,178,179,180,181,182,183,184,],[18,-95,-58,-101,-93,-99,-97,18,-96,-51,-100,-23,18,-98,-103,-94,-49,18,51,58,-62,18,18,75,-1,18,18,-63,18,18,18,18,18,18,18,18,18,18,96,18,-54,18,18,18,18,18,-102,-104,-110,18,18,18,-47,-46,-25,-3,75,-103,-41,123,-39,-24,-59,-52,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,18,-82,-80,18,58,-7,18,-37,-30,-38,75,75,148,-44,75,-78,-79,150,151,-61,-81,-5,-4,-48,-36,-31,-32,-35,-28,-45,-42,-56,-57,-88,-10,18,75,-33,18,-29,-26,-23,-6,-21,-19,-8,75,-34,-27,-2,75,75,-9,-11,-12,-14,-16,-22,75,-17,-18,-15,]),'DESC':([5,57,58,75,179,],[-101,-102,-104,-103,183,]),'AND':([3,5,6,7,8,10,13,17,18,19,23,25,33,36,57,58,59,60,69,80,84,85,87,88,89,90,91,92,94,95,98,99,100,101,102,103,105,106,108,125,126,129,133,134,135,139,152,165,170,],[-95,-101,-93,-99,-97,-96,-100,-98,-103,-94,52,-62,52,52,-102,-104,52,-110,52,-59,-66,-74,52,-72,-65,-70,-67,-64,-60,-69,-71,-75,-73,-77,-76,-68,52,-82,-80,-78,-79,-61,52,-81,52,52,-88,52,52,]),'ON':([3,4,5,6,7,8,10,12,13,15,17,18,19,20,23,25,31,35,36,51,57,58,60,70,71,72,73,75,76,77,78,79,80,82,84,85,88,89,90,91,92,94,95,96,98,99,100,101,102,103,106,108,112,115,118,123,124,125,126,129,134,137,139,140,141,144,145,148,149,150,151,152,154,163,165,166,167,168,170,172,174,175,176,177,178,179,180,181,182,183,184,],[-95,-58,-101,-93,-99,-97,-96,-51,-100,-23,-98,-103,-94,-49,-53,-62,-1,-50,-63,-54,-102,-104,-110,-47,-46,-25,-3,-103,-41,-43,-39,-24,-59,-52,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,-80,-7,-37,-38,-44,-40,-78,-79,-61,-81,-5,-4,-48,-36,159,-35,-45,-42,-56,-57,-88,-10,-23,-6,-21,-19,-8,-34,-2,-20,-9,-11,-12,-14,-16,-22,-13,-17,-18,-15,]),'FALSE':([2,9,16,21,26,29,34,35,37,38,39,40,41,42,43,44,45,47,50,52,53,54,55,56,62,66,68,97,104,109,113,153,155,159,],[17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,]),'GREATER_THAN_OR_EQUAL':([3,5,6,7,8,10,13,17,18,19,23,25,33,36,57,58,59,60,69,80,84,85,87,88,89,90,91,92,94,95,98,99,100,101,102,103,105,106,108,125,126,129,133,134,135,139,152,165,170,],[-95,-101,-93,-99,-97,-96,-100,-98,-103,-94,53,-62,53,53,-102,-104,53,-110,53,-59,-66,-74,53,-72,-65,-70,-67,-64,-60,-69,-71,53,-73,-77,53,-68,53,-82,-80,-78,-79,-61,53,-81,53,53,-88,53,53,]),'FLOAT':([2,9,16,21,26,29,34,35,37,38,39,40,41,42,43,44,45,47,50,52,53,54,55,56,62,66,68,97,104,109,113,153,155,159,],[3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,]),'OR':([3,5,6,7,8,10,13,17,18,19,23,25,33,36,57,58,59,60,69,80,84,85,87,88,89,90,91,92,94,95,98,99,100,101,102,103,105,106,108,125,126,129,133,134,135,139,152,165,170,],[-95,-101,-93,-99,-97,-96,-100,-98,-103,-94,55,-62,55,55,-102,-104,55,-110,55,-59,-66,-74,55,-72,-65,-70,-67,-64,-60,-69,-71,-75,-73,-77,-76,-68,55,-82,-80,-78,-79,-61,55,-81,55,55,-88,55,55,]),'EACH':([116,138,143,146,161,],[142,157,158,160,171,]),'NOT':([2,9,16,21,26,29,34,35,37,38,39,40,41,42,43,44,45,46,47,50,52,53,54,55,56,62,66,68,104,109,113,155,159,],[21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,93,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,]),'$end':([1,3,4,5,6,7,8,10,12,13,15,17,18,19,20,23,25,31,35,36,51,57,58,60,70,71,72,73,75,76,77,78,79,80,82,84,85,88,89,90,91,92,94,95,96,98,99,100,101,102,103,106,108,112,115,118,123,124,125,126,129,134,137,139,140,141,145,148,149,150,151,152,154,163,165,166,167,168,170,172,174,175,176,177,178,179,180,181,182,183,184,],[0,-95,-58,-101,-93,-99,-97,-96,-51,-100,-23,-98,-103,-94,-49,-53,-62,-1,-50,-63,-54,-102,-104,-110,-47,-46,-25,-3,-103,-41,-43,-39,-24,-59,-52,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,-80,-7,-37,-38,-44,-40,-78,-79,-61,-81,-5,-4,-48,-36,-35,-45,-42,-56,-57,-88,-10,-23,-6,-21,-19,-8,-34,-2,-20,-9,-11,-12,-14,-16,-22,-13,-17,-18,-15,]),'OUTER':([121,],[147,]),'HAVING':([3,4,5,6,7,8,10,12,13,15,17,18,19,20,23,25,31,35,36,51,57,58,60,70,71,72,73,75,76,77,78,79,80,82,84,85,88,89,90,91,92,94,95,96,98,99,100,101,102,103,106,108,112,115,118,123,124,125,126,129,134,137,139,140,141,145,148,149,150,151,152,154,163,165,166,167,168,170,172,174,175,176,177,178,179,180,181,182,183,184,],[-95,-58,-101,-93,-99,-97,-96,-51,-100,-23,-98,-103,-94,-49,-53,-62,-1,-50,-63,-54,-102,-104,-110,-47,-46,-25,-3,-103,-41,-43,-39,-24,-59,-52,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,-80,-7,-37,-38,-44,-40,-78,-79,-61,-81,155,-4,-48,-36,-35,-45,-42,-56,-57,-88,-10,-23,-6,-21,-19,-8,-34,-2,-20,-9,-11,-12,-14,-16,-22,-13,-17,-18,-15,]),'MOD':([3,5,6,7,8,10,13,17,18,19,23,25,33,36,57,58,59,60,69,80,84,85,87,88,89,90,91,92,94,95,98,99,100,101,102,103,105,106,108,125,126,129,133,134,135,139,152,165,170,],[-95,-101,-93,-99,-97,-96,-100,-98,-103,-94,56,56,56,56,-102,-104,56,-110,56,-59,-66,56,56,56,56,56,-67,56,-60,56,56,56,56,-77,56,-68,56,-82,-80,-78,-79,-61,56,-81,56,56,-88,56,56,]),}
+_lr_action_items = {'THEN':([3,5,6,7,8,10,13,14,18,19,20,26,37,58,59,60,61,81,85,86,89,90,91,92,93,95,96,99,100,101,102,103,104,107,109,126,127,130,135,153,],[-95,-102,-93,-99,-97,-96,-100,-101,-98,-104,-94,-62,-63,-103,-105,105,-111,-59,-66,-74,-72,-65,-70,-67,-64,-60,-69,-71,-75,-73,-77,-76,-68,-82,-80,-78,-79,-61,-81,-88,]),'CONTAINS':([3,5,6,7,8,10,13,14,18,19,20,24,26,34,37,58,59,60,61,70,81,85,86,88,89,90,91,92,93,95,96,99,100,101,102,103,104,106,107,109,126,127,130,134,135,136,140,153,166,171,],[-95,-102,-93,-99,-97,-96,-100,-101,-98,-104,-94,55,55,55,55,-103,-105,55,-111,55,-59,-66,55,55,55,55,55,-67,55,-60,55,55,55,55,-77,55,-68,55,-82,-80,-78,-79,-61,55,-81,55,55,-88,55,55,]),'STAR':([2,3,5,6,7,8,10,13,14,18,19,20,24,25,26,30,34,36,37,58,59,60,61,69,70,81,85,86,88,89,90,91,92,93,95,96,99,100,101,102,103,104,106,107,109,126,127,130,134,135,136,140,153,166,171,],[4,-95,-102,-93,-99,-97,-96,-100,-101,-98,-104,-94,39,58,39,65,39,4,39,-103,-105,39,-111,65,39,-59,-66,39,39,39,39,39,-67,39,-60,39,39,39,39,-77,39,-68,39,-82,-80,-78,-79,-61,39,-81,39,39,-88,39,39,]),'LESS_THAN_OR_EQUAL':([3,5,6,7,8,10,13,14,18,19,20,24,26,34,37,58,59,60,61,70,81,85,86,88,89,90,91,92,93,95,96,99,100,101,102,103,104,106,107,109,126,127,130,134,135,136,140,153,166,171,],[-95,-102,-93,-99,-97,-96,-100,-101,-98,-104,-94,40,-62,40,40,-103,-105,40,-111,40,-59,-66,-74,40,-72,-65,-70,-67,-64,-60,-69,-71,40,-73,-77,40,-68,40,-82,-80,-78,-79,-61,40,-81,40,40,-88,40,40,]),'WITHIN':([3,5,6,7,8,10,13,14,18,19,20,24,26,37,58,59,61,81,85,86,89,90,91,92,93,95,96,99,100,101,102,103,104,107,109,126,127,130,135,153,],[-95,-102,-93,-99,-97,-96,-100,-101,-98,-104,-94,41,-62,-63,-103,-105,-111,-59,-66,-74,-72,-65,-70,-67,-64,-60,-69,-71,-75,-73,-77,-76,-68,-82,-80,-78,-79,-61,-81,-88,]),'CROSS':([3,4,5,6,7,8,10,12,13,14,16,18,19,20,21,24,26,32,36,37,52,58,59,61,71,72,73,74,76,77,78,79,80,81,83,85,86,89,90,91,92,93,95,96,97,99,100,101,102,103,104,107,109,113,116,119,124,125,126,127,130,135,138,140,141,142,146,149,150,151,152,153,155,164,166,167,168,169,171,173,175,176,177,178,179,180,181,182,183,184,185,],[-95,-58,-102,-93,-99,-97,-96,-51,-100,-101,-23,-98,-104,-94,-49,-53,-62,-1,-50,-63,-54,-103,-105,-111,-47,-46,-25,-3,-104,118,-43,-39,-24,-59,-52,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,-80,-7,118,-38,-44,-40,-78,-79,-61,-81,-5,-4,-48,-36,-35,-45,-42,-56,-57,-88,-10,-23,-6,-21,-19,-8,-34,-2,-20,-9,-11,-12,-14,-16,-22,-13,-17,-18,-15,]),'LIMIT':([3,4,5,6,7,8,10,12,13,14,16,18,19,20,21,24,26,32,36,37,52,58,59,61,71,72,73,74,76,77,78,79,80,81,83,85,86,89,90,91,92,93,95,96,97,99,100,101,102,103,104,107,109,113,116,119,124,125,126,127,130,135,138,140,141,142,146,149,150,151,152,153,155,164,166,167,168,169,171,173,175,176,177,178,179,180,181,182,183,184,185,],[-95,-58,-102,-93,-99,-97,-96,-51,-100,-101,33,-98,-104,-94,-49,-53,-62,-1,-50,-63,-54,-103,-105,-111,-47,-46,-25,-3,-104,-41,-43,-39,-24,-59,-52,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,-80,-7,-37,-38,-44,-40,-78,-79,-61,-81,-5,-4,-48,-36,-35,-45,-42,-56,-57,-88,-10,33,-6,-21,-19,-8,-34,-2,-20,-9,-11,-12,-14,-16,-22,-13,-17,-18,-15,]),'GROUP':([3,4,5,6,7,8,10,12,13,14,16,18,19,20,21,24,26,32,36,37,52,58,59,61,71,72,73,74,76,77,78,79,80,81,83,85,86,89,90,91,92,93,95,96,97,99,100,101,102,103,104,107,109,113,116,119,124,125,126,127,130,135,138,140,141,142,146,149,150,151,152,153,155,164,166,167,168,169,171,173,175,176,177,178,179,180,181,182,183,184,185,],[-95,-58,-102,-93,-99,-97,-96,-51,-100,-101,-23,-98,-104,-94,-49,-53,-62,-1,-50,-63,-54,-103,-105,-111,-47,-46,-25,-3,-104,-41,-43,-39,-24,-59,-52,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,-80,139,-37,-38,-44,-40,-78,-79,-61,-81,-5,-4,-48,-36,-35,-45,-42,-56,-57,-88,-10,-23,-6,-21,-19,-8,-34,-2,-20,-9,-11,-12,-14,-16,-22,-13,-17,-18,-15,]),'LESS_THAN':([3,5,6,7,8,10,13,14,18,19,20,24,26,34,37,58,59,60,61,70,81,85,86,88,89,90,91,92,93,95,96,99,100,101,102,103,104,106,107,109,126,127,130,134,135,136,140,153,166,171,],[-95,-102,-93,-99,-97,-96,-100,-101,-98,-104,-94,42,-62,42,42,-103,-105,42,-111,42,-59,-66,-74,42,-72,-65,-70,-67,-64,-60,-69,-71,42,-73,-77,42,-68,42,-82,-80,-78,-79,-61,42,-81,42,42,-88,42,42,]),'NULL':([2,9,17,22,27,30,35,36,38,39,40,41,42,43,44,45,46,47,48,51,53,54,55,56,57,63,67,69,94,98,105,110,114,154,156,160,],[7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,95,7,7,7,7,7,7,7,7,7,7,130,7,7,7,7,7,7,7,]),'TRUE':([2,9,17,22,27,30,35,36,38,39,40,41,42,43,44,45,46,48,51,53,54,55,56,57,63,67,69,98,105,110,114,154,156,160,],[8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,]),'MINUS':([2,3,5,6,7,8,9,10,13,14,17,18,19,20,22,24,26,27,30,34,35,36,37,38,39,40,41,42,43,44,45,46,48,51,53,54,55,56,57,58,59,60,61,63,67,69,70,81,85,86,88,89,90,91,92,93,95,96,99,100,101,102,103,104,105,106,107,109,110,114,126,127,130,134,135,136,140,153,156,160,166,171,],[9,-95,-102,-93,-99,-97,9,-96,-100,-101,9,-98,-104,-94,9,43,-62,9,9,43,9,9,43,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,-103,-105,43,-111,9,9,9,43,-59,-66,43,43,43,-65,43,-67,-64,-60,43,43,43,43,-77,43,-68,9,43,-82,-80,9,9,-78,-79,-61,43,-81,43,43,-88,9,9,43,43,]),'SELECT':([0,31,75,117,120,121,125,143,144,147,159,161,162,172,],[2,2,2,-30,2,2,2,-31,-32,-28,-33,-29,-26,-27,]),'CASE':([2,9,17,22,27,30,35,36,38,39,40,41,42,43,44,45,46,48,51,53,54,55,56,57,63,67,69,105,110,114,156,160,],[11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,]),'NOT_EQUAL':([3,5,6,7,8,10,13,14,18,19,20,24,26,34,37,58,59,60,61,70,81,85,86,88,89,90,91,92,93,95,96,99,100,101,102,103,104,106,107,109,126,127,130,134,135,136,140,153,166,171,],[-95,-102,-93,-99,-97,-96,-100,-101,-98,-104,-94,44,-62,44,44,-103,-105,44,-111,44,-59,-66,-74,44,-72,-65,-70,-67,-64,-60,-69,-71,44,-73,-77,44,-68,44,-82,-80,-78,-79,-61,44,-81,44,44,-88,44,44,]),'RPAREN':([3,4,5,6,7,8,10,12,13,14,16,18,19,20,21,24,26,30,32,34,35,36,37,38,52,58,59,61,65,66,67,68,70,71,72,73,74,76,77,78,79,80,81,82,83,84,85,86,89,90,91,92,93,95,96,97,99,100,101,102,103,104,107,108,109,111,113,115,116,119,124,125,126,127,130,131,132,133,135,136,137,138,140,141,142,146,149,150,151,152,153,154,155,163,164,166,167,168,169,171,173,175,176,177,178,179,180,181,182,183,184,185,],[-95,-58,-102,-93,-99,-97,-96,-51,-100,-101,-23,-98,-104,-94,-49,-53,-62,-85,-1,81,-85,-50,-63,-85,-54,-103,-105,-111,-83,107,-85,109,-86,-47,-46,-25,-3,-104,-41,-43,-39,-24,-59,126,-52,127,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,135,-80,137,-7,141,-37,-38,-44,-40,-78,-79,-61,153,-89,-91,-81,-87,-84,-5,-4,-48,-36,-35,-45,-42,-56,-57,-88,-90,-10,-92,-23,-6,-21,-19,-8,-34,-2,-20,-9,-11,-12,-14,-16,-22,-13,-17,-18,-15,]),'DISTINCT':([30,],[67,]),'PARAMETER':([2,9,17,22,27,30,35,36,38,39,40,41,42,43,44,45,46,48,51,53,54,55,56,57,63,67,69,98,105,110,114,154,156,160,],[13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,]),'WHEN':([3,5,6,7,8,10,11,13,14,18,19,20,26,29,37,58,59,61,81,85,86,89,90,91,92,93,95,96,99,100,101,102,103,104,107,109,126,127,130,134,135,153,],[-95,-102,-93,-99,-97,-96,27,-100,-101,-98,-104,-94,-62,27,-63,-103,-105,-111,-59,-66,-74,-72,-65,-70,-67,-64,-60,-69,-71,-75,-73,-77,-76,-68,-82,-80,-78,-79,-61,-107,-81,-88,]),'DIVIDED_BY':([3,5,6,7,8,10,13,14,18,19,20,24,26,34,37,58,59,60,61,70,81,85,86,88,89,90,91,92,93,95,96,99,100,101,102,103,104,106,107,109,126,127,130,134,135,136,140,153,166,171,],[-95,-102,-93,-99,-97,-96,-100,-101,-98,-104,-94,45,45,45,45,-103,-105,45,-111,45,-59,-66,45,45,45,45,45,-67,45,-60,45,45,45,45,-77,45,-68,45,-82,-80,-78,-79,-61,45,-81,45,45,-88,45,45,]),'ORDER':([3,4,5,6,7,8,10,12,13,14,16,18,19,20,21,24,26,32,36,37,52,58,59,61,71,72,73,74,76,77,78,79,80,81,83,85,86,89,90,91,92,93,95,96,97,99,100,101,102,103,104,107,109,113,116,119,124,125,126,127,130,135,138,140,141,142,146,149,150,151,152,153,155,164,166,167,168,169,171,173,175,176,177,178,179,180,181,182,183,184,185,],[-95,-58,-102,-93,-99,-97,-96,-51,-100,-101,-23,-98,-104,-94,-49,-53,-62,-1,-50,-63,-54,-103,-105,-111,-47,-46,-25,-3,-104,-41,-43,-39,-24,-59,-52,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,-80,-7,-37,-38,-44,-40,-78,-79,-61,-81,-5,-4,-48,-36,-35,-45,-42,-56,-57,-88,165,-23,-6,-21,-19,-8,-34,-2,-20,-9,-11,-12,-14,-16,-22,-13,-17,-18,-15,]),'ASC':([5,58,59,76,180,],[-102,-103,-105,-104,183,]),'RECORD':([41,],[87,]),'PLUS':([3,5,6,7,8,10,13,14,18,19,20,24,26,34,37,58,59,60,61,70,81,85,86,88,89,90,91,92,93,95,96,99,100,101,102,103,104,106,107,109,126,127,130,134,135,136,140,153,166,171,],[-95,-102,-93,-99,-97,-96,-100,-101,-98,-104,-94,46,-62,46,46,-103,-105,46,-111,46,-59,-66,46,46,46,-65,46,-67,-64,-60,46,46,46,46,-77,46,-68,46,-82,-80,-78,-79,-61,46,-81,46,46,-88,46,46,]),'DOT':([5,19,59,72,76,],[25,-104,-105,112,-104,]),'FROM':([3,4,5,6,7,8,10,12,13,14,16,18,19,20,21,24,26,36,37,52,58,59,61,81,83,85,86,89,90,91,92,93,95,96,97,99,100,101,102,103,104,107,109,126,127,130,135,151,152,153,],[-95,-58,-102,-93,-99,-97,-96,-51,-100,-101,31,-98,-104,-94,-49,-53,-62,-50,-63,-54,-103,-105,-111,-59,-52,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,-80,-78,-79,-61,-81,-56,-57,-88,]),'INTEGER':([2,9,17,22,27,30,33,35,36,38,39,40,41,42,43,44,45,46,48,51,53,54,55,56,57,63,67,69,98,105,110,114,154,156,160,],[20,20,20,20,20,20,80,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,]),'BY':([139,158,165,],[157,170,174,]),'LEFT':([2,3,4,5,6,7,8,9,10,12,13,14,16,17,18,19,20,21,22,24,26,27,30,32,35,36,37,38,39,40,41,42,43,44,45,46,48,51,52,53,54,55,56,57,58,59,61,63,67,69,71,72,73,74,76,77,78,79,80,81,83,85,86,89,90,91,92,93,95,96,97,99,100,101,102,103,104,105,107,109,110,113,114,116,119,124,125,126,127,130,135,138,140,141,142,146,149,150,151,152,153,155,156,160,164,166,167,168,169,171,173,175,176,177,178,179,180,181,182,183,184,185,],[23,-95,-58,-102,-93,-99,-97,23,-96,-51,-100,-101,-23,23,-98,-104,-94,-49,23,-53,-62,23,23,-1,23,23,-63,23,23,23,23,23,23,23,23,23,23,23,-54,23,23,23,23,23,-103,-105,-111,23,23,23,-47,-46,-25,-3,-104,122,-43,-39,-24,-59,-52,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,23,-82,-80,23,-7,23,122,-38,-44,-40,-78,-79,-61,-81,-5,-4,-48,-36,-35,-45,-42,-56,-57,-88,-10,23,23,-23,-6,-21,-19,-8,-34,-2,-20,-9,-11,-12,-14,-16,-22,-13,-17,-18,-15,]),'COUNT':([2,9,17,22,27,30,35,36,38,39,40,41,42,43,44,45,46,48,51,53,54,55,56,57,63,67,69,105,110,114,156,160,],[15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,]),'END':([3,5,6,7,8,10,13,14,18,19,20,26,28,29,37,58,59,61,62,64,81,85,86,89,90,91,92,93,95,96,99,100,101,102,103,104,106,107,109,126,127,130,134,135,153,],[-95,-102,-93,-99,-97,-96,-100,-101,-98,-104,-94,-62,61,-108,-63,-103,-105,-111,-109,-110,-59,-66,-74,-72,-65,-70,-67,-64,-60,-69,-71,-75,-73,-77,-76,-68,-106,-82,-80,-78,-79,-61,-107,-81,-88,]),'STRING':([2,9,17,22,27,30,35,36,38,39,40,41,42,43,44,45,46,48,51,53,54,55,56,57,63,67,69,98,105,110,114,154,156,160,],[10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,]),'IS':([3,5,6,7,8,10,13,14,18,19,20,24,26,34,37,58,59,60,61,70,81,85,86,88,89,90,91,92,93,95,96,99,100,101,102,103,104,106,107,109,126,127,130,134,135,136,140,153,166,171,],[-95,-102,-93,-99,-97,-96,-100,-101,-98,-104,-94,47,-62,47,47,-103,-105,47,-111,47,-59,-66,-74,47,-72,-65,-70,-67,-64,-60,-69,-71,47,-73,-77,47,-68,47,-82,-80,-78,-79,-61,47,-81,47,47,-88,47,47,]),'EQUALS':([3,5,6,7,8,10,13,14,18,19,20,24,26,34,37,58,59,60,61,70,81,85,86,88,89,90,91,92,93,95,96,99,100,101,102,103,104,106,107,109,126,127,130,134,135,136,140,153,166,171,],[-95,-102,-93,-99,-97,-96,-100,-101,-98,-104,-94,48,-62,48,48,-103,-105,48,-111,48,-59,-66,-74,48,-72,-65,-70,-67,-64,-60,-69,-71,48,-73,-77,48,-68,48,-82,-80,-78,-79,-61,48,-81,48,48,-88,48,48,]),'ELSE':([3,5,6,7,8,10,13,14,18,19,20,26,28,29,37,58,59,61,62,64,81,85,86,89,90,91,92,93,95,96,99,100,101,102,103,104,106,107,109,126,127,130,134,135,153,],[-95,-102,-93,-99,-97,-96,-100,-101,-98,-104,-94,-62,63,-108,-63,-103,-105,-111,-109,63,-59,-66,-74,-72,-65,-70,-67,-64,-60,-69,-71,-75,-73,-77,-76,-68,-106,-82,-80,-78,-79,-61,-107,-81,-88,]),'COMMA':([3,4,5,6,7,8,10,12,13,14,16,18,19,20,21,24,26,30,32,35,36,37,38,52,58,59,61,67,68,70,71,72,73,74,76,77,78,79,80,81,82,83,84,85,86,89,90,91,92,93,95,96,97,99,100,101,102,103,104,107,108,109,113,116,119,124,125,126,127,130,132,133,135,136,138,140,141,142,146,149,150,151,152,153,155,163,164,166,167,168,169,171,173,175,176,177,178,179,180,181,182,183,184,185,],[-95,-58,-102,-93,-99,-97,-96,-51,-100,-101,-23,-98,-104,-94,36,-53,-62,-85,-1,-85,-50,-63,-85,-54,-103,-105,-111,-85,110,-86,-47,-46,-25,-3,-104,-41,-43,125,-24,-59,110,-52,110,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,110,-80,-7,-37,-38,-44,-40,-78,-79,-61,154,-91,-81,-87,-5,-4,-48,-36,-35,-45,-42,-56,-57,-88,-10,-92,-23,-6,-21,175,-8,-34,-2,-20,-9,-11,182,-14,-16,-22,-13,-17,-18,-15,]),'AS':([3,4,5,6,7,8,10,12,13,14,16,18,19,20,21,24,26,32,36,37,52,58,59,61,71,72,73,74,76,77,78,79,80,81,83,85,86,87,88,89,90,91,92,93,95,96,97,99,100,101,102,103,104,107,109,113,116,119,124,125,126,127,130,135,138,140,141,142,146,149,150,151,152,153,155,164,166,167,168,169,171,173,175,176,177,178,179,180,181,182,183,184,185,],[-95,-58,-102,-93,-99,-97,-96,-51,-100,-101,-23,-98,-104,-94,-49,49,-62,-1,-50,-63,-54,-103,-105,-111,-47,-46,-25,-3,-104,-41,123,-39,-24,-59,-52,-66,-74,128,129,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,-80,-7,-37,-38,-44,-40,-78,-79,-61,-81,-5,-4,-48,-36,-35,-45,-42,-56,-57,-88,-10,-23,-6,-21,-19,-8,-34,-2,-20,-9,-11,-12,-14,-16,-22,-13,-17,-18,-15,]),'LPAREN':([2,9,15,17,19,22,23,27,30,31,35,36,38,39,40,41,42,43,44,45,46,48,50,51,53,54,55,56,57,63,67,69,75,105,110,114,117,120,121,125,143,144,147,156,159,160,161,162,172,],[17,17,30,17,35,17,38,17,69,75,17,17,17,17,17,17,17,17,17,17,17,17,98,17,17,17,17,17,17,17,17,69,75,17,17,17,-30,75,75,75,-31,-32,-28,17,-33,17,-29,-26,-27,]),'IN':([3,5,6,7,8,10,13,14,18,19,20,24,26,34,37,58,59,60,61,70,81,85,86,88,89,90,91,92,93,95,96,99,100,101,102,103,104,106,107,109,126,127,130,134,135,136,140,153,166,171,],[-95,-102,-93,-99,-97,-96,-100,-101,-98,-104,-94,50,50,50,50,-103,-105,50,-111,50,-59,-66,50,50,50,50,50,-67,50,-60,50,50,50,50,-77,50,-68,50,-82,-80,-78,-79,-61,50,-81,50,50,-88,50,50,]),'GREATER_THAN':([3,5,6,7,8,10,13,14,18,19,20,24,26,34,37,58,59,60,61,70,81,85,86,88,89,90,91,92,93,95,96,99,100,101,102,103,104,106,107,109,126,127,130,134,135,136,140,153,166,171,],[-95,-102,-93,-99,-97,-96,-100,-101,-98,-104,-94,51,-62,51,51,-103,-105,51,-111,51,-59,-66,-74,51,-72,-65,-70,-67,-64,-60,-69,-71,51,-73,-77,51,-68,51,-82,-80,-78,-79,-61,51,-81,51,51,-88,51,51,]),'JOIN':([3,4,5,6,7,8,10,12,13,14,16,18,19,20,21,24,26,32,36,37,52,58,59,61,71,72,73,74,76,77,78,79,80,81,83,85,86,89,90,91,92,93,95,96,97,99,100,101,102,103,104,107,109,113,116,118,119,122,124,125,126,127,130,135,138,140,141,142,146,148,149,150,151,152,153,155,164,166,167,168,169,171,173,175,176,177,178,179,180,181,182,183,184,185,],[-95,-58,-102,-93,-99,-97,-96,-51,-100,-101,-23,-98,-104,-94,-49,-53,-62,-1,-50,-63,-54,-103,-105,-111,-47,-46,-25,-3,-104,117,-43,-39,-24,-59,-52,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,-80,-7,117,144,-38,147,-44,-40,-78,-79,-61,-81,-5,-4,-48,-36,-35,162,-45,-42,-56,-57,-88,-10,-23,-6,-21,-19,-8,-34,-2,-20,-9,-11,-12,-14,-16,-22,-13,-17,-18,-15,]),'WHERE':([3,4,5,6,7,8,10,12,13,14,16,18,19,20,21,24,26,32,36,37,52,58,59,61,71,72,73,74,76,77,78,79,80,81,83,85,86,89,90,91,92,93,95,96,97,99,100,101,102,103,104,107,109,113,116,119,124,125,126,127,130,135,138,140,141,142,146,149,150,151,152,153,155,164,166,167,168,169,171,173,175,176,177,178,179,180,181,182,183,184,185,],[-95,-58,-102,-93,-99,-97,-96,-51,-100,-101,-23,-98,-104,-94,-49,-53,-62,-1,-50,-63,-54,-103,-105,-111,-47,-46,-25,114,-104,-41,-43,-39,-24,-59,-52,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,-80,-7,-37,-38,-44,-40,-78,-79,-61,-81,-5,-4,-48,-36,-35,-45,-42,-56,-57,-88,-10,-23,-6,-21,-19,-8,-34,-2,-20,-9,-11,-12,-14,-16,-22,-13,-17,-18,-15,]),'ID':([2,3,4,5,6,7,8,9,10,12,13,14,16,17,18,19,20,21,22,24,25,26,27,30,31,32,35,36,37,38,39,40,41,42,43,44,45,46,48,49,51,52,53,54,55,56,57,58,59,61,63,67,69,71,72,73,74,75,76,77,78,79,80,81,83,85,86,89,90,91,92,93,95,96,97,99,100,101,102,103,104,105,107,109,110,112,113,114,116,117,119,120,121,123,124,125,126,127,128,129,130,135,138,140,141,142,143,144,146,147,149,150,151,152,153,155,156,157,159,160,161,162,164,166,167,168,169,170,171,172,173,174,175,176,177,178,179,180,181,182,183,184,185,],[19,-95,-58,-102,-93,-99,-97,19,-96,-51,-100,-101,-23,19,-98,-104,-94,-49,19,52,59,-62,19,19,76,-1,19,19,-63,19,19,19,19,19,19,19,19,19,19,97,19,-54,19,19,19,19,19,-103,-105,-111,19,19,19,-47,-46,-25,-3,76,-104,-41,124,-39,-24,-59,-52,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,19,-82,-80,19,59,-7,19,-37,-30,-38,76,76,149,-44,76,-78,-79,151,152,-61,-81,-5,-4,-48,-36,-31,-32,-35,-28,-45,-42,-56,-57,-88,-10,19,76,-33,19,-29,-26,-23,-6,-21,-19,-8,76,-34,-27,-2,76,76,-9,-11,-12,-14,-16,-22,76,-17,-18,-15,]),'DESC':([5,58,59,76,180,],[-102,-103,-105,-104,184,]),'AND':([3,5,6,7,8,10,13,14,18,19,20,24,26,34,37,58,59,60,61,70,81,85,86,88,89,90,91,92,93,95,96,99,100,101,102,103,104,106,107,109,126,127,130,134,135,136,140,153,166,171,],[-95,-102,-93,-99,-97,-96,-100,-101,-98,-104,-94,53,-62,53,53,-103,-105,53,-111,53,-59,-66,-74,53,-72,-65,-70,-67,-64,-60,-69,-71,-75,-73,-77,-76,-68,53,-82,-80,-78,-79,-61,53,-81,53,53,-88,53,53,]),'ON':([3,4,5,6,7,8,10,12,13,14,16,18,19,20,21,24,26,32,36,37,52,58,59,61,71,72,73,74,76,77,78,79,80,81,83,85,86,89,90,91,92,93,95,96,97,99,100,101,102,103,104,107,109,113,116,119,124,125,126,127,130,135,138,140,141,142,145,146,149,150,151,152,153,155,164,166,167,168,169,171,173,175,176,177,178,179,180,181,182,183,184,185,],[-95,-58,-102,-93,-99,-97,-96,-51,-100,-101,-23,-98,-104,-94,-49,-53,-62,-1,-50,-63,-54,-103,-105,-111,-47,-46,-25,-3,-104,-41,-43,-39,-24,-59,-52,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,-80,-7,-37,-38,-44,-40,-78,-79,-61,-81,-5,-4,-48,-36,160,-35,-45,-42,-56,-57,-88,-10,-23,-6,-21,-19,-8,-34,-2,-20,-9,-11,-12,-14,-16,-22,-13,-17,-18,-15,]),'FALSE':([2,9,17,22,27,30,35,36,38,39,40,41,42,43,44,45,46,48,51,53,54,55,56,57,63,67,69,98,105,110,114,154,156,160,],[18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,]),'GREATER_THAN_OR_EQUAL':([3,5,6,7,8,10,13,14,18,19,20,24,26,34,37,58,59,60,61,70,81,85,86,88,89,90,91,92,93,95,96,99,100,101,102,103,104,106,107,109,126,127,130,134,135,136,140,153,166,171,],[-95,-102,-93,-99,-97,-96,-100,-101,-98,-104,-94,54,-62,54,54,-103,-105,54,-111,54,-59,-66,-74,54,-72,-65,-70,-67,-64,-60,-69,-71,54,-73,-77,54,-68,54,-82,-80,-78,-79,-61,54,-81,54,54,-88,54,54,]),'FLOAT':([2,9,17,22,27,30,35,36,38,39,40,41,42,43,44,45,46,48,51,53,54,55,56,57,63,67,69,98,105,110,114,154,156,160,],[3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,]),'OR':([3,5,6,7,8,10,13,14,18,19,20,24,26,34,37,58,59,60,61,70,81,85,86,88,89,90,91,92,93,95,96,99,100,101,102,103,104,106,107,109,126,127,130,134,135,136,140,153,166,171,],[-95,-102,-93,-99,-97,-96,-100,-101,-98,-104,-94,56,-62,56,56,-103,-105,56,-111,56,-59,-66,-74,56,-72,-65,-70,-67,-64,-60,-69,-71,-75,-73,-77,-76,-68,56,-82,-80,-78,-79,-61,56,-81,56,56,-88,56,56,]),'EACH':([117,139,144,147,162,],[143,158,159,161,172,]),'NOT':([2,9,17,22,27,30,35,36,38,39,40,41,42,43,44,45,46,47,48,51,53,54,55,56,57,63,67,69,105,110,114,156,160,],[22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,94,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,]),'$end':([1,3,4,5,6,7,8,10,12,13,14,16,18,19,20,21,24,26,32,36,37,52,58,59,61,71,72,73,74,76,77,78,79,80,81,83,85,86,89,90,91,92,93,95,96,97,99,100,101,102,103,104,107,109,113,116,119,124,125,126,127,130,135,138,140,141,142,146,149,150,151,152,153,155,164,166,167,168,169,171,173,175,176,177,178,179,180,181,182,183,184,185,],[0,-95,-58,-102,-93,-99,-97,-96,-51,-100,-101,-23,-98,-104,-94,-49,-53,-62,-1,-50,-63,-54,-103,-105,-111,-47,-46,-25,-3,-104,-41,-43,-39,-24,-59,-52,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,-80,-7,-37,-38,-44,-40,-78,-79,-61,-81,-5,-4,-48,-36,-35,-45,-42,-56,-57,-88,-10,-23,-6,-21,-19,-8,-34,-2,-20,-9,-11,-12,-14,-16,-22,-13,-17,-18,-15,]),'OUTER':([122,],[148,]),'HAVING':([3,4,5,6,7,8,10,12,13,14,16,18,19,20,21,24,26,32,36,37,52,58,59,61,71,72,73,74,76,77,78,79,80,81,83,85,86,89,90,91,92,93,95,96,97,99,100,101,102,103,104,107,109,113,116,119,124,125,126,127,130,135,138,140,141,142,146,149,150,151,152,153,155,164,166,167,168,169,171,173,175,176,177,178,179,180,181,182,183,184,185,],[-95,-58,-102,-93,-99,-97,-96,-51,-100,-101,-23,-98,-104,-94,-49,-53,-62,-1,-50,-63,-54,-103,-105,-111,-47,-46,-25,-3,-104,-41,-43,-39,-24,-59,-52,-66,-74,-72,-65,-70,-67,-64,-60,-69,-55,-71,-75,-73,-77,-76,-68,-82,-80,-7,-37,-38,-44,-40,-78,-79,-61,-81,156,-4,-48,-36,-35,-45,-42,-56,-57,-88,-10,-23,-6,-21,-19,-8,-34,-2,-20,-9,-11,-12,-14,-16,-22,-13,-17,-18,-15,]),'MOD':([3,5,6,7,8,10,13,14,18,19,20,24,26,34,37,58,59,60,61,70,81,85,86,88,89,90,91,92,93,95,96,99,100,101,102,103,104,106,107,109,126,127,130,134,135,136,140,153,166,171,],[-95,-102,-93,-99,-97,-96,-100,-101,-98,-104,-94,57,57,57,57,-103,-105,57,-111,57,-59,-66,57,57,57,57,57,-67,57,-60,57,57,57,57,-77,57,-68,57,-82,-80,-78,-79,-61,57,-81,57,57,-88,57,57,]),}
 
-_lr_action = { }
+_lr_action = {}
 for _k, _v in _lr_action_items.items():
    for _x,_y in zip(_v[0],_v[1]):
-      if not _x in _lr_action:  _lr_action[_x] = { }
+      if not _x in _lr_action:  _lr_action[_x] = {}
       _lr_action[_x][_k] = _y
 del _lr_action_items
 
-_lr_goto_items = {'constant':([2,9,16,21,26,29,34,35,37,38,39,40,41,42,43,44,45,47,50,52,53,54,55,56,62,66,68,97,104,109,113,153,155,159,],[6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,132,6,6,6,162,6,6,]),'parenthesized_star':([29,68,],[65,110,]),'case_body':([11,28,],[27,63,]),'case_clause_when':([11,28,],[28,28,]),'column_id':([2,9,16,21,26,29,34,35,37,38,39,40,41,42,43,44,45,47,50,52,53,54,55,56,62,66,68,104,109,113,155,156,159,169,173,174,181,],[13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,166,13,166,179,180,179,]),'select':([0,30,74,119,120,124,],[1,70,70,70,70,70,]),'strict_order_by_list':([173,],[177,]),'select_field':([2,35,],[12,82,]),'optional_order_by':([154,],[163,]),'column_id_list':([156,169,],[168,175,]),'partial_join':([76,115,],[115,115,]),'ordering':([173,181,],[178,184,]),'optional_where':([73,],[112,]),'optional_having':([137,],[154,]),'id_component_list':([2,9,16,21,26,29,30,34,35,37,38,39,40,41,42,43,44,45,47,50,52,53,54,55,56,62,66,68,74,104,109,113,119,120,124,155,156,159,169,173,174,181,],[5,5,5,5,5,5,71,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,71,5,5,5,71,71,71,5,5,5,5,5,5,5,]),'join_tail':([76,115,],[118,141,]),'strict_constant_list':([97,],[131,]),'strict_column_id_list':([156,169,],[167,167,]),'arg_list':([29,34,37,66,],[67,81,83,107,]),'aliased_table_expr_list':([30,],[72,]),'order_by_list':([173,],[176,]),'optional_group_by':([112,],[137,]),'select_field_list':([2,],[15,]),'full_table_expr':([30,],[73,]),'cross_join':([76,115,],[120,120,]),'constant_list':([97,],[130,]),'optional_limit':([15,163,],[31,172,]),'aliased_table_expr':([30,119,120,124,],[76,144,145,149,]),'expression':([2,9,16,21,26,29,34,35,37,38,39,40,41,42,43,44,45,47,50,52,53,54,55,56,62,66,68,104,109,113,155,159,],[23,25,33,36,59,69,69,23,69,84,85,87,88,89,90,91,92,95,98,99,100,101,102,103,105,69,33,133,135,139,165,170,]),'case_clause_else':([27,63,],[61,61,]),'non_cross_join':([76,115,],[119,119,]),'strict_select_field_list':([2,],[20,]),'table_expr':([30,74,119,120,124,],[77,114,77,77,77,]),'strict_aliased_table_expr_list':([30,],[78,]),}
+_lr_goto_items = {'constant':([2,9,17,22,27,30,35,36,38,39,40,41,42,43,44,45,46,48,51,53,54,55,56,57,63,67,69,98,105,110,114,154,156,160,],[6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,133,6,6,6,163,6,6,]),'parenthesized_star':([30,69,],[66,111,]),'case_body':([11,29,],[28,64,]),'case_clause_when':([11,29,],[29,29,]),'column_id':([2,9,17,22,27,30,35,36,38,39,40,41,42,43,44,45,46,48,51,53,54,55,56,57,63,67,69,105,110,114,156,157,160,170,174,175,182,],[14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,167,14,167,180,181,180,]),'select':([0,31,75,120,121,125,],[1,71,71,71,71,71,]),'strict_order_by_list':([174,],[178,]),'select_field':([2,36,],[12,83,]),'optional_order_by':([155,],[164,]),'column_id_list':([157,170,],[169,176,]),'partial_join':([77,116,],[116,116,]),'ordering':([174,182,],[179,185,]),'optional_where':([74,],[113,]),'optional_having':([138,],[155,]),'id_component_list':([2,9,17,22,27,30,31,35,36,38,39,40,41,42,43,44,45,46,48,51,53,54,55,56,57,63,67,69,75,105,110,114,120,121,125,156,157,160,170,174,175,182,],[5,5,5,5,5,5,72,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,72,5,5,5,72,72,72,5,5,5,5,5,5,5,]),'join_tail':([77,116,],[119,142,]),'strict_constant_list':([98,],[132,]),'strict_column_id_list':([157,170,],[168,168,]),'arg_list':([30,35,38,67,],[68,82,84,108,]),'aliased_table_expr_list':([31,],[73,]),'order_by_list':([174,],[177,]),'optional_group_by':([113,],[138,]),'select_field_list':([2,],[16,]),'full_table_expr':([31,],[74,]),'cross_join':([77,116,],[121,121,]),'constant_list':([98,],[131,]),'optional_limit':([16,164,],[32,173,]),'aliased_table_expr':([31,120,121,125,],[77,145,146,150,]),'expression':([2,9,17,22,27,30,35,36,38,39,40,41,42,43,44,45,46,48,51,53,54,55,56,57,63,67,69,105,110,114,156,160,],[24,26,34,37,60,70,70,24,70,85,86,88,89,90,91,92,93,96,99,100,101,102,103,104,106,70,34,134,136,140,166,171,]),'case_clause_else':([28,64,],[62,62,]),'non_cross_join':([77,116,],[120,120,]),'strict_select_field_list':([2,],[21,]),'table_expr':([31,75,120,121,125,],[78,115,78,78,78,]),'strict_aliased_table_expr_list':([31,],[79,]),}
 
-_lr_goto = { }
+_lr_goto = {}
 for _k, _v in _lr_goto_items.items():
-   for _x,_y in zip(_v[0],_v[1]):
-       if not _x in _lr_goto: _lr_goto[_x] = { }
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
        _lr_goto[_x][_k] = _y
 del _lr_goto_items
 _lr_productions = [
   ("S' -> select","S'",1,None,None,None),
-  ('select -> SELECT select_field_list optional_limit','select',3,'p_select','parser.py',22),
-  ('select -> SELECT select_field_list FROM full_table_expr optional_where optional_group_by optional_having optional_order_by optional_limit','select',9,'p_select','parser.py',23),
-  ('optional_where -> <empty>','optional_where',0,'p_optional_where','parser.py',36),
-  ('optional_where -> WHERE expression','optional_where',2,'p_optional_where','parser.py',37),
-  ('optional_having -> <empty>','optional_having',0,'p_optional_having','parser.py',46),
-  ('optional_having -> HAVING expression','optional_having',2,'p_optional_having','parser.py',47),
-  ('optional_group_by -> <empty>','optional_group_by',0,'p_optional_group_by','parser.py',56),
-  ('optional_group_by -> GROUP BY column_id_list','optional_group_by',3,'p_optional_group_by','parser.py',57),
-  ('optional_group_by -> GROUP EACH BY column_id_list','optional_group_by',4,'p_optional_group_by','parser.py',58),
-  ('optional_order_by -> <empty>','optional_order_by',0,'p_optional_order_by','parser.py',67),
-  ('optional_order_by -> ORDER BY order_by_list','optional_order_by',3,'p_optional_order_by','parser.py',68),
-  ('order_by_list -> strict_order_by_list','order_by_list',1,'p_order_by_list','parser.py',76),
-  ('order_by_list -> strict_order_by_list COMMA','order_by_list',2,'p_order_by_list','parser.py',77),
-  ('strict_order_by_list -> ordering','strict_order_by_list',1,'p_strict_order_by_list','parser.py',82),
-  ('strict_order_by_list -> strict_order_by_list COMMA ordering','strict_order_by_list',3,'p_strict_order_by_list','parser.py',83),
-  ('ordering -> column_id','ordering',1,'p_ordering_asc','parser.py',92),
-  ('ordering -> column_id ASC','ordering',2,'p_ordering_asc','parser.py',93),
-  ('ordering -> column_id DESC','ordering',2,'p_ordering_desc','parser.py',98),
-  ('column_id_list -> strict_column_id_list','column_id_list',1,'p_column_id_list','parser.py',103),
-  ('column_id_list -> strict_column_id_list COMMA','column_id_list',2,'p_column_id_list','parser.py',104),
-  ('strict_column_id_list -> column_id','strict_column_id_list',1,'p_strict_column_id_list','parser.py',109),
-  ('strict_column_id_list -> strict_column_id_list COMMA column_id','strict_column_id_list',3,'p_strict_column_id_list','parser.py',110),
-  ('optional_limit -> <empty>','optional_limit',0,'p_optional_limit','parser.py',120),
-  ('optional_limit -> LIMIT INTEGER','optional_limit',2,'p_optional_limit','parser.py',121),
-  ('full_table_expr -> aliased_table_expr_list','full_table_expr',1,'p_table_expr_table_or_union','parser.py',130),
-  ('non_cross_join -> LEFT OUTER JOIN','non_cross_join',3,'p_non_cross_join','parser.py',140),
-  ('non_cross_join -> LEFT OUTER JOIN EACH','non_cross_join',4,'p_non_cross_join','parser.py',141),
-  ('non_cross_join -> LEFT JOIN','non_cross_join',2,'p_non_cross_join','parser.py',142),
-  ('non_cross_join -> LEFT JOIN EACH','non_cross_join',3,'p_non_cross_join','parser.py',143),
-  ('non_cross_join -> JOIN','non_cross_join',1,'p_non_cross_join','parser.py',144),
-  ('non_cross_join -> JOIN EACH','non_cross_join',2,'p_non_cross_join','parser.py',145),
-  ('cross_join -> CROSS JOIN','cross_join',2,'p_cross_join','parser.py',154),
-  ('cross_join -> CROSS JOIN EACH','cross_join',3,'p_cross_join','parser.py',155),
-  ('partial_join -> non_cross_join aliased_table_expr ON expression','partial_join',4,'p_partial_join','parser.py',161),
-  ('partial_join -> cross_join aliased_table_expr','partial_join',2,'p_partial_join','parser.py',162),
-  ('join_tail -> partial_join join_tail','join_tail',2,'p_join_tail','parser.py',171),
-  ('join_tail -> partial_join','join_tail',1,'p_join_tail','parser.py',172),
-  ('full_table_expr -> aliased_table_expr join_tail','full_table_expr',2,'p_join','parser.py',182),
-  ('aliased_table_expr_list -> strict_aliased_table_expr_list','aliased_table_expr_list',1,'p_aliased_table_expr_list','parser.py',187),
-  ('aliased_table_expr_list -> strict_aliased_table_expr_list COMMA','aliased_table_expr_list',2,'p_aliased_table_expr_list','parser.py',188),
-  ('strict_aliased_table_expr_list -> aliased_table_expr','strict_aliased_table_expr_list',1,'p_strict_aliased_table_expr_list','parser.py',193),
-  ('strict_aliased_table_expr_list -> strict_aliased_table_expr_list COMMA aliased_table_expr','strict_aliased_table_expr_list',3,'p_strict_aliased_table_expr_list','parser.py',194),
-  ('aliased_table_expr -> table_expr','aliased_table_expr',1,'p_aliased_table_expr','parser.py',205),
-  ('aliased_table_expr -> table_expr ID','aliased_table_expr',2,'p_aliased_table_expr','parser.py',206),
-  ('aliased_table_expr -> table_expr AS ID','aliased_table_expr',3,'p_aliased_table_expr','parser.py',207),
-  ('table_expr -> id_component_list','table_expr',1,'p_table_id','parser.py',223),
-  ('table_expr -> select','table_expr',1,'p_select_table_expression','parser.py',228),
-  ('table_expr -> LPAREN table_expr RPAREN','table_expr',3,'p_table_expression_parens','parser.py',233),
-  ('select_field_list -> strict_select_field_list','select_field_list',1,'p_select_field_list','parser.py',238),
-  ('select_field_list -> strict_select_field_list COMMA','select_field_list',2,'p_select_field_list','parser.py',239),
-  ('strict_select_field_list -> select_field','strict_select_field_list',1,'p_strict_select_field_list','parser.py',244),
-  ('strict_select_field_list -> strict_select_field_list COMMA select_field','strict_select_field_list',3,'p_strict_select_field_list','parser.py',245),
-  ('select_field -> expression','select_field',1,'p_select_field','parser.py',255),
-  ('select_field -> expression ID','select_field',2,'p_select_field','parser.py',256),
-  ('select_field -> expression AS ID','select_field',3,'p_select_field','parser.py',257),
-  ('select_field -> expression WITHIN RECORD AS ID','select_field',5,'p_select_field','parser.py',258),
-  ('select_field -> expression WITHIN expression AS ID','select_field',5,'p_select_field','parser.py',259),
-  ('select_field -> STAR','select_field',1,'p_select_star','parser.py',277),
-  ('expression -> LPAREN expression RPAREN','expression',3,'p_expression_parens','parser.py',282),
-  ('expression -> expression IS NULL','expression',3,'p_expression_is_null','parser.py',287),
-  ('expression -> expression IS NOT NULL','expression',4,'p_expression_is_not_null','parser.py',292),
-  ('expression -> MINUS expression','expression',2,'p_expression_unary','parser.py',297),
-  ('expression -> NOT expression','expression',2,'p_expression_unary','parser.py',298),
-  ('expression -> expression PLUS expression','expression',3,'p_expression_binary','parser.py',304),
-  ('expression -> expression MINUS expression','expression',3,'p_expression_binary','parser.py',305),
-  ('expression -> expression STAR expression','expression',3,'p_expression_binary','parser.py',306),
-  ('expression -> expression DIVIDED_BY expression','expression',3,'p_expression_binary','parser.py',307),
-  ('expression -> expression MOD expression','expression',3,'p_expression_binary','parser.py',308),
-  ('expression -> expression EQUALS expression','expression',3,'p_expression_binary','parser.py',309),
-  ('expression -> expression NOT_EQUAL expression','expression',3,'p_expression_binary','parser.py',310),
-  ('expression -> expression GREATER_THAN expression','expression',3,'p_expression_binary','parser.py',311),
-  ('expression -> expression LESS_THAN expression','expression',3,'p_expression_binary','parser.py',312),
-  ('expression -> expression GREATER_THAN_OR_EQUAL expression','expression',3,'p_expression_binary','parser.py',313),
-  ('expression -> expression LESS_THAN_OR_EQUAL expression','expression',3,'p_expression_binary','parser.py',314),
-  ('expression -> expression AND expression','expression',3,'p_expression_binary','parser.py',315),
-  ('expression -> expression OR expression','expression',3,'p_expression_binary','parser.py',316),
-  ('expression -> expression CONTAINS expression','expression',3,'p_expression_binary','parser.py',317),
-  ('expression -> ID LPAREN arg_list RPAREN','expression',4,'p_expression_func_call','parser.py',323),
-  ('expression -> LEFT LPAREN arg_list RPAREN','expression',4,'p_expression_func_call','parser.py',324),
-  ('expression -> COUNT LPAREN arg_list RPAREN','expression',4,'p_expression_count','parser.py',332),
-  ('expression -> COUNT LPAREN DISTINCT arg_list RPAREN','expression',5,'p_expression_count_distinct','parser.py',337),
-  ('expression -> COUNT LPAREN parenthesized_star RPAREN','expression',4,'p_expression_count_star','parser.py',342),
-  ('parenthesized_star -> STAR','parenthesized_star',1,'p_parenthesized_star','parser.py',348),
-  ('parenthesized_star -> LPAREN parenthesized_star RPAREN','parenthesized_star',3,'p_parenthesized_star','parser.py',349),
-  ('arg_list -> <empty>','arg_list',0,'p_arg_list','parser.py',353),
-  ('arg_list -> expression','arg_list',1,'p_arg_list','parser.py',354),
-  ('arg_list -> arg_list COMMA expression','arg_list',3,'p_arg_list','parser.py',355),
-  ('expression -> expression IN LPAREN constant_list RPAREN','expression',5,'p_expression_in','parser.py',368),
-  ('constant_list -> strict_constant_list','constant_list',1,'p_constant_list','parser.py',373),
-  ('constant_list -> strict_constant_list COMMA','constant_list',2,'p_constant_list','parser.py',374),
-  ('strict_constant_list -> constant','strict_constant_list',1,'p_strict_constant_list','parser.py',379),
-  ('strict_constant_list -> strict_constant_list COMMA constant','strict_constant_list',3,'p_strict_constant_list','parser.py',380),
-  ('expression -> constant','expression',1,'p_expression_constant','parser.py',389),
-  ('constant -> INTEGER','constant',1,'p_int_literal','parser.py',394),
-  ('constant -> FLOAT','constant',1,'p_float_literal','parser.py',399),
-  ('constant -> STRING','constant',1,'p_string_literal','parser.py',404),
-  ('constant -> TRUE','constant',1,'p_true_literal','parser.py',409),
-  ('constant -> FALSE','constant',1,'p_false_literal','parser.py',414),
-  ('constant -> NULL','constant',1,'p_null_literal','parser.py',419),
-  ('expression -> column_id','expression',1,'p_expr_column_id','parser.py',424),
-  ('column_id -> id_component_list','column_id',1,'p_column_id','parser.py',429),
-  ('column_id -> id_component_list DOT STAR','column_id',3,'p_column_id','parser.py',430),
-  ('id_component_list -> ID','id_component_list',1,'p_id_component_list','parser.py',438),
-  ('id_component_list -> id_component_list DOT ID','id_component_list',3,'p_id_component_list','parser.py',439),
-  ('case_clause_else -> ELSE expression','case_clause_else',2,'p_case_clause_else','parser.py',447),
-  ('case_clause_when -> WHEN expression THEN expression','case_clause_when',4,'p_case_clause_when','parser.py',452),
-  ('case_body -> case_clause_when','case_body',1,'p_case_body','parser.py',457),
-  ('case_body -> case_body case_clause_else','case_body',2,'p_case_body','parser.py',458),
-  ('case_body -> case_clause_when case_body','case_body',2,'p_case_body','parser.py',459),
-  ('expression -> CASE case_body END','expression',3,'p_expression_case','parser.py',472),
+  ('select -> SELECT select_field_list optional_limit','select',3,'p_select','parser.py',24),
+  ('select -> SELECT select_field_list FROM full_table_expr optional_where optional_group_by optional_having optional_order_by optional_limit','select',9,'p_select','parser.py',25),
+  ('optional_where -> <empty>','optional_where',0,'p_optional_where','parser.py',38),
+  ('optional_where -> WHERE expression','optional_where',2,'p_optional_where','parser.py',39),
+  ('optional_having -> <empty>','optional_having',0,'p_optional_having','parser.py',48),
+  ('optional_having -> HAVING expression','optional_having',2,'p_optional_having','parser.py',49),
+  ('optional_group_by -> <empty>','optional_group_by',0,'p_optional_group_by','parser.py',58),
+  ('optional_group_by -> GROUP BY column_id_list','optional_group_by',3,'p_optional_group_by','parser.py',59),
+  ('optional_group_by -> GROUP EACH BY column_id_list','optional_group_by',4,'p_optional_group_by','parser.py',60),
+  ('optional_order_by -> <empty>','optional_order_by',0,'p_optional_order_by','parser.py',69),
+  ('optional_order_by -> ORDER BY order_by_list','optional_order_by',3,'p_optional_order_by','parser.py',70),
+  ('order_by_list -> strict_order_by_list','order_by_list',1,'p_order_by_list','parser.py',78),
+  ('order_by_list -> strict_order_by_list COMMA','order_by_list',2,'p_order_by_list','parser.py',79),
+  ('strict_order_by_list -> ordering','strict_order_by_list',1,'p_strict_order_by_list','parser.py',84),
+  ('strict_order_by_list -> strict_order_by_list COMMA ordering','strict_order_by_list',3,'p_strict_order_by_list','parser.py',85),
+  ('ordering -> column_id','ordering',1,'p_ordering_asc','parser.py',94),
+  ('ordering -> column_id ASC','ordering',2,'p_ordering_asc','parser.py',95),
+  ('ordering -> column_id DESC','ordering',2,'p_ordering_desc','parser.py',100),
+  ('column_id_list -> strict_column_id_list','column_id_list',1,'p_column_id_list','parser.py',105),
+  ('column_id_list -> strict_column_id_list COMMA','column_id_list',2,'p_column_id_list','parser.py',106),
+  ('strict_column_id_list -> column_id','strict_column_id_list',1,'p_strict_column_id_list','parser.py',111),
+  ('strict_column_id_list -> strict_column_id_list COMMA column_id','strict_column_id_list',3,'p_strict_column_id_list','parser.py',112),
+  ('optional_limit -> <empty>','optional_limit',0,'p_optional_limit','parser.py',122),
+  ('optional_limit -> LIMIT INTEGER','optional_limit',2,'p_optional_limit','parser.py',123),
+  ('full_table_expr -> aliased_table_expr_list','full_table_expr',1,'p_table_expr_table_or_union','parser.py',132),
+  ('non_cross_join -> LEFT OUTER JOIN','non_cross_join',3,'p_non_cross_join','parser.py',142),
+  ('non_cross_join -> LEFT OUTER JOIN EACH','non_cross_join',4,'p_non_cross_join','parser.py',143),
+  ('non_cross_join -> LEFT JOIN','non_cross_join',2,'p_non_cross_join','parser.py',144),
+  ('non_cross_join -> LEFT JOIN EACH','non_cross_join',3,'p_non_cross_join','parser.py',145),
+  ('non_cross_join -> JOIN','non_cross_join',1,'p_non_cross_join','parser.py',146),
+  ('non_cross_join -> JOIN EACH','non_cross_join',2,'p_non_cross_join','parser.py',147),
+  ('cross_join -> CROSS JOIN','cross_join',2,'p_cross_join','parser.py',156),
+  ('cross_join -> CROSS JOIN EACH','cross_join',3,'p_cross_join','parser.py',157),
+  ('partial_join -> non_cross_join aliased_table_expr ON expression','partial_join',4,'p_partial_join','parser.py',163),
+  ('partial_join -> cross_join aliased_table_expr','partial_join',2,'p_partial_join','parser.py',164),
+  ('join_tail -> partial_join join_tail','join_tail',2,'p_join_tail','parser.py',173),
+  ('join_tail -> partial_join','join_tail',1,'p_join_tail','parser.py',174),
+  ('full_table_expr -> aliased_table_expr join_tail','full_table_expr',2,'p_join','parser.py',184),
+  ('aliased_table_expr_list -> strict_aliased_table_expr_list','aliased_table_expr_list',1,'p_aliased_table_expr_list','parser.py',189),
+  ('aliased_table_expr_list -> strict_aliased_table_expr_list COMMA','aliased_table_expr_list',2,'p_aliased_table_expr_list','parser.py',190),
+  ('strict_aliased_table_expr_list -> aliased_table_expr','strict_aliased_table_expr_list',1,'p_strict_aliased_table_expr_list','parser.py',195),
+  ('strict_aliased_table_expr_list -> strict_aliased_table_expr_list COMMA aliased_table_expr','strict_aliased_table_expr_list',3,'p_strict_aliased_table_expr_list','parser.py',196),
+  ('aliased_table_expr -> table_expr','aliased_table_expr',1,'p_aliased_table_expr','parser.py',207),
+  ('aliased_table_expr -> table_expr ID','aliased_table_expr',2,'p_aliased_table_expr','parser.py',208),
+  ('aliased_table_expr -> table_expr AS ID','aliased_table_expr',3,'p_aliased_table_expr','parser.py',209),
+  ('table_expr -> id_component_list','table_expr',1,'p_table_id','parser.py',225),
+  ('table_expr -> select','table_expr',1,'p_select_table_expression','parser.py',230),
+  ('table_expr -> LPAREN table_expr RPAREN','table_expr',3,'p_table_expression_parens','parser.py',235),
+  ('select_field_list -> strict_select_field_list','select_field_list',1,'p_select_field_list','parser.py',240),
+  ('select_field_list -> strict_select_field_list COMMA','select_field_list',2,'p_select_field_list','parser.py',241),
+  ('strict_select_field_list -> select_field','strict_select_field_list',1,'p_strict_select_field_list','parser.py',246),
+  ('strict_select_field_list -> strict_select_field_list COMMA select_field','strict_select_field_list',3,'p_strict_select_field_list','parser.py',247),
+  ('select_field -> expression','select_field',1,'p_select_field','parser.py',257),
+  ('select_field -> expression ID','select_field',2,'p_select_field','parser.py',258),
+  ('select_field -> expression AS ID','select_field',3,'p_select_field','parser.py',259),
+  ('select_field -> expression WITHIN RECORD AS ID','select_field',5,'p_select_field','parser.py',260),
+  ('select_field -> expression WITHIN expression AS ID','select_field',5,'p_select_field','parser.py',261),
+  ('select_field -> STAR','select_field',1,'p_select_star','parser.py',279),
+  ('expression -> LPAREN expression RPAREN','expression',3,'p_expression_parens','parser.py',284),
+  ('expression -> expression IS NULL','expression',3,'p_expression_is_null','parser.py',289),
+  ('expression -> expression IS NOT NULL','expression',4,'p_expression_is_not_null','parser.py',294),
+  ('expression -> MINUS expression','expression',2,'p_expression_unary','parser.py',299),
+  ('expression -> NOT expression','expression',2,'p_expression_unary','parser.py',300),
+  ('expression -> expression PLUS expression','expression',3,'p_expression_binary','parser.py',306),
+  ('expression -> expression MINUS expression','expression',3,'p_expression_binary','parser.py',307),
+  ('expression -> expression STAR expression','expression',3,'p_expression_binary','parser.py',308),
+  ('expression -> expression DIVIDED_BY expression','expression',3,'p_expression_binary','parser.py',309),
+  ('expression -> expression MOD expression','expression',3,'p_expression_binary','parser.py',310),
+  ('expression -> expression EQUALS expression','expression',3,'p_expression_binary','parser.py',311),
+  ('expression -> expression NOT_EQUAL expression','expression',3,'p_expression_binary','parser.py',312),
+  ('expression -> expression GREATER_THAN expression','expression',3,'p_expression_binary','parser.py',313),
+  ('expression -> expression LESS_THAN expression','expression',3,'p_expression_binary','parser.py',314),
+  ('expression -> expression GREATER_THAN_OR_EQUAL expression','expression',3,'p_expression_binary','parser.py',315),
+  ('expression -> expression LESS_THAN_OR_EQUAL expression','expression',3,'p_expression_binary','parser.py',316),
+  ('expression -> expression AND expression','expression',3,'p_expression_binary','parser.py',317),
+  ('expression -> expression OR expression','expression',3,'p_expression_binary','parser.py',318),
+  ('expression -> expression CONTAINS expression','expression',3,'p_expression_binary','parser.py',319),
+  ('expression -> ID LPAREN arg_list RPAREN','expression',4,'p_expression_func_call','parser.py',325),
+  ('expression -> LEFT LPAREN arg_list RPAREN','expression',4,'p_expression_func_call','parser.py',326),
+  ('expression -> COUNT LPAREN arg_list RPAREN','expression',4,'p_expression_count','parser.py',334),
+  ('expression -> COUNT LPAREN DISTINCT arg_list RPAREN','expression',5,'p_expression_count_distinct','parser.py',339),
+  ('expression -> COUNT LPAREN parenthesized_star RPAREN','expression',4,'p_expression_count_star','parser.py',344),
+  ('parenthesized_star -> STAR','parenthesized_star',1,'p_parenthesized_star','parser.py',350),
+  ('parenthesized_star -> LPAREN parenthesized_star RPAREN','parenthesized_star',3,'p_parenthesized_star','parser.py',351),
+  ('arg_list -> <empty>','arg_list',0,'p_arg_list','parser.py',355),
+  ('arg_list -> expression','arg_list',1,'p_arg_list','parser.py',356),
+  ('arg_list -> arg_list COMMA expression','arg_list',3,'p_arg_list','parser.py',357),
+  ('expression -> expression IN LPAREN constant_list RPAREN','expression',5,'p_expression_in','parser.py',370),
+  ('constant_list -> strict_constant_list','constant_list',1,'p_constant_list','parser.py',375),
+  ('constant_list -> strict_constant_list COMMA','constant_list',2,'p_constant_list','parser.py',376),
+  ('strict_constant_list -> constant','strict_constant_list',1,'p_strict_constant_list','parser.py',381),
+  ('strict_constant_list -> strict_constant_list COMMA constant','strict_constant_list',3,'p_strict_constant_list','parser.py',382),
+  ('expression -> constant','expression',1,'p_expression_constant','parser.py',391),
+  ('constant -> INTEGER','constant',1,'p_int_literal','parser.py',396),
+  ('constant -> FLOAT','constant',1,'p_float_literal','parser.py',401),
+  ('constant -> STRING','constant',1,'p_string_literal','parser.py',406),
+  ('constant -> TRUE','constant',1,'p_true_literal','parser.py',411),
+  ('constant -> FALSE','constant',1,'p_false_literal','parser.py',416),
+  ('constant -> NULL','constant',1,'p_null_literal','parser.py',421),
+  ('constant -> PARAMETER','constant',1,'p_parameter','parser.py',426),
+  ('expression -> column_id','expression',1,'p_expr_column_id','parser.py',431),
+  ('column_id -> id_component_list','column_id',1,'p_column_id','parser.py',436),
+  ('column_id -> id_component_list DOT STAR','column_id',3,'p_column_id','parser.py',437),
+  ('id_component_list -> ID','id_component_list',1,'p_id_component_list','parser.py',445),
+  ('id_component_list -> id_component_list DOT ID','id_component_list',3,'p_id_component_list','parser.py',446),
+  ('case_clause_else -> ELSE expression','case_clause_else',2,'p_case_clause_else','parser.py',454),
+  ('case_clause_when -> WHEN expression THEN expression','case_clause_when',4,'p_case_clause_when','parser.py',459),
+  ('case_body -> case_clause_when','case_body',1,'p_case_body','parser.py',464),
+  ('case_body -> case_body case_clause_else','case_body',2,'p_case_body','parser.py',465),
+  ('case_body -> case_clause_when case_body','case_body',2,'p_case_body','parser.py',466),
+  ('expression -> CASE case_body END','expression',3,'p_expression_case','parser.py',479),
 ]
@@ -0,0 +1,252 @@
+"""Batch-at-a-time evaluation of queries.
+
+The Evaluator builds a whole Context for each step of a query. A Pipeline
+instead streams the rows of the query's tables through the WHERE clause, the
+select fields and the HAVING clause a batch of rows at a time, so a query that
+just filters and projects its tables only holds one batch of intermediate
+rows at a time, and the first batches of its result can be read before the
+rest of the query has run. A LIMIT stops reading the tables as soon as enough
+rows have come out.
+
+GROUP BY adds each batch to the aggregate states as it arrives, as long as
+every aggregate implements the accumulator protocol. The other steps that need
+all of their input at once (ORDER BY, joins other than cross joins, and
+grouping with other aggregates) collect the rows that passed the WHERE clause
+and use the Evaluator. Cross joins stream the pairs of rows of their inputs
+in batches, so the whole product is never built.
+"""
+import itertools
+
+import aggregation
+import context
+import evaluator
+import tq_ast
+import tq_modes
+
+
+# The most rows that are streamed through a query at a time.
+DEFAULT_BATCH_SIZE = 10000
+
+
+def context_batches(ctx, batch_size):
+    """Split a context into contexts with at most batch_size rows each.
+
+    An empty context gives a single empty batch, so there's always at least
+    one batch.
+    """
+    for start in xrange(0, max(ctx.num_rows, 1), batch_size):
+        yield context.slice_context(ctx, start,
+                                    min(start + batch_size, ctx.num_rows))
+
+
+def concatenate_batches(batches):
+    """Build a single context with all of the rows in some batches.
+
+    There must be at least one batch.
+    """
+    batches = iter(batches)
+    first_batch = next(batches)
+    result = None
+    for batch in batches:
+        if result is None:
+            result = context.empty_context_from_template(first_batch)
+            context.append_context_to_context(first_batch, result)
+        context.append_context_to_context(batch, result)
+    if result is None:
+        return first_batch
+    return result
+
+
+class Pipeline(object):
+    def __init__(self, select_evaluator, batch_size=DEFAULT_BATCH_SIZE):
+        """Create a pipeline.
+
+        Arguments:
+            select_evaluator: The Evaluator to evaluate expressions with, and
+                to evaluate the steps of a query that can't be streamed.
+            batch_size: The most rows to stream through a query at a time.
+        """
+        self.evaluator = select_evaluator
+        self.batch_size = batch_size
+
+    def select_batches(self, select_ast):
+        """Evaluate a select, generating the result a batch at a time.
+
+        Yields Contexts with the result rows, in order. Every batch has at
+        least one row, except that an empty result gives a single empty
+        batch, so the result columns are always known.
+        """
+        empty_batch = None
+        found_rows = False
+        for batch in self.evaluate_select(select_ast):
+            if batch.num_rows > 0:
+                found_rows = True
+                yield context.gathered_context(batch)
+            elif empty_batch is None:
+                empty_batch = batch
+        if not found_rows:
+            yield context.gathered_context(empty_batch)
+
+    def evaluate_select(self, select_ast):
+        """Generate the result of a select in batches, some of them empty.
+
+        There's always at least one batch, and the columns of the batches may
+        be views of other contexts.
+        """
+        row_batches = self.filtered_batches(select_ast)
+        if select_ast.group_set is None and select_ast.orderings is None:
+            return self.project_batches(select_ast, row_batches)
+
+        result = None
+        if select_ast.group_set is not None and all(
+                select_field.within_clause is None
+                for select_field in select_ast.select_fields):
+            first_batch = next(row_batches)
+            row_batches = itertools.chain([first_batch], row_batches)
+            if self.can_accumulate(select_ast, first_batch):
+                result = self.accumulate_batches(select_ast, row_batches)
+        if result is None:
+            select_context = concatenate_batches(row_batches)
+            result = self.evaluator.evaluate_select_result(select_ast,
+                                                           select_context)
+        else:
+            select_context = None
+        result = self.evaluator.finish_select(select_ast, select_context,
+                                              result, lazy=True)
+        return context_batches(result, self.batch_size)
+
+    def filtered_batches(self, select_ast):
+        """Generate the batches of rows of a select that pass WHERE."""
+        for batch in self.table_batches(select_ast.table):
+            mask_column = self.evaluator.evaluate_expr(select_ast.where_expr,
+                                                       batch)
+            yield context.mask_context(batch, mask_column)
+
+    def project_batches(self, select_ast, row_batches):
+        """Evaluate the select fields and HAVING clause over each batch.
+
+        This is only valid for selects that don't group or order, since each
+        result row then only depends on one row of the table expression.
+        """
+        limit = select_ast.limit
+        if limit is not None:
+            limit = int(limit)
+        num_rows = 0
+        for batch in row_batches:
+            result = self.evaluator.evaluate_select_fields(
+                select_ast.select_fields, batch)
+            having_mask = self.evaluator.evaluate_expr(select_ast.having_expr,
+                                                       result)
+            result = context.mask_context(result, having_mask)
+            if limit is not None and num_rows + result.num_rows >= limit:
+                # Stop reading the input as soon as we have enough rows.
+                context.truncate_context(result, limit - num_rows)
+                yield result
+                return
+            num_rows += result.num_rows
+            yield result
+
+    def can_accumulate(self, select_ast, first_batch):
+        """Whether a grouped select can add rows to aggregate states.
+
+        The aggregates all need to implement the accumulator protocol, and
+        take arguments that aren't repeated, which we check on the first
+        batch.
+        """
+        aggregate_calls = self.evaluator.accumulated_aggregate_calls(
+            select_ast.select_fields, select_ast.group_set)
+        return aggregate_calls is not None and all(
+            self.evaluator.evaluate_expr(call.args[0], first_batch).mode !=
+            tq_modes.REPEATED
+            for call in aggregate_calls)
+
+    def accumulate_batches(self, select_ast, row_batches):
+        """Group the rows of a select as they arrive, a batch at a time.
+
+        Each batch is added to the aggregate states of its groups and then
+        dropped, so only the states need to be kept.
+
+        Returns:
+            A context with the result of the select fields, with a row for
+            each group.
+        """
+        select_fields = select_ast.select_fields
+        group_set = select_ast.group_set
+        aggregate_calls = self.evaluator.accumulated_aggregate_calls(
+            select_fields, group_set)
+        funcs = [call.func for call in aggregate_calls]
+        # The key columns of the first batch, for their names and types.
+        first_key_columns = []
+
+        def aggregation_batches():
+            first_row = 0
+            for batch in row_batches:
+                key_columns = self.evaluator.group_key_columns(
+                    select_fields, group_set, batch)
+                if not first_key_columns:
+                    first_key_columns.append(key_columns)
+                key_values = [column.values
+                              for column in key_columns.itervalues()]
+                arg_values = [
+                    self.evaluator.evaluate_expr(call.args[0], batch).values
+                    for call in aggregate_calls]
+                for aggregation_batch in evaluator.row_batches(
+                        key_values, arg_values, batch.num_rows, first_row):
+                    yield aggregation_batch
+                first_row += batch.num_rows
+
+        num_key_columns = (len(group_set.field_groups) +
+                           len(group_set.alias_groups))
+        _, group_keys, group_values = aggregation.aggregate_batches(
+            funcs, aggregation_batches(),
+            self.evaluator.max_aggregate_groups(num_key_columns, len(funcs)))
+        return self.evaluator.groups_result(
+            select_fields, group_set, first_key_columns[0], aggregate_calls,
+            group_keys, group_values)
+
+    def table_batches(self, table_expr):
+        """Generate the rows of a table expression in batches.
+
+        There's always at least one batch. Table expressions that can't be
+        streamed are evaluated all at once and then split into batches.
+        """
+        method = getattr(self, 'batches_' + table_expr.__class__.__name__,
+                         None)
+        if method is None:
+            return context_batches(
+                self.evaluator.evaluate_table_expr(table_expr),
+                self.batch_size)
+        return method(table_expr)
+
+    def batches_Table(self, table_expr):
+        return context_batches(self.evaluator.eval_table_Table(table_expr),
+                               self.batch_size)
+
+    def batches_TableUnion(self, table_expr):
+        for table in table_expr.tables:
+            for batch in self.table_batches(table):
+                result = context.empty_context_from_type_context(
+                    table_expr.type_ctx)
+                context.append_partial_context_to_context(batch, result)
+                yield result
+
+    def batches_Select(self, table_expr):
+        for batch in self.evaluate_select(table_expr):
+            yield context.context_with_overlayed_type_context(
+                batch, table_expr.type_ctx)
+
+    def batches_Join(self, table_expr):
+        if any(join_type is not tq_ast.JoinType.CROSS
+               for _, join_type in table_expr.tables):
+            for batch in context_batches(
+                    self.evaluator.evaluate_table_expr(table_expr),
+                    self.batch_size):
+                yield batch
+            return
+        input_contexts = self.evaluator.evaluate_table_exprs(
+            [table_expr.base] + [table for table, _ in table_expr.tables])
+        # Only the last cross join is streamed, since it's the biggest.
+        lhs_context = reduce(self.evaluator.cross_join, input_contexts[:-1])
+        for batch in context.cross_join_batches(
+                lhs_context, input_contexts[-1], self.batch_size):
+            yield self.evaluator.join_columns_in_order(table_expr, batch)
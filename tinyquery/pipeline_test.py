@@ -0,0 +1,110 @@
+import collections
+import unittest
+
+import mock
+
+import context
+import pipeline
+import tinyquery
+import tq_modes
+import tq_types
+
+
+class PipelineTest(unittest.TestCase):
+    def setUp(self):
+        self.tq = tinyquery.TinyQuery()
+        self.tq.load_table_or_view(self.make_table(
+            'test_table', range(20), [i % 3 for i in xrange(20)]))
+        self.tq.load_table_or_view(self.make_table(
+            'test_table_2', [1, 5, 7], [0, 1, None]))
+
+    @staticmethod
+    def make_table(name, vals, groups):
+        return tinyquery.Table(name, len(vals), collections.OrderedDict([
+            ('val', context.Column(type=tq_types.INT,
+                                   mode=tq_modes.NULLABLE, values=vals)),
+            ('grp', context.Column(type=tq_types.INT,
+                                   mode=tq_modes.NULLABLE, values=groups)),
+        ]))
+
+    def assert_batches_match_query(self, query, batch_size=3):
+        batches = list(self.tq.evaluate_query_batches(query,
+                                                      batch_size=batch_size))
+        self.assertEqual(self.tq.evaluate_query(query),
+                         pipeline.concatenate_batches(batches))
+        return batches
+
+    def test_filter_and_project(self):
+        batches = self.assert_batches_match_query(
+            'SELECT val * 2 AS double, grp FROM test_table WHERE grp != 1')
+        self.assertEqual([2, 2, 2, 2, 2, 2, 1],
+                         [batch.num_rows for batch in batches])
+        for batch in batches:
+            for column in batch.columns.itervalues():
+                self.assertIsInstance(column.values, list)
+
+    def test_group_by(self):
+        self.assert_batches_match_query(
+            'SELECT grp, SUM(val) AS total, COUNT(*) AS n '
+            'FROM test_table WHERE val > 2 GROUP BY grp HAVING n > 5')
+        self.assert_batches_match_query(
+            'SELECT SUM(val) FROM test_table WHERE val > 100')
+        # QUANTILES doesn't accumulate, so its rows are collected first.
+        self.assert_batches_match_query(
+            'SELECT grp, NTH(1, QUANTILES(val, 2)) AS q '
+            'FROM test_table GROUP BY grp')
+
+    def test_order_by(self):
+        batches = self.assert_batches_match_query(
+            'SELECT val FROM test_table WHERE grp = 0 '
+            'ORDER BY val DESC LIMIT 5')
+        self.assertEqual([3, 2], [batch.num_rows for batch in batches])
+
+    def test_union_join_and_subquery(self):
+        self.assert_batches_match_query(
+            'SELECT val, grp FROM test_table, test_table_2 WHERE val > 4')
+        self.assert_batches_match_query(
+            'SELECT t1.val, t2.val FROM test_table t1 '
+            'JOIN test_table_2 t2 ON t1.grp = t2.grp')
+        self.assert_batches_match_query(
+            'SELECT v FROM (SELECT val + 1 AS v FROM test_table) '
+            'WHERE v % 4 = 0')
+
+    def test_cross_join(self):
+        for batch_size in (1, 2, 3, 7):
+            batches = self.assert_batches_match_query(
+                'SELECT t1.val, t2.val FROM test_table_2 t1 '
+                'CROSS JOIN test_table t2 WHERE t2.val < 3', batch_size)
+            self.assertTrue(all(batch.num_rows <= batch_size
+                                for batch in batches))
+        self.assert_batches_match_query(
+            'SELECT t1.val, t2.grp, t3.val FROM test_table_2 t1 '
+            'CROSS JOIN test_table_2 t2 CROSS JOIN test_table t3')
+        self.assert_batches_match_query(
+            'SELECT t1.val, t2.val FROM test_table_2 t1 '
+            'CROSS JOIN (SELECT val FROM test_table WHERE val > 100) t2')
+
+    def test_empty_result(self):
+        batches = self.assert_batches_match_query(
+            'SELECT val FROM test_table WHERE val > 100')
+        self.assertEqual(1, len(batches))
+        self.assertEqual(0, batches[0].num_rows)
+
+    def test_limit_stops_reading_input(self):
+        with mock.patch.object(context, 'slice_context',
+                               wraps=context.slice_context) as slice_context:
+            batches = self.assert_batches_match_query(
+                'SELECT val FROM test_table LIMIT 4')
+        self.assertEqual([3, 1], [batch.num_rows for batch in batches])
+        # The pipeline only read two batches from the table (and
+        # evaluate_query read none).
+        self.assertEqual(2, slice_context.call_count)
+
+    def test_results_are_read_as_they_are_found(self):
+        batches = self.tq.evaluate_query_batches(
+            'SELECT val FROM test_table', batch_size=5)
+        with mock.patch.object(context, 'slice_context',
+                               wraps=context.slice_context) as slice_context:
+            self.assertEqual([0, 1, 2, 3, 4],
+                             next(batches).columns[(None, 'val')].values)
+        self.assertEqual(1, slice_context.call_count)
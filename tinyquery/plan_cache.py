@@ -0,0 +1,100 @@
+"""A cache of compiled query plans, keyed on the query text.
+
+Lexing, parsing and compiling a query is often more expensive than evaluating
+it against the small tables that tests typically use, and test suites tend to
+run the same handful of queries over and over. The plan cache lets repeated
+queries skip straight to evaluation.
+"""
+import collections
+import re
+
+
+DEFAULT_MAX_SIZE = 1024
+
+
+# Matches either a string literal (the lexer doesn't support escapes in them)
+# or a run of whitespace.
+_LITERAL_OR_WHITESPACE_RE = re.compile(r"('[^']*'|\"[^\"]*\")|\s+")
+_COMMENT_MARKERS = ('--', '#', '//')
+
+
+def normalize_query_text(text):
+    """Return a canonical form of the query to use as a cache key.
+
+    Runs of whitespace outside of string literals are collapsed to a single
+    space. Comments run until the end of the line, so collapsing newlines
+    could change the meaning of a query that has them; in that case we fall
+    back to the query text with only the surrounding whitespace stripped.
+    """
+    text = text.strip()
+    if any(marker in text for marker in _COMMENT_MARKERS):
+        return text
+    return _LITERAL_OR_WHITESPACE_RE.sub(
+        lambda match: match.group(1) or ' ', text)
+
+
+class PlanCache(object):
+    """An LRU cache of compiled typed_ast.Select objects.
+
+    Each entry remembers the version of every table and view that was read
+    while compiling it, and is only used while all of those versions are
+    still current. Versions are maintained by the TinyQuery service, which
+    bumps them whenever a table's schema may have changed.
+
+    Fields:
+        max_size: The maximum number of plans to keep.
+        hits: The number of lookups that found a usable plan.
+        misses: The number of lookups that didn't find a usable plan,
+            including ones where the plan was found but was out of date.
+    """
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        # Maps cache key to a (plan, table_versions) pair, with the most
+        # recently used entry last.
+        self._entries = collections.OrderedDict()
+
+    def get(self, key, current_versions):
+        """Return the cached plan for a key, or None if there isn't one.
+
+        Arguments:
+            key: The cache key, as used in put.
+            current_versions: A dict mapping table name to the current
+                version of that table.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        plan, table_versions = entry
+        if any(current_versions.get(name) != version
+               for name, version in table_versions.iteritems()):
+            # One of the tables changed, so the plan may be wrong. Drop it.
+            self.misses += 1
+            return None
+        self._entries[key] = entry
+        self.hits += 1
+        return plan
+
+    def put(self, key, plan, table_versions):
+        """Add a plan to the cache.
+
+        Arguments:
+            key: The cache key, usually the normalized query text.
+            plan: The compiled plan to cache.
+            table_versions: A dict mapping the name of each table the plan
+                depends on to the version it was compiled against.
+        """
+        if self.max_size <= 0:
+            return
+        self._entries.pop(key, None)
+        self._entries[key] = (plan, dict(table_versions))
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
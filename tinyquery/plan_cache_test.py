@@ -0,0 +1,60 @@
+import unittest
+
+import plan_cache
+
+
+class NormalizeQueryTextTest(unittest.TestCase):
+    def test_whitespace_collapsed(self):
+        self.assertEqual(
+            'SELECT a FROM t WHERE b = 1',
+            plan_cache.normalize_query_text(
+                '  SELECT a\n  FROM t\n\tWHERE   b = 1\n'))
+
+    def test_string_literals_preserved(self):
+        self.assertEqual(
+            "SELECT 'a   b' FROM t WHERE c = \"d\n e\"",
+            plan_cache.normalize_query_text(
+                "SELECT  'a   b'\nFROM t WHERE c = \"d\n e\""))
+
+    def test_comments_preserved(self):
+        query = 'SELECT a  -- the a column\nFROM t'
+        self.assertEqual(query, plan_cache.normalize_query_text(query))
+
+
+class PlanCacheTest(unittest.TestCase):
+    def test_hit_and_miss(self):
+        cache = plan_cache.PlanCache()
+        self.assertIsNone(cache.get('q', {'t': 1}))
+        cache.put('q', 'plan', {'t': 1})
+        self.assertEqual('plan', cache.get('q', {'t': 1}))
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(1, cache.misses)
+
+    def test_stale_version(self):
+        cache = plan_cache.PlanCache()
+        cache.put('q', 'plan', {'t': 1})
+        self.assertIsNone(cache.get('q', {'t': 2}))
+        # Stale entries are dropped.
+        self.assertEqual(0, len(cache))
+        self.assertIsNone(cache.get('q', {'t': 1}))
+
+    def test_deleted_table(self):
+        cache = plan_cache.PlanCache()
+        cache.put('q', 'plan', {'t': 1})
+        self.assertIsNone(cache.get('q', {}))
+
+    def test_evicts_least_recently_used(self):
+        cache = plan_cache.PlanCache(max_size=2)
+        cache.put('q1', 'plan1', {})
+        cache.put('q2', 'plan2', {})
+        cache.get('q1', {})
+        cache.put('q3', 'plan3', {})
+        self.assertEqual(2, len(cache))
+        self.assertEqual('plan1', cache.get('q1', {}))
+        self.assertIsNone(cache.get('q2', {}))
+        self.assertEqual('plan3', cache.get('q3', {}))
+
+    def test_disabled(self):
+        cache = plan_cache.PlanCache(max_size=0)
+        cache.put('q', 'plan', {})
+        self.assertIsNone(cache.get('q', {}))
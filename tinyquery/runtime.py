@@ -27,9 +27,36 @@ def pass_through_none(fn):
     return new_fn
 
 
+def map_pairs(func, values1, values2):
+    """Apply a binary function to two lists of values, passing through None.
+
+    If either list is a ConstantValues, its value is only read once.
+    """
+    if isinstance(values2, context.ConstantValues):
+        y = values2.value
+        if y is None:
+            return [None] * len(values1)
+        return [None if x is None else func(x, y) for x in values1]
+    elif isinstance(values1, context.ConstantValues):
+        x = values1.value
+        if x is None:
+            return [None] * len(values2)
+        return [None if y is None else func(x, y) for y in values2]
+    return [None if x is None or y is None else func(x, y)
+            for x, y in zip(values1, values2)]
+
+
 class Function(object):
     __metaclass__ = abc.ABCMeta
 
+    # Whether the function always gives the same result for the same
+    # arguments. Calls to deterministic functions with constant arguments can
+    # be computed once and reused.
+    is_deterministic = True
+    # Whether the function implements evaluate_conditionally, like the
+    # subclasses of ConditionalFunction.
+    is_conditional = False
+
     @abc.abstractmethod
     def check_types(self, *arg_types):
         """Return the type of the result as a function of the arg types.
@@ -65,10 +92,43 @@ class AggregateFunction(Function):
     """Represents a function doing some sort of aggregation.
 
     The function receives no special handling of repeated fields.
+
+    Single-argument aggregates can also implement the accumulator protocol,
+    which computes the aggregate from a partial state that values are added
+    to one at a time or in batches, rather than from a whole column. States
+    for different parts of the same rows can be merged, so rows can be
+    aggregated in any number of pieces. The state is an opaque value, and
+    the methods return a new state rather than modifying the one they are
+    given.
     """
+    # Whether the accumulator methods below are implemented.
+    accumulates = False
+
     def evaluate(self, num_rows, *args):
         return self._evaluate(num_rows, *args)
 
+    def initial_state(self):
+        """Return the state for an aggregate over no rows."""
+        raise NotImplementedError()
+
+    def add(self, state, value):
+        """Return the state after adding a single (non-repeated) value."""
+        raise NotImplementedError()
+
+    def update(self, state, values):
+        """Return the state after adding a list of values."""
+        for value in values:
+            state = self.add(state, value)
+        return state
+
+    def merge(self, state1, state2):
+        """Return the state for the values of both states."""
+        raise NotImplementedError()
+
+    def finalize(self, state):
+        """Return the value of the aggregate for a state."""
+        raise NotImplementedError()
+
 
 class ScalarFunction(Function):
     """Represents a function that operates on scalar values.
@@ -84,6 +144,18 @@ class ScalarFunction(Function):
     the output, and we need to unflatten the results.
     """
     def evaluate(self, num_rows, *args):
+        if (args and num_rows > 0 and self.is_deterministic and
+                all(isinstance(col.values, context.ConstantValues)
+                    for col in args)):
+            # Every row gets the same result, so only compute it once.
+            result = self._evaluate(1, *[
+                context.Column(type=col.type, mode=col.mode,
+                               values=[col.values.value])
+                for col in args])
+            return context.Column(
+                type=result.type, mode=result.mode,
+                values=context.ConstantValues(result.values[0], num_rows))
+
         repeated_columns = [
             col for col in args if col.mode == tq_modes.REPEATED]
         num_repeated_fields = len(repeated_columns)
@@ -144,6 +216,86 @@ class ScalarFunction(Function):
                               values=unflattened_values)
 
 
+class ConditionalFunction(ScalarFunction):
+    """A function that doesn't need all of its arguments for every row.
+
+    Where it can, the evaluator calls evaluate_conditionally rather than
+    evaluate, so that each argument is only evaluated over the rows that
+    need it, and an argument that no row needs, like an unreachable branch
+    of a CASE, isn't evaluated at all. The function still needs to implement
+    _evaluate, which is used for repeated arguments and to fold constants.
+    """
+    is_conditional = True
+
+    @abc.abstractmethod
+    def evaluate_conditionally(self, num_rows, arg_types, evaluate_arg):
+        """Evaluate the function, evaluating arguments only where needed.
+
+        Arguments:
+            num_rows: The number of rows to evaluate the function for.
+            arg_types: A list with the type of each argument.
+            evaluate_arg: A function that takes the index of an argument and
+                a list of row indices in increasing order, and returns a
+                Column with the argument's value for each of those rows.
+
+        Returns:
+            The result Column, or None if an argument turned out to be
+            repeated, in which case the function should be evaluated with
+            evaluate instead.
+        """
+
+
+def select_cases(num_rows, evaluate_arg, num_args):
+    """Pick each row's value from a chain of conditions, like CASE does.
+
+    The arguments alternate between a condition and the result for the rows
+    where that condition is the first true one, optionally followed by the
+    result for the rows where no condition is true. Each condition is only
+    evaluated for the rows that every earlier condition was false (or null)
+    for, and each result only for the rows that pick it.
+
+    Arguments:
+        num_rows: The number of rows.
+        evaluate_arg: A function that evaluates an argument for some rows,
+            as in ConditionalFunction.evaluate_conditionally.
+        num_args: The number of arguments.
+
+    Returns:
+        A list with the value for each row, or None if an argument was
+        repeated.
+    """
+    values = [None] * num_rows
+
+    def set_values(index, rows):
+        column = evaluate_arg(index, rows)
+        if column.mode == tq_modes.REPEATED:
+            return False
+        for row, value in zip(rows, column.values):
+            values[row] = value
+        return True
+
+    rows = range(num_rows)
+    for index in xrange(0, num_args - 1, 2):
+        if not rows:
+            return values
+        conditions = evaluate_arg(index, rows)
+        if conditions.mode == tq_modes.REPEATED:
+            return None
+        matched_rows = []
+        unmatched_rows = []
+        for row, condition in zip(rows, conditions.values):
+            if condition:
+                matched_rows.append(row)
+            else:
+                unmatched_rows.append(row)
+        if matched_rows and not set_values(index + 1, matched_rows):
+            return None
+        rows = unmatched_rows
+    if num_args % 2 == 1 and rows and not set_values(num_args - 1, rows):
+        return None
+    return values
+
+
 class ArithmeticOperator(ScalarFunction):
     """Basic operators like +."""
     def __init__(self, func):
@@ -158,9 +310,7 @@ class ArithmeticOperator(ScalarFunction):
             return tq_types.INT
 
     def _evaluate(self, num_rows, column1, column2):
-        values = map(lambda (x, y):
-                     None if None in (x, y) else self.func(x, y),
-                     zip(column1.values, column2.values))
+        values = map_pairs(self.func, column1.values, column2.values)
         # TODO(Samantha): Code smell incoming
         t = self.check_types(column1.type, column2.type)
         return context.Column(type=t, mode=tq_modes.NULLABLE, values=values)
@@ -210,8 +360,9 @@ class ComparisonOperator(ScalarFunction):
             if other_column.type == tq_types.STRING:
                 # Convert that string to datetime if we can.
                 try:
-                    converted = map(lambda x: arrow.get(x).to('UTC').naive,
-                                    other_column.values)
+                    converted = context.map_values(
+                        lambda x: arrow.get(x).to('UTC').naive,
+                        other_column.values)
                 except:
                     raise TypeError('Invalid comparison on timestamp, '
                                     'expected numeric type or ISO8601 '
@@ -219,7 +370,7 @@ class ComparisonOperator(ScalarFunction):
             elif other_column.type in tq_types.NUMERIC_TYPE_SET:
                 # Cast that numeric to a float accounting for microseconds and
                 # then to a datetime.
-                converted = map(
+                converted = context.map_values(
                     pass_through_none(
                         lambda x: arrow.get(float(x) / 1E6).to('UTC').naive),
                     other_column.values)
@@ -237,26 +388,62 @@ class ComparisonOperator(ScalarFunction):
                                      mode=other_column.mode,
                                      values=converted)
 
-        values = map(lambda (x, y):
-                     None if None in (x, y) else self.func(x, y),
-                     zip(column1.values, column2.values))
+        values = map_pairs(self.func, column1.values, column2.values)
         return context.Column(type=tq_types.BOOL, mode=tq_modes.NULLABLE,
                               values=values)
 
 
-class BooleanOperator(ScalarFunction):
-    def __init__(self, func):
-        self.func = func
+class BooleanOperator(ConditionalFunction):
+    """AND or OR, with the same handling of NULL as bigquery.
+
+    The second argument is only evaluated for rows where the first one
+    doesn't decide the result on its own.
+
+    Fields:
+        deciding_value: The value that decides the result if either argument
+            has it: False for AND and True for OR. If neither argument has
+            it, the result is NULL if either one is NULL, and the opposite
+            value otherwise.
+    """
+    def __init__(self, deciding_value):
+        self.deciding_value = deciding_value
 
     def check_types(self, type1, type2):
         if type1 != type2 != tq_types.BOOL:
             raise TypeError('Expected bool type.')
         return tq_types.BOOL
 
+    def decides(self, value):
+        return value is not None and bool(value) == self.deciding_value
+
+    def combine(self, value1, value2):
+        if self.decides(value1) or self.decides(value2):
+            return self.deciding_value
+        if value1 is None or value2 is None:
+            return None
+        return not self.deciding_value
+
     def _evaluate(self, num_rows, column1, column2):
-        values = map(lambda (x, y):
-                     None if None in (x, y) else self.func(x, y),
-                     zip(column1.values, column2.values))
+        values = [self.combine(value1, value2)
+                  for value1, value2 in zip(column1.values, column2.values)]
+        return context.Column(type=tq_types.BOOL, mode=tq_modes.NULLABLE,
+                              values=values)
+
+    def evaluate_conditionally(self, num_rows, arg_types, evaluate_arg):
+        column1 = evaluate_arg(0, range(num_rows))
+        if column1.mode == tq_modes.REPEATED:
+            return None
+        values = list(column1.values)
+        undecided_rows = [row for row, value in enumerate(values)
+                          if not self.decides(value)]
+        if undecided_rows:
+            column2 = evaluate_arg(1, undecided_rows)
+            if column2.mode == tq_modes.REPEATED:
+                return None
+            for row, value2 in zip(undecided_rows, column2.values):
+                values[row] = self.combine(values[row], value2)
+        else:
+            values = [self.deciding_value] * num_rows
         return context.Column(type=tq_types.BOOL, mode=tq_modes.NULLABLE,
                               values=values)
 
@@ -307,7 +494,7 @@ class LogFunction(ScalarFunction):
                               values=values)
 
 
-class IfFunction(ScalarFunction):
+class IfFunction(ConditionalFunction):
     def check_types(self, cond, arg1, arg2):
         if cond != tq_types.BOOL:
             raise TypeError('Expected bool type.')
@@ -328,6 +515,50 @@ class IfFunction(ScalarFunction):
                              else_column.type)
         return context.Column(type=t, mode=tq_modes.NULLABLE, values=values)
 
+    def evaluate_conditionally(self, num_rows, arg_types, evaluate_arg):
+        values = select_cases(num_rows, evaluate_arg, 3)
+        if values is None:
+            return None
+        return context.Column(type=self.check_types(*arg_types),
+                              mode=tq_modes.NULLABLE, values=values)
+
+
+class CaseFunction(ConditionalFunction):
+    """The function that CASE expressions compile to.
+
+    The arguments alternate between the condition of each WHEN clause and
+    its result. An ELSE is a final clause with a condition of true.
+    """
+    def check_types(self, *arg_types):
+        if len(arg_types) % 2 != 0:
+            raise TypeError('Expected a result for every condition.')
+        if any(t != tq_types.BOOL for t in arg_types[::2]):
+            raise TypeError('Expected bool type.')
+        # Like IF, results can be either all the same type or NULL.
+        types = set(arg_types[1::2]) - set([tq_types.NONETYPE])
+        if len(types) > 1:
+            raise TypeError('Expected types to be the same.')
+        elif len(types) == 0:
+            return tq_types.NONETYPE
+        return types.pop()
+
+    def _evaluate(self, num_rows, *args):
+        def evaluate_arg(index, rows):
+            values = args[index].values
+            return context.Column(type=args[index].type,
+                                  mode=tq_modes.NULLABLE,
+                                  values=[values[row] for row in rows])
+        values = select_cases(num_rows, evaluate_arg, len(args))
+        t = self.check_types(*[arg.type for arg in args])
+        return context.Column(type=t, mode=tq_modes.NULLABLE, values=values)
+
+    def evaluate_conditionally(self, num_rows, arg_types, evaluate_arg):
+        values = select_cases(num_rows, evaluate_arg, len(arg_types))
+        if values is None:
+            return None
+        return context.Column(type=self.check_types(*arg_types),
+                              mode=tq_modes.NULLABLE, values=values)
+
 
 class IfNullFunction(ScalarFunction):
     def check_types(self, arg1, arg2):
@@ -418,6 +649,8 @@ class IntegerCastFunction(ScalarFunction):
 
 
 class RandFunction(ScalarFunction):
+    is_deterministic = False
+
     def check_types(self):
         return tq_types.FLOAT
 
@@ -541,9 +774,32 @@ class NthFunction(AggregateFunction):
 
 
 class FirstFunction(AggregateFunction):
+    accumulates = True
+
+    # The state for when no values have been added yet, as distinct from
+    # a first value of None.
+    _NO_VALUES = ()
+
     def check_types(self, rep_list_type):
         return rep_list_type
 
+    def initial_state(self):
+        return self._NO_VALUES
+
+    def add(self, state, value):
+        return (value,) if state is self._NO_VALUES else state
+
+    def update(self, state, values):
+        if state is self._NO_VALUES and len(values) > 0:
+            return (values[0],)
+        return state
+
+    def merge(self, state1, state2):
+        return state2 if state1 is self._NO_VALUES else state1
+
+    def finalize(self, state):
+        return None if state is self._NO_VALUES else state[0]
+
     def _evaluate(self, num_rows, column):
         values = []
         if len(column.values) == 0:
@@ -559,6 +815,8 @@ class FirstFunction(AggregateFunction):
 
 
 class NoArgFunction(ScalarFunction):
+    is_deterministic = False
+
     def __init__(self, func, return_type=tq_types.INT):
         self.func = func
         self.type = return_type
@@ -608,12 +866,38 @@ class StringFunction(ScalarFunction):
 
 
 class MinMaxFunction(AggregateFunction):
+    accumulates = True
+
     def __init__(self, func):
         self.func = func
 
     def check_types(self, arg):
         return arg
 
+    def initial_state(self):
+        return None
+
+    def add(self, state, value):
+        if value is None:
+            return state
+        if state is None:
+            return value
+        return self.func(state, value)
+
+    def update(self, state, values):
+        values = [value for value in values if value is not None]
+        if not values:
+            return state
+        if state is not None:
+            values.append(state)
+        return self.func(values)
+
+    def merge(self, state1, state2):
+        return self.add(state1, state2)
+
+    def finalize(self, state):
+        return state
+
     def _evaluate(self, num_rows, column):
         return context.Column(type=self.check_types(column.type),
                               mode=tq_modes.NULLABLE,
@@ -622,6 +906,8 @@ class MinMaxFunction(AggregateFunction):
 
 
 class SumFunction(AggregateFunction):
+    accumulates = True
+
     def check_types(self, arg):
         if arg in tq_types.INT_TYPE_SET:
             return tq_types.INT
@@ -630,6 +916,21 @@ class SumFunction(AggregateFunction):
         else:
             raise TypeError('Unexpected type.')
 
+    def initial_state(self):
+        return 0
+
+    def add(self, state, value):
+        return state if value is None else state + value
+
+    def update(self, state, values):
+        return state + sum(value for value in values if value is not None)
+
+    def merge(self, state1, state2):
+        return state1 + state2
+
+    def finalize(self, state):
+        return state
+
     def _evaluate(self, num_rows, column):
         values = [sum([0 if arg is None else arg for arg in column.values])]
         return context.Column(type=self.check_types(column.type),
@@ -638,9 +939,28 @@ class SumFunction(AggregateFunction):
 
 
 class CountFunction(AggregateFunction):
+    accumulates = True
+
     def check_types(self, arg):
         return tq_types.INT
 
+    def initial_state(self):
+        return 0
+
+    def add(self, state, value):
+        return state if value is None else state + 1
+
+    def update(self, state, values):
+        if isinstance(values, context.ConstantValues):
+            return state if values.value is None else state + len(values)
+        return state + len(values) - values.count(None)
+
+    def merge(self, state1, state2):
+        return state1 + state2
+
+    def finalize(self, state):
+        return state
+
     def _evaluate(self, num_rows, column):
         if column.mode == tq_modes.REPEATED:
             values = [len([v for val_list in column.values for v in val_list])]
@@ -651,11 +971,35 @@ class CountFunction(AggregateFunction):
 
 
 class AvgFunction(AggregateFunction):
+    accumulates = True
+
     def check_types(self, arg):
         if arg not in tq_types.NUMERIC_TYPE_SET:
             raise TypeError('Unexpected type.')
         return tq_types.FLOAT
 
+    # The state is a (sum, count) pair.
+    def initial_state(self):
+        return 0, 0
+
+    def add(self, state, value):
+        if value is None:
+            return state
+        total, count = state
+        return total + value, count + 1
+
+    def update(self, state, values):
+        values = [value for value in values if value is not None]
+        total, count = state
+        return total + sum(values), count + len(values)
+
+    def merge(self, state1, state2):
+        return state1[0] + state2[0], state1[1] + state2[1]
+
+    def finalize(self, state):
+        total, count = state
+        return None if count == 0 else float(total) / count
+
     def _evaluate(self, num_rows, column):
         filtered_args = [arg for arg in column.values if arg is not None]
         values = ([None] if not filtered_args else
@@ -665,9 +1009,27 @@ class AvgFunction(AggregateFunction):
 
 
 class CountDistinctFunction(AggregateFunction):
+    accumulates = True
+
     def check_types(self, arg):
         return tq_types.INT
 
+    # The state is a frozenset of the distinct non-null values.
+    def initial_state(self):
+        return frozenset()
+
+    def add(self, state, value):
+        return state if value is None else state | frozenset([value])
+
+    def update(self, state, values):
+        return state.union(value for value in values if value is not None)
+
+    def merge(self, state1, state2):
+        return state1 | state2
+
+    def finalize(self, state):
+        return len(state)
+
     def _evaluate(self, num_rows, column):
         if column.mode == tq_modes.REPEATED:
             values = [v for val_list in column.values for v in val_list]
@@ -852,6 +1214,7 @@ class Compose(AggregateFunction):
         self.functions = list(reversed(functions))
         assert len(self.functions) > 1, (
             'Compose requires at least two functions.')
+        self.is_deterministic = all(f.is_deterministic for f in functions)
 
     def check_types(self, *types):
         result = self.functions[0].check_types(*types)
@@ -1140,8 +1503,8 @@ _BINARY_OPERATORS = {
     '<': ComparisonOperator(lambda a, b: a < b),
     '>=': ComparisonOperator(lambda a, b: a >= b),
     '<=': ComparisonOperator(lambda a, b: a <= b),
-    'and': BooleanOperator(lambda a, b: a and b),
-    'or': BooleanOperator(lambda a, b: a or b),
+    'and': BooleanOperator(False),
+    'or': BooleanOperator(True),
     'contains': ContainsFunction(),
 }
 
@@ -1162,6 +1525,7 @@ _FUNCTIONS = {
     'now': NoArgFunction(lambda: int(time.time() * 1000000)),
     'in': InFunction(),
     'if': IfFunction(),
+    'case': CaseFunction(),
     'ifnull': IfNullFunction(),
     'coalesce': CoalesceFunction(),
     'hash': HashFunction(),
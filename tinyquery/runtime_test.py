@@ -0,0 +1,56 @@
+import unittest
+
+import context
+import runtime
+import tq_modes
+import tq_types
+
+
+class AccumulatorTest(unittest.TestCase):
+    def assert_accumulates(self, func_name, values):
+        func = runtime.get_func(func_name)
+        self.assertTrue(func.accumulates)
+        column = context.Column(type=tq_types.INT, mode=tq_modes.NULLABLE,
+                                values=values)
+        expected = func.evaluate(1, column).values[0]
+
+        # One value at a time.
+        state = func.initial_state()
+        for value in values:
+            state = func.add(state, value)
+        self.assertEqual(expected, func.finalize(state))
+
+        # In batches, merging the states for each half.
+        middle = len(values) // 2
+        state1 = func.update(func.initial_state(), values[:middle])
+        state2 = func.update(func.update(func.initial_state(), []),
+                             values[middle:])
+        self.assertEqual(expected, func.finalize(func.merge(state1, state2)))
+
+    def test_accumulators(self):
+        values = [3, None, 1, 4, 1, None, 5]
+        for func_name in ('sum', 'count', 'avg', 'min', 'max',
+                          'count_distinct', 'first'):
+            self.assert_accumulates(func_name, values)
+
+    def test_empty_accumulators(self):
+        self.assertEqual(0, runtime.get_func('sum').finalize(
+            runtime.get_func('sum').initial_state()))
+        for func_name in ('avg', 'min', 'max', 'first'):
+            func = runtime.get_func(func_name)
+            self.assertIsNone(func.finalize(func.initial_state()))
+
+    def test_first_of_null(self):
+        func = runtime.get_func('first')
+        state = func.update(func.initial_state(), [None, 2])
+        self.assertIsNone(func.finalize(func.merge(
+            state, func.update(func.initial_state(), [3]))))
+
+    def test_count_constant(self):
+        func = runtime.get_func('count')
+        self.assertEqual(4, func.update(1, context.ConstantValues(1, 3)))
+        self.assertEqual(1, func.update(1, context.ConstantValues(None, 3)))
+
+    def test_non_accumulating(self):
+        self.assertFalse(runtime.get_func('quantiles').accumulates)
+        self.assertFalse(runtime.get_func('stddev_samp').accumulates)
@@ -0,0 +1,242 @@
+"""Ordering the rows of a context for ORDER BY.
+
+Rather than moving rows around, these functions work out the order of the row
+indices, which can then be used to rearrange any number of columns.
+"""
+import cPickle
+import heapq
+import itertools
+import tempfile
+
+# The number of sorted (key, index) pairs that external_sort_permutation
+# writes or reads at a time.
+SPILL_CHUNK_SIZE = 1000
+# The most sorted runs that external_sort_permutation merges at once. If there
+# are more, it first merges them into bigger runs, so that it never has more
+# than this many temporary files open.
+MAX_MERGE_WIDTH = 64
+
+
+class MixedDirectionKey(object):
+    """A sort key for a row with a mix of ascending and descending columns.
+
+    Values in descending columns can be of any type, so we can't negate them
+    and have to compare them the other way around instead.
+    """
+    __slots__ = ['values', 'ascending']
+
+    def __init__(self, values, ascending):
+        self.values = values
+        self.ascending = ascending
+
+    def __lt__(self, other):
+        for value, other_value, is_ascending in zip(
+                self.values, other.values, self.ascending):
+            if value == other_value:
+                continue
+            if is_ascending:
+                return value < other_value
+            return other_value < value
+        return False
+
+    # The heap functions compare (key, index) tuples, which only fall back to
+    # the index if the keys are equal.
+    def __eq__(self, other):
+        return self.values == other.values
+
+    def __ne__(self, other):
+        return self.values != other.values
+
+
+_NUMBER_TYPES = (int, long, float)
+
+
+def negated_keys(values):
+    """Return sort keys that put numeric values in descending order.
+
+    Comparing plain numbers is much faster than comparing MixedDirectionKeys,
+    so when the descending columns are numeric, we negate them instead.
+
+    Returns: A list with a key for each value, or None if there are values
+        that can't be negated. NULLs stay at the end.
+    """
+    if not is_numeric(values):
+        return None
+    if any(value is None for value in values):
+        return negated_keys_with_nulls(values)
+    return [-value for value in values]
+
+
+def is_numeric(values):
+    """Return whether every value is a number or NULL."""
+    return all(value is None or isinstance(value, _NUMBER_TYPES)
+               for value in values)
+
+
+def negated_keys_with_nulls(values):
+    """Return descending sort keys for numbers, with NULLs at the end."""
+    return [(True, 0) if value is None else (False, -value)
+            for value in values]
+
+
+def sort_permutation(key_columns, num_rows, limit=None):
+    """Return the row indices of a context in sorted order.
+
+    Equal rows stay in their original order. NULLs (None) come before every
+    other value, so they are first in ascending columns and last in
+    descending ones, as in BigQuery.
+
+    Arguments:
+        key_columns: A list of (values, is_ascending) pairs, one for each
+            column to sort by, with the most significant first.
+        num_rows: The number of rows being sorted.
+        limit: Either None, or the number of rows that will be kept from the
+            start of the sorted order. Only the indices of those rows are
+            returned, and they are found with a heap of at most that many
+            rows, which is much faster than sorting every row when the limit
+            is small.
+
+    Returns: A list of row indices.
+    """
+    rows = xrange(num_rows)
+    if limit is not None:
+        limit = max(int(limit), 0)
+        if limit >= num_rows:
+            limit = None
+    if not key_columns:
+        return range(num_rows if limit is None else limit)
+
+    directions = set(is_ascending for _, is_ascending in key_columns)
+    if len(key_columns) == 1:
+        key = key_columns[0][0].__getitem__
+    elif len(directions) == 1:
+        key = zip(*[values for values, _ in key_columns]).__getitem__
+    else:
+        ascending_columns = [
+            values if is_ascending else negated_keys(values)
+            for values, is_ascending in key_columns]
+        if all(values is not None for values in ascending_columns):
+            key = zip(*ascending_columns).__getitem__
+        else:
+            ascending = [is_ascending for _, is_ascending in key_columns]
+            keys = [MixedDirectionKey(row_values, ascending)
+                    for row_values in zip(*[values
+                                            for values, _ in key_columns])]
+            key = keys.__getitem__
+        directions = set([True])
+
+    # Both the heap functions and sorted are stable, even when reversed.
+    if directions == set([True]):
+        if limit is None:
+            return sorted(rows, key=key)
+        return heapq.nsmallest(limit, rows, key=key)
+    else:
+        if limit is None:
+            return sorted(rows, key=key, reverse=True)
+        return heapq.nlargest(limit, rows, key=key)
+
+
+def external_sort_permutation(key_columns, num_rows, run_size, limit=None):
+    """Sort like sort_permutation, without holding every sort key at once.
+
+    The rows are sorted in runs of at most run_size rows, and the sorted keys
+    of each run are written to a temporary file. The runs are then merged as
+    they are read back, so only the keys of one run, and a chunk of each
+    file, are in memory at a time. The indices of the sorted rows are still
+    returned as a single list.
+
+    Arguments:
+        key_columns: A list of (values, is_ascending) pairs, as for
+            sort_permutation.
+        num_rows: The number of rows being sorted.
+        run_size: The most rows to sort in memory at a time.
+        limit: Either None, or the number of rows that will be kept from the
+            start of the sorted order.
+
+    Returns: A list of row indices.
+    """
+    if limit is not None:
+        limit = max(int(limit), 0)
+    if num_rows <= run_size or (limit is not None and limit <= run_size):
+        # Everything fits in one run, or the heap that sort_permutation uses
+        # for the limit is no bigger than a run.
+        return sort_permutation(key_columns, num_rows, limit)
+
+    # The keys of every run have to compare the same way, so we decide how
+    # to handle descending columns based on the whole column.
+    ascending = [is_ascending for _, is_ascending in key_columns]
+    wrap_key = None
+    if all(is_ascending or is_numeric(values)
+           for values, is_ascending in key_columns):
+        negate = [not is_ascending for is_ascending in ascending]
+    else:
+        negate = [False] * len(key_columns)
+        wrap_key = lambda row_values: MixedDirectionKey(row_values, ascending)
+
+    run_files = []
+    try:
+        for start in xrange(0, num_rows, run_size):
+            end = min(start + run_size, num_rows)
+            stored_keys = zip(*[
+                negated_keys_with_nulls(values[start:end]) if should_negate
+                else values[start:end]
+                for (values, _), should_negate in zip(key_columns, negate)])
+            if wrap_key is None:
+                keys = stored_keys
+            else:
+                keys = map(wrap_key, stored_keys)
+            order = sorted(xrange(end - start), key=keys.__getitem__)
+            run_files.append(write_run(
+                (stored_keys[i], start + i) for i in order))
+            if len(run_files) == MAX_MERGE_WIDTH:
+                run_files = [write_run(merge_runs(run_files, wrap_key))]
+        return [index for _, index in itertools.islice(
+            merge_runs(run_files, wrap_key), limit)]
+    finally:
+        for run_file in run_files:
+            run_file.close()
+
+
+def write_run(entries):
+    """Write (key, index) pairs to a temporary file, ready to be read."""
+    run_file = tempfile.TemporaryFile()
+    while True:
+        chunk = list(itertools.islice(entries, SPILL_CHUNK_SIZE))
+        if not chunk:
+            break
+        cPickle.dump(chunk, run_file, cPickle.HIGHEST_PROTOCOL)
+    run_file.seek(0)
+    return run_file
+
+
+def read_run(run_file, wrap_key):
+    """Read the (key, index) pairs of a run, as they are needed.
+
+    The pairs are generated as (sort key, index, key) triples, since
+    heapq.merge can't take a key function. The index is unique, so the keys
+    of two triples never get compared unless they are equal.
+    """
+    while True:
+        try:
+            chunk = cPickle.load(run_file)
+        except EOFError:
+            return
+        for key, index in chunk:
+            if wrap_key is None:
+                yield key, index, key
+            else:
+                yield wrap_key(key), index, key
+
+
+def merge_runs(run_files, wrap_key):
+    """Merge sorted runs into a single iterator of (key, index) pairs.
+
+    The files are closed once all of their pairs have been read.
+    """
+    try:
+        for _, index, key in heapq.merge(*[read_run(run_file, wrap_key)
+                                           for run_file in run_files]):
+            yield key, index
+    finally:
+        for run_file in run_files:
+            run_file.close()
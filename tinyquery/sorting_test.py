@@ -0,0 +1,98 @@
+import random
+import unittest
+
+import mock
+
+import sorting
+
+
+class SortPermutationTest(unittest.TestCase):
+    def test_single_column(self):
+        self.assertEqual([1, 3, 0, 2], sorting.sort_permutation(
+            [([3, 1, 4, 2], True)], 4))
+        self.assertEqual([2, 0, 3, 1], sorting.sort_permutation(
+            [([3, 1, 4, 2], False)], 4))
+
+    def test_stable(self):
+        values = [1, 0, 1, 0, 1]
+        self.assertEqual([1, 3, 0, 2, 4], sorting.sort_permutation(
+            [(values, True)], 5))
+        self.assertEqual([0, 2, 4, 1, 3], sorting.sort_permutation(
+            [(values, False)], 5))
+        self.assertEqual([0, 2], sorting.sort_permutation(
+            [(values, False)], 5, limit=2))
+
+    def test_mixed_directions(self):
+        names = ['b', 'a', 'b', 'a', 'c']
+        scores = [1, 2, 3, 2, 0]
+        self.assertEqual([1, 3, 2, 0, 4], sorting.sort_permutation(
+            [(names, True), (scores, False)], 5))
+        self.assertEqual([4, 2, 0], sorting.sort_permutation(
+            [(names, False), (scores, False)], 5, limit=3))
+
+    def test_mixed_directions_with_nulls(self):
+        names = ['b', 'a', 'b', 'a', 'b']
+        scores = [None, 2, 3, None, 1.5]
+        # The numeric descending column is negated, and the string one isn't.
+        self.assertEqual([1, 3, 2, 4, 0], sorting.sort_permutation(
+            [(names, True), (scores, False)], 5))
+        self.assertEqual([0, 3, 4, 1, 2], sorting.sort_permutation(
+            [(scores, True), (names, False)], 5))
+
+    def test_nulls_first(self):
+        self.assertEqual([1, 2, 0], sorting.sort_permutation(
+            [([2, None, 1], True)], 3))
+
+    def test_limits(self):
+        self.assertEqual([], sorting.sort_permutation(
+            [([2, 1], True)], 2, limit=0))
+        self.assertEqual([1, 0], sorting.sort_permutation(
+            [([2, 1], True)], 2, limit=10))
+        self.assertEqual([1], sorting.sort_permutation(
+            [([2, 1], True)], 2, limit=1.0))
+        self.assertEqual([0, 1], sorting.sort_permutation([], 5, limit=2))
+
+    def test_top_k_matches_full_sort(self):
+        rand = random.Random(0)
+        num_rows = 500
+        key_columns = [
+            ([rand.randint(0, 5) for _ in xrange(num_rows)], True),
+            ([rand.choice(['x', 'y', None]) for _ in xrange(num_rows)], False),
+            ([rand.randint(0, 3) for _ in xrange(num_rows)], True),
+        ]
+        for num_keys in xrange(1, 4):
+            full_order = sorting.sort_permutation(key_columns[:num_keys],
+                                                  num_rows)
+            for limit in (1, 7, 100):
+                self.assertEqual(
+                    full_order[:limit],
+                    sorting.sort_permutation(key_columns[:num_keys],
+                                             num_rows, limit))
+
+
+class ExternalSortTest(unittest.TestCase):
+    def test_matches_in_memory_sort(self):
+        rand = random.Random(0)
+        num_rows = 300
+        ints = [rand.choice([None, 1, 2, 3]) for _ in xrange(num_rows)]
+        floats = [rand.choice([None, -2, 1.5, 7]) for _ in xrange(num_rows)]
+        strs = [rand.choice([None, 'x', 'y']) for _ in xrange(num_rows)]
+        for key_columns in ([(ints, True)],
+                            [(floats, False)],
+                            [(ints, True), (floats, False)],
+                            [(strs, False), (ints, True)]):
+            for limit in (None, 5, 100):
+                expected = sorting.sort_permutation(key_columns, num_rows,
+                                                    limit)
+                for run_size in (1, 7, 50):
+                    self.assertEqual(
+                        expected,
+                        sorting.external_sort_permutation(
+                            key_columns, num_rows, run_size, limit))
+
+    def test_merges_in_stages(self):
+        values = range(100, 0, -1)
+        with mock.patch.object(sorting, 'MAX_MERGE_WIDTH', 3):
+            self.assertEqual(
+                range(99, -1, -1),
+                sorting.external_sort_permutation([(values, True)], 100, 2))
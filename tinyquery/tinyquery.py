@@ -1,10 +1,16 @@
 """Implementation of the TinyQuery service."""
 import collections
 import json
+import sys
 
 import compiler
 import context
 import evaluator
+import materialized
+import optimizer
+import parser
+import pipeline
+import plan_cache
 import tq_modes
 import tq_types
 
@@ -14,15 +20,55 @@ class TinyQueryError(Exception):
     pass
 
 
+def parameter_types(parameters):
+    """Given a dict of parameter values, return a dict of their types."""
+    if parameters is None:
+        return None
+    return {name: compiler.type_for_value(value)
+            for name, value in parameters.iteritems()}
+
+
+def parameter_signature(parameter_types):
+    """Return a hashable representation of a dict of parameter types."""
+    if parameter_types is None:
+        return ()
+    return tuple(sorted(parameter_types.iteritems()))
+
+
 class TinyQuery(object):
-    def __init__(self):
+    def __init__(self, plan_cache_size=plan_cache.DEFAULT_MAX_SIZE,
+                 memory_budget=None, num_processes=None):
         self.tables_by_name = {}
+        # Roughly how many bytes a query may use for its own working data,
+        # like sort keys, on top of the tables that it reads. Queries that
+        # would need more spill to temporary files. None means no limit.
+        self.memory_budget = memory_budget
+        # How many worker processes to split big steps of a query between.
+        # None means that only steps that the query asks to run in parallel,
+        # like GROUP EACH BY, use worker processes (one for each CPU).
+        self.num_processes = num_processes
         self.next_job_num = 0
         self.job_map = {}
+        # Maps table name to a number that changes whenever the table (or
+        # view) with that name is replaced or deleted, so that cached query
+        # plans compiled against an old schema aren't reused.
+        self.table_versions = {}
+        self.next_table_version = 0
+        self.plan_cache = plan_cache.PlanCache(plan_cache_size)
+        # Compiled views, keyed on view name. These are shared by all queries
+        # (and other views) that read from the view.
+        self.view_cache = plan_cache.PlanCache(plan_cache_size)
 
     def load_table_or_view(self, table):
         """Create a table."""
         self.tables_by_name[table.name] = table
+        self.bump_table_version(table.name)
+        self.refresh_materialized_views(table.name)
+
+    def bump_table_version(self, table_name):
+        """Record that the schema of the given table may have changed."""
+        self.table_versions[table_name] = self.next_table_version
+        self.next_table_version += 1
 
     def load_table_from_csv(self, table_name, raw_schema, filename):
         result_table = self.make_empty_table(table_name, raw_schema)
@@ -184,15 +230,110 @@ class TinyQuery(object):
         make_columns(raw_schema)
         return Table(table_name, 0, columns)
 
-    def make_view(self, view_name, query):
+    def make_view(self, view_name, query, materialized=False):
+        """Create a View, or a MaterializedView if materialized is True.
+
+        The view still needs to be loaded with load_table_or_view.
+        """
         # TODO: Figure out the schema by compiling the query, and refactor the
         # code so that the compiler can use the schema instead of expecting
         # every TableId to have actual Columns. For now, we just validate that
         # the view works, and things will break later if the view is actually
         # used.
-        compiler.compile_text(query, self.tables_by_name)
+        compiler.Compiler(
+            self.tables_by_name, view_cache=self.view_cache,
+            table_versions=self.table_versions,
+        ).compile_select(parser.parse_text(query))
+        if materialized:
+            view = MaterializedView(view_name, query)
+            self.recompute_materialized_view(view)
+            return view
         return View(view_name, query)
 
+    def recompute_materialized_view(self, view):
+        """Recompile a materialized view's query and store its full result."""
+        query_compiler = compiler.Compiler(
+            self.tables_by_name, view_cache=self.view_cache,
+            table_versions=self.table_versions)
+        select_ast = optimizer.optimize(
+            query_compiler.compile_select(parser.parse_text(view.query)),
+            self.tables_by_name)
+        view.dependencies = frozenset(query_compiler.referenced_tables)
+        view.refresher = materialized.make_refresher(select_ast,
+                                                     self.tables_by_name)
+        select_evaluator = evaluator.Evaluator(
+            self.tables_by_name, memory_budget=self.memory_budget,
+            num_processes=self.num_processes)
+        if view.refresher is None:
+            result = select_evaluator.evaluate_select(select_ast)
+        else:
+            result = view.refresher.recompute(select_evaluator)
+        old_schema = [(name, column.type)
+                      for name, column in view.columns.iteritems()]
+        view.set_contents(result)
+        new_schema = [(name, column.type)
+                      for name, column in view.columns.iteritems()]
+        if view.name in self.tables_by_name and old_schema != new_schema:
+            self.bump_table_version(view.name)
+
+    def refresh_materialized_views(self, table_name, first_new_row=None,
+                                   refreshing=frozenset()):
+        """Update the materialized views that read from the given table.
+
+        Arguments:
+            table_name: The name of the table that changed.
+            first_new_row: If the only change to the table was that rows were
+                appended, the index of the first new row. Otherwise None, in
+                which case the views are recomputed from scratch.
+            refreshing: The names of the materialized views whose refresh
+                caused this one, so that we don't loop forever if two views
+                read from each other.
+        """
+        dependent_views = [
+            table for table in self.tables_by_name.itervalues()
+            if isinstance(table, MaterializedView) and
+            table_name in table.dependencies and
+            table.name not in refreshing]
+        refreshing = refreshing | set(view.name for view in dependent_views)
+        # Each view is refreshed on its own, so that one whose query can no
+        # longer run doesn't leave the others stale. The first error is
+        # raised once they've all been refreshed.
+        error_info = None
+        for view in dependent_views:
+            try:
+                self.refresh_materialized_view(view, table_name,
+                                               first_new_row, refreshing)
+            except Exception:
+                if error_info is None:
+                    error_info = sys.exc_info()
+        if error_info is not None:
+            raise error_info[0], error_info[1], error_info[2]
+
+    def refresh_materialized_view(self, view, table_name, first_new_row,
+                                  refreshing):
+        """Update one materialized view, then the views that read from it."""
+        view_first_new_row = None
+        if first_new_row is None or view.refresher is None:
+            self.recompute_materialized_view(view)
+        else:
+            # Evaluate the view's query as if the table only had the new
+            # rows in it.
+            changed_table = self.tables_by_name[table_name]
+            tables_by_name = dict(self.tables_by_name)
+            tables_by_name[table_name] = changed_table.rows_from(
+                first_new_row)
+            result = view.refresher.add_rows(
+                evaluator.Evaluator(tables_by_name,
+                                    memory_budget=self.memory_budget,
+                                    num_processes=self.num_processes))
+            if view.refresher.appends_rows:
+                view_first_new_row = view.num_rows
+                view.append_contents(result)
+            else:
+                view.set_contents(result)
+        self.refresh_materialized_views(view.name, view_first_new_row,
+                                        refreshing)
+
     def get_all_tables(self):
         return self.tables_by_name
 
@@ -249,13 +390,117 @@ class TinyQuery(object):
         return self.tables_by_name[dataset + '.' + table_name]
 
     def delete_table(self, dataset, table_name):
-        del self.tables_by_name[dataset + '.' + table_name]
+        """Delete a table, along with the materialized views that read it.
 
-    def evaluate_query(self, query):
-        select_ast = compiler.compile_text(query, self.tables_by_name)
-        select_evaluator = evaluator.Evaluator(self.tables_by_name)
+        A materialized view can't be recomputed once one of its tables is
+        gone, so it is deleted too rather than left to fail the next time
+        one of its other tables changes.
+        """
+        full_table_name = dataset + '.' + table_name
+        del self.tables_by_name[full_table_name]
+        self.table_versions.pop(full_table_name, None)
+        deleted_names = [full_table_name]
+        while deleted_names:
+            deleted_name = deleted_names.pop()
+            dependent_views = [
+                table for table in self.tables_by_name.values()
+                if isinstance(table, MaterializedView) and
+                deleted_name in table.dependencies]
+            for view in dependent_views:
+                del self.tables_by_name[view.name]
+                self.table_versions.pop(view.name, None)
+                deleted_names.append(view.name)
+
+    def compile_query(self, query, parameter_types=None):
+        """Compile a query into a typed_ast.Select, reusing cached plans.
+
+        Arguments:
+            query: The query text.
+            parameter_types: A dict mapping the name of each query parameter
+                to its type, or None if the query doesn't use parameters.
+        """
+        cache_key = (plan_cache.normalize_query_text(query),
+                     parameter_signature(parameter_types))
+        return self.compile_with_cache(
+            self.plan_cache, cache_key, lambda: parser.parse_text(query),
+            parameter_types)
+
+    def compile_with_cache(self, cache, cache_key, get_query_ast,
+                           parameter_types):
+        """Look up a compiled plan in a PlanCache, compiling it if needed.
+
+        Arguments:
+            cache: The PlanCache to use.
+            cache_key: The key for the plan in the cache.
+            get_query_ast: A function returning the tq_ast.Select to compile.
+                It is only called if the plan isn't in the cache.
+            parameter_types: A dict mapping parameter name to type, or None.
+        """
+        select_ast = cache.get(cache_key, self.table_versions)
+        if select_ast is None:
+            query_compiler = compiler.Compiler(
+                self.tables_by_name, parameter_types, self.view_cache,
+                self.table_versions)
+            select_ast = optimizer.optimize(
+                query_compiler.compile_select(get_query_ast()),
+                self.tables_by_name)
+            # Tables that were added to tables_by_name directly rather than
+            # through load_table_or_view don't have a version, so we can't
+            # tell when they change and can't cache plans that use them.
+            if query_compiler.referenced_tables <= set(self.table_versions):
+                cache.put(cache_key, select_ast, {
+                    name: self.table_versions[name]
+                    for name in query_compiler.referenced_tables
+                })
+        return select_ast
+
+    def evaluate_query(self, query, parameters=None):
+        """Run a query and return a Context with the results.
+
+        Arguments:
+            query: The query text.
+            parameters: A dict mapping the name of each query parameter (the
+                part after the @) to its value, or None.
+        """
+        select_ast = self.compile_query(query, parameter_types(parameters))
+        select_evaluator = evaluator.Evaluator(self.tables_by_name,
+                                               parameters, self.memory_budget,
+                                               self.num_processes)
         return select_evaluator.evaluate_select(select_ast)
 
+    def evaluate_query_batches(self, query, parameters=None,
+                               batch_size=pipeline.DEFAULT_BATCH_SIZE):
+        """Run a query, generating the results a batch of rows at a time.
+
+        The query is compiled right away, but it's only evaluated as the
+        batches are read, and streams its input through the query in batches
+        where it can, so the first rows can be read before the query has
+        finished, and a query that just filters its tables never builds a
+        Context with all of its rows.
+
+        Arguments:
+            query: The query text.
+            parameters: A dict mapping the name of each query parameter (the
+                part after the @) to its value, or None.
+            batch_size: The most rows to process at a time.
+
+        Returns: An iterator of Contexts with the result rows, in order. An
+            empty result gives a single empty Context.
+        """
+        select_ast = self.compile_query(query, parameter_types(parameters))
+        select_evaluator = evaluator.Evaluator(self.tables_by_name,
+                                               parameters, self.memory_budget,
+                                               self.num_processes)
+        return pipeline.Pipeline(
+            select_evaluator, batch_size).select_batches(select_ast)
+
+    def prepare(self, query):
+        """Parse a query so that it can be run repeatedly.
+
+        Returns: A PreparedQuery.
+        """
+        return PreparedQuery(self, query)
+
     def create_job(self, project_id, job_object):
         """Create a job with the given status and return the info for it."""
         job_id = 'job:%s' % self.next_job_num
@@ -268,8 +513,8 @@ class TinyQuery(object):
         return job_object.job_info
 
     def run_query_job(self, project_id, query, dest_dataset, dest_table_name,
-                      create_disposition, write_disposition):
-        query_result_context = self.evaluate_query(query)
+                      create_disposition, write_disposition, parameters=None):
+        query_result_context = self.evaluate_query(query, parameters)
         query_result_table = self.table_from_context('query_results',
                                                      query_result_context)
 
@@ -342,20 +587,22 @@ class TinyQuery(object):
         table = Table(table_name, 0, columns)
         self.load_table_or_view(table)
 
-    @staticmethod
-    def clear_table(table):
+    def clear_table(self, table):
         table.num_rows = 0
         for column in table.columns.itervalues():
             column.values[:] = []
+        self.refresh_materialized_views(table.name)
 
-    @staticmethod
-    def append_to_table(src_table, dest_table):
-        dest_table.num_rows += src_table.num_rows
+    def append_to_table(self, src_table, dest_table):
+        first_new_row = dest_table.num_rows
+        num_new_rows = src_table.num_rows
         for col_name, column in dest_table.columns.iteritems():
             if col_name in src_table.columns:
                 column.values.extend(src_table.columns[col_name].values)
             else:
-                column.values.extend([None] * src_table.num_rows)
+                column.values.extend([None] * num_new_rows)
+        dest_table.num_rows += num_new_rows
+        self.refresh_materialized_views(dest_table.name, first_new_row)
 
     def get_job_info(self, job_id):
         # Raise a KeyError if the table doesn't exist.
@@ -391,6 +638,15 @@ class Table(object):
         return 'Table({}, {}, {})'.format(self.name, self.num_rows,
                                           self.columns)
 
+    def rows_from(self, first_row):
+        """Return a new Table with the rows starting at the given index."""
+        return Table(self.name, self.num_rows - first_row,
+                     collections.OrderedDict(
+                         (col_name, context.Column(
+                             type=column.type, mode=column.mode,
+                             values=column.values[first_row:]))
+                         for col_name, column in self.columns.iteritems()))
+
 
 class View(object):
     """Information about a view (a virtual table defined by a query).
@@ -404,6 +660,89 @@ class View(object):
         self.query = query
 
 
+class MaterializedView(Table):
+    """A view whose query result is stored as a table.
+
+    Queries read the stored result like any other table. Whenever rows are
+    written to a table that the view reads from, the TinyQuery service
+    updates the result, incrementally if the query allows it (see the
+    materialized module) and by rerunning the query otherwise.
+
+    Fields:
+        query: The query string for the view.
+        dependencies: A frozenset of the names of the tables and views that
+            the query reads, including ones it reads indirectly.
+        refresher: An object that knows how to update the stored result when
+            rows are appended to the query's input, or None if the query
+            needs to be rerun instead.
+    """
+    def __init__(self, name, query):
+        super(MaterializedView, self).__init__(
+            name, 0, collections.OrderedDict())
+        self.query = query
+        self.dependencies = frozenset()
+        self.refresher = None
+
+    def __repr__(self):
+        return 'MaterializedView({}, {}, {})'.format(
+            self.name, self.query, self.columns)
+
+    def set_contents(self, ctx):
+        """Replace the stored result with the contents of a Context."""
+        self.num_rows = ctx.num_rows
+        self.columns = collections.OrderedDict(
+            (col_name, context.Column(type=column.type, mode=column.mode,
+                                      values=list(column.values)))
+            for (_, col_name), column in ctx.columns.iteritems())
+
+    def append_contents(self, ctx):
+        """Add the rows in a Context to the end of the stored result."""
+        self.num_rows += ctx.num_rows
+        for (_, col_name), column in ctx.columns.iteritems():
+            self.columns[col_name].values.extend(column.values)
+
+
+class PreparedQuery(object):
+    """A query that has been parsed once and can be run many times.
+
+    The query is compiled the first time it's run with each combination of
+    parameter types, and the compiled plan is reused as long as none of the
+    tables it reads have changed, so later runs skip parsing and compiling
+    entirely.
+
+    Fields:
+        tq_service: The TinyQuery object to run the query against.
+        query: The query text.
+        query_ast: The parsed tq_ast.Select.
+        plan_cache: A PlanCache of compiled plans keyed on parameter types.
+    """
+    def __init__(self, tq_service, query):
+        self.tq_service = tq_service
+        self.query = query
+        self.query_ast = parser.parse_text(query)
+        self.plan_cache = plan_cache.PlanCache()
+
+    def compile(self, parameter_types=None):
+        return self.tq_service.compile_with_cache(
+            self.plan_cache, parameter_signature(parameter_types),
+            lambda: self.query_ast, parameter_types)
+
+    def execute(self, parameters=None):
+        """Run the query with the given parameter values.
+
+        Arguments:
+            parameters: A dict mapping the name of each query parameter (the
+                part after the @) to its value, or None.
+
+        Returns: A Context with the results.
+        """
+        select_ast = self.compile(parameter_types(parameters))
+        select_evaluator = evaluator.Evaluator(
+            self.tq_service.tables_by_name, parameters,
+            self.tq_service.memory_budget, self.tq_service.num_processes)
+        return select_evaluator.evaluate_select(select_ast)
+
+
 class QueryJob(collections.namedtuple('QueryJob', ['job_info',
                                                    'query_results'])):
     pass
@@ -1,7 +1,13 @@
+import collections
 import json
 import unittest
 
+import compiler
+import context
+import evaluator
 import tinyquery
+import tq_modes
+import tq_types
 
 
 class TinyQueryTest(unittest.TestCase):
@@ -135,3 +141,183 @@ class TinyQueryTest(unittest.TestCase):
                          ['a', 'b', 'c', 'd', 'e'])
         self.assertEqual(table.columns['r.inner_repeated'].values[0],
                          ['l', 'm', 'n'])
+
+    def make_int_table(self, tq, table_name, values):
+        tq.load_table_or_view(tinyquery.Table(
+            table_name, len(values), collections.OrderedDict([
+                ('val', context.Column(type=tq_types.INT,
+                                       mode=tq_modes.NULLABLE,
+                                       values=values))])))
+
+    def test_cached_join_planned_with_current_sizes(self):
+        tq = tinyquery.TinyQuery()
+        self.make_int_table(tq, 'big', range(100))
+        self.make_int_table(tq, 'medium', range(50))
+        self.make_int_table(tq, 'small', range(10))
+        query = ('SELECT b.val FROM big b JOIN medium m ON b.val = m.val '
+                 'JOIN small s ON m.val = s.val')
+
+        def planned_order():
+            join = tq.compile_query(query).table
+            planned = evaluator.Evaluator(tq.tables_by_name).plan_join(join)
+            return [planned.base.name] + [
+                table.name for table, _ in planned.tables]
+
+        self.assertEqual(['small', 'medium', 'big'], planned_order())
+        tq.append_to_table(
+            tinyquery.Table('new_rows', 400, collections.OrderedDict([
+                ('val', context.Column(type=tq_types.INT,
+                                       mode=tq_modes.NULLABLE,
+                                       values=range(400)))])),
+            tq.tables_by_name['small'])
+        # The plan comes from the cache, but the join is planned with the new
+        # size of the table.
+        self.assertEqual(['medium', 'big', 'small'], planned_order())
+        self.assertEqual(1, tq.plan_cache.hits)
+        self.assertEqual(
+            sorted(range(10) * 2 + range(10, 50)),
+            sorted(tq.evaluate_query(query).columns[(None, 'b.val')].values))
+
+    def test_plan_cache_reused(self):
+        tq = tinyquery.TinyQuery()
+        self.make_int_table(tq, 'test_table', [1, 2, 3])
+        result1 = tq.evaluate_query('SELECT val FROM test_table WHERE val > 1')
+        result2 = tq.evaluate_query(
+            'SELECT val\nFROM test_table\nWHERE val > 1')
+        self.assertEqual(result1, result2)
+        self.assertEqual(1, tq.plan_cache.hits)
+        self.assertEqual(1, tq.plan_cache.misses)
+
+    def test_plan_cache_sees_appended_rows(self):
+        tq = tinyquery.TinyQuery()
+        self.make_int_table(tq, 'test_table', [1, 2, 3])
+        tq.evaluate_query('SELECT SUM(val) AS s FROM test_table')
+        tq.append_to_table(tq.tables_by_name['test_table'],
+                           tq.tables_by_name['test_table'])
+        result = tq.evaluate_query('SELECT SUM(val) AS s FROM test_table')
+        self.assertEqual([12], result.columns[(None, 's')].values)
+        self.assertEqual(1, tq.plan_cache.hits)
+
+    def test_plan_cache_invalidated_by_reload(self):
+        tq = tinyquery.TinyQuery()
+        self.make_int_table(tq, 'test_table', [1, 2, 3])
+        tq.evaluate_query('SELECT val FROM test_table')
+        tq.load_table_or_view(tinyquery.Table(
+            'test_table', 1, collections.OrderedDict([
+                ('val', context.Column(type=tq_types.STRING,
+                                       mode=tq_modes.NULLABLE,
+                                       values=['a']))])))
+        result = tq.evaluate_query('SELECT val FROM test_table')
+        self.assertEqual(tq_types.STRING,
+                         result.columns[(None, 'val')].type)
+        self.assertEqual(0, tq.plan_cache.hits)
+        self.assertEqual(2, tq.plan_cache.misses)
+
+    def test_plan_cache_invalidated_by_delete(self):
+        tq = tinyquery.TinyQuery()
+        self.make_int_table(tq, 'dataset.test_table', [1, 2, 3])
+        tq.evaluate_query('SELECT val FROM dataset.test_table')
+        tq.delete_table('dataset', 'test_table')
+        with self.assertRaises(KeyError):
+            tq.evaluate_query('SELECT val FROM dataset.test_table')
+
+    def test_plan_cache_invalidated_through_view(self):
+        tq = tinyquery.TinyQuery()
+        self.make_int_table(tq, 'test_table', [1, 2, 3])
+        tq.load_table_or_view(
+            tq.make_view('test_view', 'SELECT val FROM test_table'))
+        tq.evaluate_query('SELECT val FROM test_view')
+        self.make_int_table(tq, 'test_table', [4])
+        result = tq.evaluate_query('SELECT val FROM test_view')
+        self.assertEqual([4], result.columns[(None, 'val')].values)
+        self.assertEqual(0, tq.plan_cache.hits)
+
+    def test_prepared_query(self):
+        tq = tinyquery.TinyQuery()
+        self.make_int_table(tq, 'test_table', [1, 2, 3])
+        prepared = tq.prepare('SELECT val FROM test_table WHERE val >= @min')
+        result1 = prepared.execute({'min': 2})
+        result2 = prepared.execute({'min': 3})
+        self.assertEqual([2, 3], result1.columns[(None, 'val')].values)
+        self.assertEqual([3], result2.columns[(None, 'val')].values)
+        self.assertEqual(1, prepared.plan_cache.misses)
+        self.assertEqual(1, prepared.plan_cache.hits)
+
+    def test_prepared_query_recompiled_for_new_types(self):
+        tq = tinyquery.TinyQuery()
+        self.make_int_table(tq, 'test_table', [1, 2, 3])
+        prepared = tq.prepare('SELECT val + @x AS v FROM test_table')
+        self.assertEqual(
+            tq_types.INT,
+            prepared.execute({'x': 1}).columns[(None, 'v')].type)
+        self.assertEqual(
+            tq_types.FLOAT,
+            prepared.execute({'x': 0.5}).columns[(None, 'v')].type)
+        self.assertEqual(2, prepared.plan_cache.misses)
+
+    def test_prepared_query_sees_table_changes(self):
+        tq = tinyquery.TinyQuery()
+        self.make_int_table(tq, 'test_table', [1, 2, 3])
+        prepared = tq.prepare('SELECT val FROM test_table WHERE val >= @min')
+        prepared.execute({'min': 2})
+        self.make_int_table(tq, 'test_table', [5, 6])
+        result = prepared.execute({'min': 6})
+        self.assertEqual([6], result.columns[(None, 'val')].values)
+        self.assertEqual(0, prepared.plan_cache.hits)
+
+    def test_parameters_share_cached_plan(self):
+        tq = tinyquery.TinyQuery()
+        self.make_int_table(tq, 'test_table', [1, 2, 3])
+        tq.evaluate_query('SELECT val FROM test_table WHERE val = @v',
+                          {'v': 1})
+        result = tq.evaluate_query('SELECT val FROM test_table WHERE val = @v',
+                                   {'v': 2})
+        self.assertEqual([2], result.columns[(None, 'val')].values)
+        self.assertEqual(1, tq.plan_cache.hits)
+
+    def test_view_cache_reused_across_queries(self):
+        tq = tinyquery.TinyQuery()
+        self.make_int_table(tq, 'test_table', [1, 2, 3])
+        tq.load_table_or_view(
+            tq.make_view('view1', 'SELECT val FROM test_table'))
+        tq.load_table_or_view(
+            tq.make_view('view2', 'SELECT val FROM view1 WHERE val > 1'))
+        misses = tq.view_cache.misses
+        result1 = tq.evaluate_query('SELECT val FROM view2')
+        result2 = tq.evaluate_query('SELECT COUNT(*) AS c FROM view2')
+        self.assertEqual([2, 3], result1.columns[(None, 'val')].values)
+        self.assertEqual([2], result2.columns[(None, 'c')].values)
+        # view2 had to be compiled once, but view1 was already compiled when
+        # view2 was created.
+        self.assertEqual(misses + 1, tq.view_cache.misses)
+
+    def test_view_cache_invalidated_by_nested_table(self):
+        tq = tinyquery.TinyQuery()
+        self.make_int_table(tq, 'test_table', [1, 2, 3])
+        tq.load_table_or_view(
+            tq.make_view('view1', 'SELECT val FROM test_table'))
+        tq.load_table_or_view(
+            tq.make_view('view2', 'SELECT val FROM view1'))
+        tq.evaluate_query('SELECT val FROM view2')
+        tq.load_table_or_view(tinyquery.Table(
+            'test_table', 1, collections.OrderedDict([
+                ('val', context.Column(type=tq_types.STRING,
+                                       mode=tq_modes.NULLABLE,
+                                       values=['a']))])))
+        # Use a different query so that the plan cache doesn't get involved.
+        result = tq.evaluate_query('SELECT val AS v FROM view2')
+        self.assertEqual(tq_types.STRING, result.columns[(None, 'v')].type)
+
+    def test_view_cycle(self):
+        tq = tinyquery.TinyQuery()
+        self.make_int_table(tq, 'test_table', [1, 2, 3])
+        tq.load_table_or_view(
+            tq.make_view('view1', 'SELECT val FROM test_table'))
+        tq.load_table_or_view(
+            tq.make_view('view2', 'SELECT val FROM view1'))
+        tq.load_table_or_view(
+            tq.make_view('view1', 'SELECT val FROM view2'))
+        with self.assertRaises(compiler.CompileError) as context_manager:
+            tq.evaluate_query('SELECT val FROM view1')
+        self.assertIn('view1 -> view2 -> view1',
+                      str(context_manager.exception))
@@ -9,7 +9,8 @@ import collections
 
 class Select(collections.namedtuple(
         'Select', ['select_fields', 'table_expr', 'where_expr', 'groups',
-                   'having_expr', 'orderings', 'limit', 'alias'])):
+                   'having_expr', 'orderings', 'limit', 'alias',
+                   'group_each'])):
     """Represents a top-level select statement.
 
     Fields:
@@ -27,6 +28,7 @@ class Select(collections.namedtuple(
         limit: An integer limit
         alias: For subqueries, a name given to the subquery, or None if no name
             was given (or if this is an outermost query).
+        group_each: True if the groups were given with GROUP EACH BY.
     """
     def __str__(self):
         result = 'SELECT {}'.format(
@@ -36,7 +38,8 @@ class Select(collections.namedtuple(
         if self.where_expr:
             result += ' WHERE {}'.format(self.where_expr)
         if self.groups:
-            result += ' GROUP BY {}'.format(
+            result += ' GROUP{} BY {}'.format(
+                ' EACH' if self.group_each else '',
                 ', '.join(str(group) for group in self.groups))
         if self.having_expr:
             result += ' HAVING {}'.format(self.having_expr)
@@ -48,6 +51,9 @@ class Select(collections.namedtuple(
         return result
 
 
+Select.__new__.__defaults__ = (False,)
+
+
 class SelectField(collections.namedtuple('SelectField', ['expr', 'alias',
                                                          'within_record'])):
     def __str__(self):
@@ -88,6 +94,12 @@ class Literal(collections.namedtuple('Literal', ['value'])):
         return str(self.value)
 
 
+class Parameter(collections.namedtuple('Parameter', ['name'])):
+    """A named query parameter, like @name, whose value is bound later."""
+    def __str__(self):
+        return '@' + self.name
+
+
 class ColumnId(collections.namedtuple('ColumnId', ['name'])):
     def __str__(self):
         return self.name
@@ -141,17 +153,24 @@ JoinType.CROSS = JoinType('CROSS')
 
 class PartialJoin(collections.namedtuple('PartialJoin',
                                          ['table_expr', 'join_type',
-                                          'condition'])):
+                                          'condition', 'each'])):
     """Expression for the right side of a join, its type, and condition.
 
-    This represents something like `LEFT JOIN [dataset.table] ON x = y`
+    This represents something like `LEFT JOIN [dataset.table] ON x = y`. each
+    is True if the join was written as JOIN EACH.
     """
     def __str__(self):
+        join_str = str(self.join_type)
+        if self.each:
+            join_str += ' EACH'
         if self.join_type is JoinType.CROSS:
-            return '%s %s' % (self.join_type, self.table_expr)
+            return '%s %s' % (join_str, self.table_expr)
         else:
             return '%s %s ON %s' % (
-                self.join_type, self.table_expr, self.condition)
+                join_str, self.table_expr, self.condition)
+
+
+PartialJoin.__new__.__defaults__ = (False,)
 
 
 class Join(collections.namedtuple('Join', ['base', 'join_parts'])):
@@ -26,9 +26,8 @@ class Select(collections.namedtuple(
             Note that this filter should always be valid; if the user didn't
             specify a HAVING clause, this is the literal true.
         orderings: Either None, indicating that no ordering should be done, or
-            an OrderBySet object. If there were ordering instances explicitly
-            specified by ORDER BY, then the OrderBySet always exists and is
-            nonempty.
+            a nonempty list of Ordering objects from ORDER BY, with the most
+            significant first.
         limit: Either a number with the number of rows to limit the results to,
             or None if there is no limit.
         type_ctx: A type context describing the names and types of the fields
@@ -47,7 +46,7 @@ class SelectField(collections.namedtuple('SelectField', ['expr', 'alias',
 
 
 class GroupSet(collections.namedtuple(
-        'GroupSet', ['alias_groups', 'field_groups'])):
+        'GroupSet', ['alias_groups', 'field_groups', 'parallel'])):
     """Information about the groups to use for a query.
 
     Fields:
@@ -56,7 +55,23 @@ class GroupSet(collections.namedtuple(
             compiled and evaluated differently from normal select fields.
         field_groups: A list of ColumnRefs referencing columns in the table
             expression of the SELECT statement.
+        parallel: True if the query used GROUP EACH BY, which asks for the
+            groups to be aggregated in several processes.
     """
+
+
+GroupSet.__new__.__defaults__ = (False,)
+class Ordering(collections.namedtuple('Ordering', ['column', 'is_ascending'])):
+    """A column to order the results of a select by.
+
+    Fields:
+        column: A ColumnRef to either a select field, with a table of None
+            and the field's alias as the column, or (if the select doesn't
+            group) a column of the table expression.
+        is_ascending: False if the column should be in descending order.
+    """
+
+
 # This special GroupSet means "group by nothing". In other words, everything
 # should end up in the same group (which happens when an aggregate function is
 # used, but no GROUP BY groups are specified explicitly). It's almost enough to
@@ -90,7 +105,7 @@ class TableUnion(collections.namedtuple('TableUnion', ['tables', 'type_ctx']),
 
 
 class Join(collections.namedtuple('Join', ['base', 'tables', 'conditions',
-                                           'type_ctx']),
+                                           'type_ctx', 'merge_joins']),
            TableExpression):
     """Table expression for a join operation.
 
@@ -101,6 +116,9 @@ class Join(collections.namedtuple('Join', ['base', 'tables', 'conditions',
             field from one of the tables joined on a field from another of the
             tables.
         type_ctx: The resulting type context.
+        merge_joins: A list of bools, one for each entry in tables, saying
+            whether that table should be joined with a sort-merge join rather
+            than a hash join. This is requested with JOIN EACH.
     """
 
 
@@ -149,6 +167,31 @@ class Literal(collections.namedtuple(
     pass
 
 
+class CommonSubexpression(collections.namedtuple(
+        'CommonSubexpression', ['key', 'expr', 'type']), Expression):
+    """An expression that occurs more than once within a select.
+
+    The evaluator only computes the expression once for each context, and
+    reuses the resulting column for the other occurrences.
+
+    Fields:
+        key: A hashable value that is the same for structurally equal
+            expressions.
+        expr: The expression to evaluate.
+        type: The result type of the expression.
+    """
+
+
+class Parameter(collections.namedtuple(
+        'Parameter', ['name', 'type']), Expression):
+    """A named query parameter.
+
+    The type is fixed when the query is compiled, but the value is only looked
+    up when the query is evaluated, so a compiled query can be run many times
+    with different values of the same type.
+    """
+
+
 class ColumnRef(collections.namedtuple(
         'ColumnRef', ['table', 'column', 'type', 'mode']), Expression):
     """References a column from the current context."""
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""Measure how much column pruning speeds up queries over a wide table.
+
+Each query is compiled once and then evaluated both as the compiler produces
+it, which carries every column of the table through filtering, joining and
+grouping, and after optimizer.prune_columns has narrowed it down to the
+columns the query actually references.
+
+For usage instructions, run `column_pruning_benchmark.py --help`
+"""
+import argparse
+import collections
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'tinyquery'))
+
+import compiler  # NOQA
+import context  # NOQA
+import evaluator  # NOQA
+import optimizer  # NOQA
+import tinyquery  # NOQA
+import tq_modes  # NOQA
+import tq_types  # NOQA
+
+
+QUERIES = [
+    ('filter',
+     'SELECT col0, col1 FROM wide WHERE col2 > 500'),
+    ('group by',
+     'SELECT col0, SUM(col1) AS total, COUNT(*) AS n FROM wide '
+     'WHERE col2 > 500 GROUP BY col0'),
+    ('join',
+     'SELECT w.col1, d.name FROM wide w JOIN dim d ON w.col0 = d.id '
+     'WHERE w.col2 > 500'),
+]
+
+
+def make_int_column(values):
+    return context.Column(type=tq_types.INT, mode=tq_modes.NULLABLE,
+                          values=values)
+
+
+def make_tables(num_rows, num_columns):
+    rand = random.Random(0)
+    wide = tinyquery.Table('wide', num_rows, collections.OrderedDict(
+        ('col%d' % i, make_int_column(
+            [rand.randint(0, 1000) for _ in xrange(num_rows)]))
+        for i in xrange(num_columns)))
+    dim = tinyquery.Table('dim', 1001, collections.OrderedDict([
+        ('id', make_int_column(range(1001))),
+        ('name', context.Column(type=tq_types.STRING, mode=tq_modes.NULLABLE,
+                                values=['name%d' % i for i in xrange(1001)])),
+    ]))
+    return {'wide': wide, 'dim': dim}
+
+
+def time_evaluation(tables_by_name, select_ast, repetitions):
+    select_evaluator = evaluator.Evaluator(tables_by_name)
+    timer = timeit.Timer(lambda: select_evaluator.evaluate_select(select_ast))
+    return min(timer.repeat(repeat=3, number=repetitions)) / repetitions
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(
+        description='benchmark tinyquery column pruning')
+    arg_parser.add_argument('-r', '--rows', type=int, default=5000,
+                            help='number of rows in the wide table')
+    arg_parser.add_argument('-c', '--columns', type=int, default=150,
+                            help='number of columns in the wide table')
+    arg_parser.add_argument('-n', '--repetitions', type=int, default=3,
+                            help='number of evaluations to time for each case')
+    args = arg_parser.parse_args()
+
+    tables_by_name = make_tables(args.rows, args.columns)
+    print '%-10s %16s %16s' % ('query', 'unpruned (ms)', 'pruned (ms)')
+    for name, query in QUERIES:
+        select_ast = compiler.compile_text(query, tables_by_name)
+        pruned_ast = optimizer.prune_columns(select_ast)
+        before = time_evaluation(tables_by_name, select_ast, args.repetitions)
+        after = time_evaluation(tables_by_name, pruned_ast, args.repetitions)
+        print '%-10s %16.1f %16.1f' % (name, before * 1000, after * 1000)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""Measure how long it takes to parse small and large queries.
+
+The "rebuild" numbers construct a new lexer and LALR parser for every query,
+which is what tinyquery used to do on every call to parser.parse_text. The
+"engine" numbers go through the shared parser engine, which builds the tables
+once per process and reuses a per-thread lexer and parser.
+
+For usage instructions, run `parser_benchmark.py --help`
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'tinyquery'))
+
+from ply import lex  # NOQA
+from ply import yacc  # NOQA
+
+import lexer  # NOQA
+import parser  # NOQA
+import parsetab  # NOQA
+
+
+SMALL_QUERY = 'SELECT foo, bar FROM my_dataset.my_table WHERE foo > 3'
+
+
+def make_large_query(num_fields):
+    fields = ', '.join(
+        'IF(col%d > %d, col%d * 2, NULL) AS out%d' % (i, i, i, i)
+        for i in xrange(num_fields))
+    conditions = ' AND '.join(
+        'col%d IS NOT NULL' % i for i in xrange(num_fields))
+    return ('SELECT %s FROM my_dataset.my_table t1 '
+            'JOIN my_dataset.other_table t2 ON t1.id = t2.id '
+            'WHERE %s GROUP BY out0 ORDER BY out0 DESC LIMIT 10' % (
+                fields, conditions))
+
+
+def parse_with_rebuild(text):
+    query_lexer = lex.lex(module=lexer)
+    query_parser = yacc.yacc(module=parser, debug=0, write_tables=0,
+                             tabmodule=parsetab)
+    return query_parser.parse(text, lexer=query_lexer)
+
+
+def time_per_call(func, text, repetitions):
+    timer = timeit.Timer(lambda: func(text))
+    return min(timer.repeat(repeat=3, number=repetitions)) / repetitions
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(
+        description='benchmark tinyquery query parsing')
+    arg_parser.add_argument('-n', '--repetitions', type=int, default=20,
+                            help='number of parses to time for each case')
+    arg_parser.add_argument('-f', '--num-fields', type=int, default=100,
+                            help='number of select fields in the large query')
+    args = arg_parser.parse_args()
+
+    # Build the shared engine up front so that its one-time cost doesn't
+    # count against the first timed parse.
+    parser.parse_text(SMALL_QUERY)
+
+    large_query = make_large_query(args.num_fields)
+    print '%-8s %14s %14s' % ('query', 'rebuild (ms)', 'engine (ms)')
+    for name, text in [('small', SMALL_QUERY), ('large', large_query)]:
+        before = time_per_call(parse_with_rebuild, text, args.repetitions)
+        after = time_per_call(parser.parse_text, text, args.repetitions)
+        print '%-8s %14.3f %14.3f' % (name, before * 1000, after * 1000)